@@ -3,4 +3,4 @@ cd /home/frankbria/projects/agentic-gh-coding
 export GITHUB_TOKEN=$(gh auth token)
 export GITHUB_USERNAME=frankbria
 source .venv/bin/activate
-python -m codeframe.processor
+python -m codeframe.processor --gate
@@ -0,0 +1,101 @@
+"""Traycer accounts, each with its own slot bucket.
+
+Traycer's quota is per user: 15 analyses that recharge 30 minutes after use.
+Assigning an issue to a different account's user triggers analysis under that
+user's quota, so N accounts give N independent buckets. Each bucket keeps its
+own slot history (`processing_history.account`). An account's token signs the
+assignments made for its bucket; otherwise the tokens join the processor's API
+token pool for reads.
+"""
+
+import os
+from typing import NamedTuple
+
+from .database import Database
+from .slot_calculator import SlotCalculator
+
+
+class TraycerAccount(NamedTuple):
+    """GitHub user whose assignment triggers Traycer under their own quota.
+
+    The assignment is made with `token`, so it must belong to `username`.
+    """
+
+    username: str
+    token: str
+
+
+def accounts_from_env(username: str, token: str) -> list[TraycerAccount]:
+    """Build the account list from environment variables.
+
+    Reads CODEFRAME_TRAYCER_ACCOUNTS, e.g. "alice=GITHUB_TOKEN_ALICE,bob=GITHUB_TOKEN_BOB":
+    each entry names a GitHub user and the environment variable holding their
+    token. The main account (GITHUB_USERNAME/GITHUB_TOKEN) always comes first.
+
+    Args:
+        username: Main account username
+        token: Main account token
+
+    Returns:
+        Accounts, main account first
+
+    Raises:
+        ValueError: If an entry is malformed or its token variable is not set
+    """
+    accounts = [TraycerAccount(username, token)]
+    for item in os.getenv("CODEFRAME_TRAYCER_ACCOUNTS", "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, token_var = item.partition("=")
+        name, token_var = name.strip(), token_var.strip()
+        if not name or not token_var:
+            raise ValueError(f"Invalid account '{item}', expected username=TOKEN_ENV_VAR")
+        if name == username:
+            continue
+        account_token = os.getenv(token_var)
+        if not account_token:
+            raise ValueError(f"{token_var} (token for {name}) is not set")
+        accounts.append(TraycerAccount(name, account_token))
+    return accounts
+
+
+class SlotBucket:
+    """One account's slot bucket."""
+
+    def __init__(self, db: Database, account: TraycerAccount, primary: bool, multi: bool):
+        """Initialize bucket.
+
+        Args:
+            db: Database instance
+            account: Account owning the bucket
+            primary: Whether this is the main account
+            multi: Whether other buckets exist (single-bucket setups count every
+                logged attempt, attributed or not)
+        """
+        self.account = account
+        self.slot_calculator = SlotCalculator(
+            db, account=account.username if multi else None, primary=primary
+        )
+
+    @property
+    def username(self) -> str:
+        """GitHub user the bucket assigns issues to."""
+        return self.account.username
+
+
+def make_buckets(db: Database, accounts: list[TraycerAccount]) -> list[SlotBucket]:
+    """Create one bucket per account; the first account is primary.
+
+    Args:
+        db: Database instance
+        accounts: Accounts, main account first
+
+    Returns:
+        Slot buckets in account order
+    """
+    multi = len(accounts) > 1
+    return [
+        SlotBucket(db, account, primary=index == 0, multi=multi)
+        for index, account in enumerate(accounts)
+    ]
@@ -0,0 +1,198 @@
+"""Persisted circuit breakers per failure domain, shared across processes.
+
+Each failure domain has its own closed/open/half-open breaker stored in the
+`circuit_breakers` table:
+
+- `repo:<owner/name>` counts every failure for one repository, so a broken repo
+  is skipped while healthy repos keep processing.
+- `error:<class>` counts failures of a systemic class (auth, abuse, server,
+  network, other) across all repos, with thresholds suited to the class; a
+  secondary rate limit opens its breaker on the first hit.
+- `global` counts every systemic failure, as a backstop.
+
+A breaker opens when its threshold is reached within the window, stays open for
+its cooldown, then lets a single probe through (half-open). The probe's success
+closes it; its failure re-opens it for another cooldown.
+"""
+
+import time
+from typing import NamedTuple
+
+from .database import Database
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+GLOBAL = "global"
+
+
+class BreakerPolicy(NamedTuple):
+    """When a breaker opens and how long it stays open."""
+
+    threshold: int  # Failures within the window that open the breaker
+    window_seconds: int = 300
+    cooldown_seconds: int = 300
+
+
+def repo_domain(repo_name: str) -> str:
+    """Failure domain of a repository."""
+    return f"repo:{repo_name}"
+
+
+def error_domain(error_class: str) -> str:
+    """Failure domain of a systemic error class."""
+    return f"error:{error_class}"
+
+
+def classify_failure(error: Exception) -> str | None:
+    """Classify an error as systemic or specific to the repository it came from.
+
+    Args:
+        error: Exception raised while processing an issue
+
+    Returns:
+        Systemic error class ('auth', 'abuse', 'server', 'network', 'other'),
+        or None for errors confined to one repository (404, 410, 422, ...)
+    """
+    # Only reached after a request failed, so these are already loaded
+    import requests
+    from github import GithubException
+
+    if isinstance(error, GithubException):
+        message = str(error.data).lower() if error.data else ""
+        if error.status == 401:
+            return "auth"
+        if error.status == 429 or (error.status == 403 and "rate limit" in message):
+            return "abuse"
+        if error.status >= 500:
+            return "server"
+        return None
+    if isinstance(error, (ConnectionError, TimeoutError, requests.RequestException)):
+        return "network"
+    return "other"
+
+
+class CircuitBreaker:
+    """Checks and updates the persisted breakers for one component.
+
+    The common path (every breaker closed) costs one primary-key lookup of a
+    handful of rows, however many errors have been logged.
+    """
+
+    REPO_POLICY = BreakerPolicy(threshold=3, window_seconds=1800, cooldown_seconds=1800)
+    GLOBAL_POLICY = BreakerPolicy(threshold=5)
+    ERROR_POLICIES = {
+        "auth": BreakerPolicy(threshold=1, cooldown_seconds=1800),
+        "abuse": BreakerPolicy(threshold=1, cooldown_seconds=600),
+        "server": BreakerPolicy(threshold=3),
+        "network": BreakerPolicy(threshold=3),
+        "other": BreakerPolicy(threshold=5),
+    }
+
+    # Lease on a half-open probe; longer than one issue takes to process
+    PROBE_SECONDS = 300
+
+    def __init__(self, db: Database):
+        """Initialize circuit breaker.
+
+        Args:
+            db: Database instance holding breaker state
+        """
+        self.db = db
+        self._probing: set[str] = set()
+
+    @property
+    def systemic_domains(self) -> list[str]:
+        """Domains whose breakers halt all processing."""
+        return [GLOBAL] + [error_domain(name) for name in self.ERROR_POLICIES]
+
+    def policy(self, domain: str) -> BreakerPolicy:
+        """Policy for a failure domain."""
+        if domain == GLOBAL:
+            return self.GLOBAL_POLICY
+        if domain.startswith("error:"):
+            return self.ERROR_POLICIES.get(domain[len("error:") :], self.GLOBAL_POLICY)
+        return self.REPO_POLICY
+
+    def blocked_by(self, domains: list[str]) -> str | None:
+        """Find the first breaker that blocks work going through these domains.
+
+        An open breaker past its cooldown is moved to half-open and this caller
+        becomes its probe, so the work is allowed through.
+
+        Args:
+            domains: Failure domains the work would go through
+
+        Returns:
+            Blocking domain, or None if the work may proceed
+        """
+        rows = self.db.get_circuit_breakers(domains)
+        now = int(time.time())
+        for domain in domains:
+            row = rows.get(domain)
+            if row is None or row["state"] == CLOSED or domain in self._probing:
+                continue
+            policy = self.policy(domain)
+            if self.db.begin_breaker_probe(
+                domain, now, policy.cooldown_seconds, self.PROBE_SECONDS
+            ):
+                self._probing.add(domain)
+                continue
+            return domain
+        return None
+
+    def open_domains(self) -> list[str]:
+        """Domains currently blocking work (open in cooldown, or half-open with a probe out).
+
+        Returns:
+            Blocking failure domains
+        """
+        now = int(time.time())
+        blocking = []
+        for domain, row in self.db.get_circuit_breakers().items():
+            if domain in self._probing:
+                continue
+            if row["state"] == OPEN:
+                if row["opened_at"].timestamp() + self.policy(domain).cooldown_seconds > now:
+                    blocking.append(domain)
+            elif row["state"] == HALF_OPEN and row["probe_until"]:
+                if row["probe_until"].timestamp() > now:
+                    blocking.append(domain)
+        return blocking
+
+    def record_success(self, domains: list[str]) -> None:
+        """Close the breakers of domains that just handled work successfully.
+
+        Args:
+            domains: Failure domains the work went through
+        """
+        self.db.reset_breakers(domains)
+        self._probing.difference_update(domains)
+
+    def record_failure(self, repo_name: str, error: Exception) -> list[str]:
+        """Count a failure against the repo and, if systemic, its error class.
+
+        Args:
+            repo_name: Repository the failing work belonged to
+            error: Exception raised
+
+        Returns:
+            Domains whose breakers are open after this failure
+        """
+        domains = [repo_domain(repo_name)]
+        error_class = classify_failure(error)
+        if error_class is not None:
+            domains += [error_domain(error_class), GLOBAL]
+
+        opened = []
+        now = int(time.time())
+        for domain in domains:
+            policy = self.policy(domain)
+            state = self.db.record_breaker_failure(
+                domain, now, policy.threshold, policy.window_seconds, str(error)
+            )
+            self._probing.discard(domain)
+            if state == OPEN:
+                opened.append(domain)
+        return opened
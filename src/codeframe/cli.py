@@ -34,10 +34,12 @@ def main():
     # Import object handlers
     from .cli_issues import setup_issues_parser
     from .cli_repos import setup_repos_parser
+    from .cli_traces import setup_traces_parser
 
     # Setup each object's commands
     setup_issues_parser(subparsers)
     setup_repos_parser(subparsers)
+    setup_traces_parser(subparsers)
 
     # Parse arguments
     args = parser.parse_args()
@@ -52,6 +54,7 @@ def main():
         print("Objects:")
         print("  issues    - Manage GitHub issues and planning")
         print("  repos     - Repository health and status")
+        print("  traces    - Run timing traces")
         print("  prs       - Pull request management (coming soon)")
         print("  ideas     - Idea generation (coming soon)")
         print()
@@ -1,6 +1,7 @@
 """Issues object - Manage GitHub issues and automated planning."""
 
-import subprocess
+import json
+import os
 import sys
 
 
@@ -60,9 +61,44 @@ def setup_issues_parser(subparsers):
     )
     create_plan_parser.add_argument(
         "--repo",
+        action="append",
+        default=[],
         metavar="REPO",
-        help="Specific repo to scan (format: owner/repo)",
+        help="Specific repo to scan (format: owner/repo); repeatable",
     )
+    create_plan_parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only scan repos matching GLOB (e.g. 'owner/api-*'); repeatable",
+    )
+    create_plan_parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip repos matching GLOB; repeatable",
+    )
+    create_plan_parser.add_argument(
+        "--backend",
+        choices=["walk", "search", "mirror"],
+        default="walk",
+        help="'walk' lists every repo and issue; 'search' inspects only recently "
+        "updated issues Traycer commented on; 'mirror' syncs changes into the local "
+        "mirror and scans it (default: walk)",
+    )
+    create_plan_parser.add_argument(
+        "--all-repos",
+        action="store_true",
+        help="Scan every owned repo, not just those with open issues Traycer commented on",
+    )
+    create_plan_parser.add_argument(
+        "--refresh-active",
+        action="store_true",
+        help="Rebuild the cached set of Traycer-active repos",
+    )
+    _add_trace_arguments(create_plan_parser)
     create_plan_parser.set_defaults(func=cmd_issues_create_plan)
 
     # cf issues process
@@ -71,16 +107,159 @@ def setup_issues_parser(subparsers):
         help="Process issue planning queue",
         description="Process queued issues (respects rate limits)",
     )
+    process_parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="Exit immediately when local state shows nothing can run (no API calls)",
+    )
+    process_parser.add_argument(
+        "--wake-file",
+        metavar="FILE",
+        help="With --gate, write the next wake-up time (Unix seconds) to FILE",
+    )
+    _add_trace_arguments(process_parser)
     process_parser.set_defaults(func=cmd_issues_process)
 
+    # cf issues webhook [--host HOST] [--port PORT]
+    webhook_parser = issues_subparsers.add_parser(
+        "webhook",
+        help="Run webhook receiver",
+        description="Queue rate-limited issues from issue_comment webhooks as they happen",
+    )
+    webhook_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    webhook_parser.add_argument(
+        "--port", type=int, default=8787, help="Port to bind (default: 8787)"
+    )
+    webhook_parser.set_defaults(func=cmd_issues_webhook)
+
     # cf issues status
     status_parser = issues_subparsers.add_parser(
         "status",
         help="Quick status summary",
-        description="Show quick status of issue queue",
+        description="Show quick status of issue queue and when queued issues should be processed",
+    )
+    status_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the status and every queued issue's ETA as JSON",
     )
     status_parser.set_defaults(func=cmd_issues_status)
 
+    # cf issues latency [--days N] [--repo REPO]
+    latency_parser = issues_subparsers.add_parser(
+        "latency",
+        help="End-to-end wait percentiles",
+        description="Show p50/p95/p99 time from Traycer's rate-limit comment to re-analysis",
+    )
+    latency_parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        metavar="N",
+        help="Days of history to show (default: 7)",
+    )
+    latency_parser.add_argument("--repo", metavar="REPO", help="Only this repository (owner/name)")
+    latency_parser.set_defaults(func=cmd_issues_latency)
+
+    # cf issues search QUERY [--limit N] [--repo REPO] [--comments | --errors]
+    search_parser = issues_subparsers.add_parser(
+        "search",
+        help="Full-text search of Traycer comments and queue errors",
+        description="Search indexed Traycer comments and last_error text locally "
+        "(FTS5 syntax: phrases in quotes, AND/OR/NOT, prefix*)",
+    )
+    search_parser.add_argument("query", nargs="+", metavar="QUERY", help="Words to search for")
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Maximum number of results (default: 20)",
+    )
+    search_parser.add_argument("--repo", metavar="REPO", help="Only this repository (owner/name)")
+    search_source = search_parser.add_mutually_exclusive_group()
+    search_source.add_argument(
+        "--comments",
+        dest="source",
+        action="store_const",
+        const="comment",
+        help="Only Traycer comments",
+    )
+    search_source.add_argument(
+        "--errors",
+        dest="source",
+        action="store_const",
+        const="error",
+        help="Only queue errors",
+    )
+    search_parser.set_defaults(func=cmd_issues_search)
+
+    # cf issues prioritize REPO NUMBER PRIORITY
+    prioritize_parser = issues_subparsers.add_parser(
+        "prioritize",
+        help="Set explicit priority of a queued issue",
+        description="Set the explicit priority of a queued issue (higher runs sooner)",
+    )
+    prioritize_parser.add_argument("repo", metavar="REPO", help="Repository (owner/repo)")
+    prioritize_parser.add_argument("number", type=int, metavar="NUMBER", help="Issue number")
+    prioritize_parser.add_argument(
+        "priority", type=int, metavar="PRIORITY", help="Priority (default 0, may be negative)"
+    )
+    prioritize_parser.set_defaults(func=cmd_issues_prioritize)
+
+    # cf issues rescore
+    rescore_parser = issues_subparsers.add_parser(
+        "rescore",
+        help="Recompute queue priority scores",
+        description="Recompute all queue scores after changing CODEFRAME_PRIORITY_* settings",
+    )
+    rescore_parser.set_defaults(func=cmd_issues_rescore)
+
+    # cf issues dead-letters [--limit N]
+    dead_letters_parser = issues_subparsers.add_parser(
+        "dead-letters",
+        help="List issues that ran out of retries",
+        description="List issues the retry policy gave up on (see 'cf issues requeue')",
+    )
+    dead_letters_parser.add_argument(
+        "--limit", type=int, default=50, help="Maximum issues to show (default: 50)"
+    )
+    dead_letters_parser.set_defaults(func=cmd_issues_dead_letters)
+
+    # cf issues requeue REPO NUMBER
+    requeue_parser = issues_subparsers.add_parser(
+        "requeue",
+        help="Requeue a dead-lettered issue",
+        description="Move a dead-lettered issue back to the queue with a fresh retry count",
+    )
+    requeue_parser.add_argument("repo", metavar="REPO", help="Repository (owner/repo)")
+    requeue_parser.add_argument("number", type=int, metavar="NUMBER", help="Issue number")
+    requeue_parser.set_defaults(func=cmd_issues_requeue)
+
+
+def _add_trace_arguments(parser):
+    """Add --trace/--profile instrumentation options to a command parser."""
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Append JSON-lines timing trace to FILE (summarize with 'cf traces summary')",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Capture a cProfile of the run to FILE",
+    )
+
+
+def _trace_argv(args):
+    """Build --trace/--profile arguments to forward to a script entry point."""
+    argv = []
+    if args.trace:
+        argv += ["--trace", args.trace]
+    if args.profile:
+        argv += ["--profile", args.profile]
+    return argv
+
 
 def cmd_issues_view(args):
     """Show issues dashboard."""
@@ -105,14 +284,25 @@ def cmd_issues_create_plan(args):
     """Generate plans for issues via Traycer."""
     from .scanner import main as scanner_main
 
-    if args.repo:
-        print(f"Note: --repo filter not yet implemented, scanning all repos")
+    scanner_args = []
+    for repo in args.repo:
+        scanner_args += ["--repo", repo]
+    for pattern in args.include:
+        scanner_args += ["--include", pattern]
+    for pattern in args.exclude:
+        scanner_args += ["--exclude", pattern]
+    scanner_args += ["--backend", args.backend]
+    if args.all_repos:
+        scanner_args.append("--all-repos")
+    if args.refresh_active:
+        scanner_args.append("--refresh-active")
 
-    if not args.global_scope:
+    if not args.global_scope and not (args.repo or args.include or args.exclude):
         print("Scanning all user repositories for rate-limited issues...")
         print("(Use --global to explicitly scan all repos)")
 
     # Run scanner
+    sys.argv = ["scanner"] + scanner_args + _trace_argv(args)
     return scanner_main()
 
 
@@ -121,28 +311,202 @@ def cmd_issues_process(args):
     from .processor import main as processor_main
 
     # Run processor
+    gate_args = ["--gate"] if args.gate else []
+    if args.wake_file:
+        gate_args += ["--wake-file", args.wake_file]
+    sys.argv = ["processor"] + gate_args + _trace_argv(args)
     return processor_main()
 
 
+def cmd_issues_webhook(args):
+    """Run the webhook receiver."""
+    from .webhook import main as webhook_main
+
+    sys.argv = ["webhook", "--host", args.host, "--port", str(args.port)]
+    return webhook_main()
+
+
 def cmd_issues_status(args):
     """Show quick status summary."""
+    from .accounts import accounts_from_env, make_buckets
     from .database import Database
-    from .slot_calculator import SlotCalculator
+    from .forecast import QueueForecaster
 
     db = Database("traycer_queue.db")
-    calculator = SlotCalculator(db)
+    try:
+        accounts = accounts_from_env(
+            os.getenv("GITHUB_USERNAME", ""), os.getenv("GITHUB_TOKEN", "")
+        )
+    except ValueError as e:
+        print(f"Error: CODEFRAME_TRAYCER_ACCOUNTS: {e}", file=sys.stderr)
+        return 1
+
+    # Get queue stats (counted in SQL, never loaded)
+    ready_count = db.count_ready_issues()
+
+    # Get slot availability per account bucket
+    buckets = make_buckets(db, accounts)
+    statuses = {
+        bucket.username: bucket.slot_calculator.calculate_available_slots() for bucket in buckets
+    }
+    available = sum(status.available_slots for status in statuses.values())
+    total = sum(status.total_slots for status in statuses.values())
+    consumed = sum(status.consumed_slots for status in statuses.values())
 
-    # Get queue stats
-    ready_issues = db.get_issues_ready_for_processing()
+    # Forecast when each queued issue should be processed
+    forecaster = QueueForecaster(db, [bucket.slot_calculator for bucket in buckets])
+    etas = forecaster.forecast(list(statuses.values()))
 
-    # Get slot availability
-    slot_status = calculator.calculate_available_slots()
+    if args.json:
+        status = {
+            "ready_now": ready_count,
+            "available_slots": available,
+            "total_slots": total,
+            "consumed_slots": consumed,
+            "queued": len(etas),
+            "drains_at": etas[-1].eta.isoformat() if etas else None,
+            "forecast": [
+                {
+                    "position": position,
+                    "repo_name": eta.repo_name,
+                    "issue_number": eta.issue_number,
+                    "eta": eta.eta.isoformat(),
+                }
+                for position, eta in enumerate(etas, 1)
+            ],
+        }
+        print(json.dumps(status, indent=2))
+        return 0
 
     # Print summary
-    print(f"Issues Queue Status:")
-    print(f"  Ready now: {len(ready_issues)}")
-    print(f"  Available slots: {slot_status.available_slots}/{slot_status.total_slots}")
-    if slot_status.consumed_slots > 0:
-        print(f"  Consumed slots: {slot_status.consumed_slots}")
+    print("Issues Queue Status:")
+    print(f"  Ready now: {ready_count}")
+    print(f"  Available slots: {available}/{total}")
+    if consumed > 0:
+        print(f"  Consumed slots: {consumed}")
+    if len(statuses) > 1:
+        for username, status in statuses.items():
+            print(f"    {username or '(main)'}: {status.available_slots}/{status.total_slots}")
+    if etas:
+        print(f"  Queued: {len(etas)}, expected done by {etas[-1].eta.astimezone():%Y-%m-%d %H:%M}")
+        print("  Next up:")
+        for eta in etas[:5]:
+            print(f"    {eta.eta.astimezone():%Y-%m-%d %H:%M}  {eta.repo_name}#{eta.issue_number}")
+
+    return 0
+
+
+def cmd_issues_latency(args):
+    """Show end-to-end latency percentiles per repository and day."""
+    from .database import Database
+    from .latency import summarize
+
+    db = Database("traycer_queue.db")
+    rows = db.get_latency_histograms(days=args.days, repo_name=args.repo)
+
+    print(f"Rate-Limit Comment → Re-Analysis (last {args.days} days):")
+    if not rows:
+        print("  No completed issues recorded")
+        return 0
+
+    _print_latency(summarize(rows))
+    print()
+    print("By Repository:")
+    _print_latency(summarize(rows, key=lambda row: row["repo_name"]))
+    print()
+    print("By Day:")
+    _print_latency(reversed(summarize(rows, key=lambda row: str(row["day"]))))
+
+    return 0
+
+
+def _print_latency(summaries):
+    """Print one line of latency percentiles per summary."""
+    from .latency import format_seconds
+
+    for summary in summaries:
+        print(
+            f"  {summary.key or 'All':<40} {summary.count:>5} issues  "
+            f"p50 {format_seconds(summary.p50):>6}  p95 {format_seconds(summary.p95):>6}  "
+            f"p99 {format_seconds(summary.p99):>6}  max {format_seconds(summary.max):>6}"
+        )
+
+
+def cmd_issues_search(args):
+    """Search Traycer comments and queue errors."""
+    from .database import Database
+
+    db = Database("traycer_queue.db")
+    if not db.search_enabled:
+        print("Search needs SQLite with FTS5, which this Python was built without", file=sys.stderr)
+        return 1
+
+    query = " ".join(args.query)
+    results = db.search(query, limit=args.limit, source=args.source, repo_name=args.repo)
+    for result in results:
+        who = result["author"] or "queue error"
+        print(
+            f"{result['repo_name']}#{result['issue_number']}  {who}  "
+            f"{result['at'].astimezone():%Y-%m-%d %H:%M}"
+        )
+        print(f"  {' '.join(result['snippet'].split())}")
+    if not results:
+        print(f"No matches for {query!r}")
+
+    return 0
+
+
+def cmd_issues_prioritize(args):
+    """Set explicit priority of a queued issue."""
+    from .database import Database
+
+    db = Database("traycer_queue.db")
+
+    if not db.set_priority(args.repo, args.number, args.priority):
+        print(f"{args.repo}#{args.number} is not queued", file=sys.stderr)
+        return 1
+
+    print(f"Set priority of {args.repo}#{args.number} to {args.priority}")
+    return 0
+
+
+def cmd_issues_rescore(args):
+    """Recompute queue priority scores."""
+    from .database import Database
+
+    db = Database("traycer_queue.db")
+    count = db.rescore_queue()
+
+    print(f"Updated the score of {count} queued issue(s)")
+    return 0
+
+
+def cmd_issues_dead_letters(args):
+    """List dead-lettered issues."""
+    from .database import Database
+
+    db = Database("traycer_queue.db")
+    dead = db.get_dead_letters(limit=args.limit)
+
+    print(f"Dead-lettered issues: {len(dead)}")
+    for row in dead:
+        print(
+            f"  {row['dead_at'].astimezone():%Y-%m-%d %H:%M}  "
+            f"{row['repo_name']}#{row['issue_number']}  "
+            f"{row['error_class']} after {row['retry_count']} attempt(s): {row['last_error']}"
+        )
+    return 0
+
+
+def cmd_issues_requeue(args):
+    """Move a dead-lettered issue back to the queue."""
+    from .database import Database
+
+    db = Database("traycer_queue.db")
+
+    if not db.requeue_dead_letter(args.repo, args.number):
+        print(f"{args.repo}#{args.number} is not dead-lettered", file=sys.stderr)
+        return 1
 
+    print(f"Requeued {args.repo}#{args.number}")
     return 0
@@ -1,7 +1,6 @@
 """Repos object - Repository health and status management."""
 
 import subprocess
-import sys
 
 
 def setup_repos_parser(subparsers):
@@ -32,10 +31,41 @@ def setup_repos_parser(subparsers):
     status_parser = repos_subparsers.add_parser(
         "status",
         help="Repository status",
-        description="Show status across all repositories (not implemented yet)",
+        description="Show open issues, Traycer activity and queue state per repository, "
+        "read from the local mirror (no GitHub calls)",
     )
     status_parser.set_defaults(func=cmd_repos_status)
 
+    # cf repos rate-limits [--days N]
+    rate_limits_parser = repos_subparsers.add_parser(
+        "rate-limits",
+        help="GitHub API quota and usage",
+        description="Show shared GitHub API budget and per-component call counts",
+    )
+    rate_limits_parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        metavar="N",
+        help="Days of call history to show (default: 7)",
+    )
+    rate_limits_parser.set_defaults(func=cmd_repos_rate_limits)
+
+    # cf repos usage [--days N]
+    usage_parser = repos_subparsers.add_parser(
+        "usage",
+        help="Per-repo slot usage",
+        description="Show processing slots used per repository and fair-share credit",
+    )
+    usage_parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        metavar="N",
+        help="Days of history to show (default: 7)",
+    )
+    usage_parser.set_defaults(func=cmd_repos_usage)
+
 
 def cmd_repos_health(args):
     """Check system health."""
@@ -67,8 +97,7 @@ def cmd_repos_health(args):
         from .database import Database
 
         db = Database("traycer_queue.db")
-        ready = db.get_issues_ready_for_processing()
-        print(f"  ✓ Database accessible ({len(ready)} issues ready)")
+        print(f"  ✓ Database accessible ({db.count_ready_issues()} issues ready)")
     except Exception as e:
         print(f"  ✗ Database error: {e}")
 
@@ -115,12 +144,88 @@ def cmd_repos_health(args):
 
 
 def cmd_repos_status(args):
-    """Show repository status."""
-    print("Repository Status (coming soon)")
+    """Show repository status from the local mirror."""
+    from .database import Database
+    from .scanner import IssueScanner
+
+    db = Database("traycer_queue.db")
+
+    print("Repository Status (local mirror):")
+    summary = db.get_mirror_summary(IssueScanner.TRAYCER_BOT_LOGIN)
+    for row in summary:
+        print(
+            f"  {row['repo_name']:<40} {row['open_issues']:>4} open  "
+            f"{row['unassigned']:>4} unassigned  {row['commented']:>4} Traycer  "
+            f"{row['queued']:>4} queued  {row['dead_letters']:>3} dead  "
+            f"synced {row['synced_at'].astimezone():%Y-%m-%d %H:%M}"
+        )
+    if not summary:
+        print("  Mirror is empty; run `cf issues create-plan --backend mirror` to sync it")
+
+    return 0
+
+
+def cmd_repos_rate_limits(args):
+    """Show GitHub API budget and per-component call counts."""
+    from datetime import datetime
+
+    from .database import Database
+    from .rate_budget import RateBudget
+
+    db = Database("traycer_queue.db")
+
+    print("GitHub API Budget:")
+    budgets = db.get_rate_budgets()
+    for budget in budgets:
+        reset_at = datetime.fromtimestamp(budget["reset_at"]).strftime("%H:%M:%S")
+        reserve = RateBudget.PROCESSOR_RESERVE.get(budget["resource"], 0)
+        token = budget["token_id"] or "gh cli"
+        print(
+            f"  {budget['resource']:<8} {token:<12} "
+            f"{budget['remaining']:>6}/{budget['rate_limit']:<6} "
+            f"resets {reset_at}  (processor reserve: {reserve})"
+        )
+    if not budgets:
+        print("  No API responses recorded yet")
+
     print()
-    print("This command will show:")
-    print("  - All repos with open issues")
-    print("  - Issues in various states (planning, building, reviewing)")
-    print("  - PRs awaiting review or merge")
-    print("  - Deployment status")
+    print(f"API Calls (last {args.days} days):")
+    counts = db.get_api_call_counts(days=args.days)
+    for row in counts:
+        print(f"  {row['day']}  {row['component']:<16} {row['resource']:<8} {row['calls']:>7}")
+    if not counts:
+        print("  No API calls recorded yet")
+
+    return 0
+
+
+def cmd_repos_usage(args):
+    """Show per-repo slot usage and fair-share credit."""
+    from .database import Database
+    from .fair_share import FairShareAllocator
+
+    db = Database("traycer_queue.db")
+    allocator = FairShareAllocator(db)
+
+    print(f"Slot Usage (last {args.days} days):")
+    usage = db.get_repo_usage(days=args.days)
+    for row in usage:
+        print(
+            f"  {row['day']}  {row['repo_name']:<40} "
+            f"{row['attempts']:>4} attempts  {row['succeeded']:>4} succeeded"
+        )
+    if not usage:
+        print("  No processing attempts recorded")
+
+    print()
+    print("Fair-Share Credit:")
+    state = db.get_fair_share_state()
+    for repo_name, row in sorted(state.items()):
+        print(
+            f"  {repo_name:<40} weight {allocator.weight(repo_name):>4g}  "
+            f"credit {row['deficit']:>6.2f}  total slots {row['slots_used']}"
+        )
+    if not state:
+        print("  No allocations yet")
+
     return 0
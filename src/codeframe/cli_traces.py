@@ -0,0 +1,71 @@
+"""Traces object - Inspect timing traces from scanner and processor runs."""
+
+import json
+
+
+def setup_traces_parser(subparsers):
+    """Setup the 'traces' object parser with its commands."""
+    traces_parser = subparsers.add_parser(
+        "traces",
+        help="Inspect run timing traces",
+        description="Summarize JSON-lines traces written with --trace",
+    )
+
+    traces_subparsers = traces_parser.add_subparsers(
+        title="commands",
+        description="Available commands for traces",
+        dest="command",
+        required=True,
+        help="Command to run",
+    )
+
+    # cf traces summary FILE [--json]
+    summary_parser = traces_subparsers.add_parser(
+        "summary",
+        help="Summarize a trace file",
+        description="Show per-span timing and per-run counters from a trace file",
+    )
+    summary_parser.add_argument("file", metavar="FILE", help="Trace file to summarize")
+    summary_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the summary as JSON",
+    )
+    summary_parser.set_defaults(func=cmd_traces_summary)
+
+
+def cmd_traces_summary(args):
+    """Summarize a trace file."""
+    from .tracing import summarize_trace
+
+    summary = summarize_trace(args.file)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    runs = summary["runs"]
+    print(f"Trace Summary: {args.file}")
+    print(f"  Runs: {len(runs)}")
+    for run in runs:
+        counters = run.get("counters", {})
+        print(
+            f"  {run['started_at']} {run['component']:<10} "
+            f"{run['duration_ms'] / 1000:8.2f}s  "
+            f"api_calls={counters.get('api_calls', 0)} "
+            f"bytes={counters.get('bytes', 0)} "
+            f"cache_hits={counters.get('cache_hits', 0)}"
+        )
+
+    print()
+    print(
+        f"  {'Span':<40} {'Count':>7} {'Total ms':>11} "
+        f"{'Mean ms':>9} {'p95 ms':>9} {'Max ms':>9}"
+    )
+    for name, stats in summary["spans"].items():
+        print(
+            f"  {name:<40} {stats['count']:>7} {stats['total_ms']:>11.1f} "
+            f"{stats['mean_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+
+    return 0
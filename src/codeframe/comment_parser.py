@@ -0,0 +1,100 @@
+"""Single-pass classification of Traycer bot comments.
+
+Scanner, processor and webhook receiver all need the same answer for a Traycer
+comment: is it a rate-limit notice (and how long to wait), an analysis, or
+something else. This module is the one grammar for that.
+
+Rate-limit notices look like:
+
+    Rate limit exceeded. Please try after 1800 seconds.
+
+or, in GitHub's alert blockquote format, possibly wrapped across lines:
+
+    > [!WARNING]
+    > Rate limit exceeded.
+    > Please try after 1800 seconds.
+
+Parsing uses str.find for the anchor phrase and a hand-written scanner for the
+rest, so the cost is linear in the body length with no regex backtracking.
+The mirror stores each comment's classification (see mirror.py), so readers
+that need it later query the database instead of parsing again.
+"""
+
+from typing import NamedTuple
+
+RATE_LIMITED = "rate_limited"
+ANALYSIS = "analysis"
+OTHER = "other"
+
+_ANCHOR = "Rate limit exceeded."
+_PROMPT = "Please try after"
+_UNIT = "second"
+_SEPARATORS = frozenset(" \t\r\n>")
+_ALERT_MARKERS = ("[!WARNING]", "[!CAUTION]", "[!IMPORTANT]")
+
+
+class ParsedComment(NamedTuple):
+    """Classification of a Traycer comment."""
+
+    kind: str  # RATE_LIMITED, ANALYSIS or OTHER
+    wait_seconds: int | None = None  # Set only for RATE_LIMITED
+
+
+def _skip_separators(text: str, pos: int) -> int:
+    """Advance past whitespace and blockquote markers."""
+    end = len(text)
+    while pos < end and text[pos] in _SEPARATORS:
+        pos += 1
+    return pos
+
+
+def parse_wait_seconds(body: str) -> int | None:
+    """Extract the wait time from a rate-limit notice.
+
+    Args:
+        body: Comment body
+
+    Returns:
+        Seconds to wait, or None if the body holds no rate-limit notice
+    """
+    start = body.find(_ANCHOR)
+    while start != -1:
+        pos = _skip_separators(body, start + len(_ANCHOR))
+        if body.startswith(_PROMPT, pos):
+            pos = _skip_separators(body, pos + len(_PROMPT))
+            digits_start = pos
+            while pos < len(body) and body[pos].isdigit():
+                pos += 1
+            if pos > digits_start:
+                seconds = int(body[digits_start:pos])
+                pos = _skip_separators(body, pos)
+                if body.startswith(_UNIT, pos):
+                    return seconds
+        start = body.find(_ANCHOR, start + 1)
+    return None
+
+
+def parse_comment(body: str | None) -> ParsedComment:
+    """Classify a Traycer comment.
+
+    Args:
+        body: Comment body (None is treated as empty)
+
+    Returns:
+        ParsedComment: RATE_LIMITED with wait_seconds, ANALYSIS for a regular
+        Traycer post, or OTHER for empty bodies and non-rate-limit alert notices
+    """
+    if not body or body.isspace():
+        return ParsedComment(OTHER)
+
+    seconds = parse_wait_seconds(body)
+    if seconds is not None:
+        return ParsedComment(RATE_LIMITED, seconds)
+
+    # An alert block at the top is a notice (e.g. a different error), not an analysis
+    head = body.lstrip(" \t\r\n>")
+    if head.startswith(_ALERT_MARKERS):
+        return ParsedComment(OTHER)
+
+    return ParsedComment(ANALYSIS)
+
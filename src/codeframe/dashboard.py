@@ -3,8 +3,9 @@
 Displays real-time status of the queue, processing history, and slot availability.
 """
 
+import os
+import sys
 from datetime import datetime
-from typing import Any
 
 from rich.console import Console
 from rich.layout import Layout
@@ -13,23 +14,49 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from .accounts import TraycerAccount, accounts_from_env, make_buckets
 from .database import Database
-from .slot_calculator import SlotCalculator
+from .forecast import QueueForecaster
+from .slot_calculator import SlotStatus
+
+# Status label and style per processing_history outcome (rows from before
+# outcomes were recorded fall back to the success flag)
+OUTCOME_STATUS = {
+    "success": ("✓ Success", "green"),
+    "rate_limited": ("⚠ Rate Limited", "yellow"),
+    "pending": ("… Pending", "cyan"),
+    "unknown": ("? No Reply", "dim"),
+    "error": ("✗ Error", "red"),
+}
 
 
 class QueueDashboard:
     """Interactive dashboard for monitoring the Traycer queue system."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, accounts: list[TraycerAccount] | None = None):
         """Initialize dashboard with database connection.
 
         Args:
             db: Database instance
+            accounts: Traycer accounts, main account first, whose slot buckets
+                are shown as in `cf issues status` (defaults to a single bucket)
         """
         self.db = db
-        self.slot_calculator = SlotCalculator(db)
+        self.buckets = make_buckets(db, accounts or [TraycerAccount("", "")])
+        self.forecaster = QueueForecaster(db, [bucket.slot_calculator for bucket in self.buckets])
         self.console = Console()
 
+    def slot_statuses(self) -> dict[str, SlotStatus]:
+        """Slot availability of each account's bucket.
+
+        Returns:
+            Mapping of account username to its slot status, main account first
+        """
+        return {
+            bucket.username: bucket.slot_calculator.calculate_available_slots()
+            for bucket in self.buckets
+        }
+
     def create_layout(self) -> Layout:
         """Create the dashboard layout.
 
@@ -82,26 +109,19 @@ class QueueDashboard:
         Returns:
             Panel with queue stats
         """
+        total_queued = self.db.count_queued_issues()
+        ready_now = self.db.count_ready_issues()
+
         with self.db._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Total queued issues
-            cursor.execute("SELECT COUNT(*) FROM queued_issues")
-            total_queued = cursor.fetchone()[0]
-
-            # Issues ready for processing
-            cursor.execute(
-                "SELECT COUNT(*) FROM queued_issues WHERE next_retry_at IS NULL OR next_retry_at <= ?",
-                (datetime.now(),),
-            )
-            ready_now = cursor.fetchone()[0]
-
             # Issues with retries
             cursor.execute("SELECT COUNT(*) FROM queued_issues WHERE retry_count > 0")
             with_retries = cursor.fetchone()[0]
 
-        # Get slot availability
-        slot_status = self.slot_calculator.calculate_available_slots()
+        # Get slot availability per bucket and when the queue should be worked through
+        statuses = self.slot_statuses()
+        etas = self.forecaster.forecast(list(statuses.values()))
 
         table = Table(show_header=False, box=None, padding=(0, 1))
         table.add_column("Metric", style="cyan")
@@ -111,9 +131,12 @@ class QueueDashboard:
         table.add_row("Ready Now", str(ready_now))
         table.add_row("With Retries", str(with_retries))
         table.add_row("", "")  # Spacer
-        table.add_row(
-            "Available Slots", f"{slot_status.available_slots}/{slot_status.total_slots}"
-        )
+        for username, status in statuses.items():
+            label = f"Slots ({username})" if len(statuses) > 1 else "Available Slots"
+            table.add_row(label, f"{status.available_slots}/{status.total_slots}")
+        if etas:
+            table.add_row("Next ETA", etas[0].eta.astimezone().strftime("%H:%M"))
+            table.add_row("Queue Drains By", etas[-1].eta.astimezone().strftime("%m-%d %H:%M"))
 
         return Panel(table, title="[bold]Queue Status", border_style="blue")
 
@@ -154,7 +177,7 @@ class QueueDashboard:
         Returns:
             Panel with recent activity
         """
-        history = self.db.get_recent_processing_history(minutes=60)
+        history = self.db.get_recent_processing_history(minutes=60, typed=True)
 
         table = Table(show_header=True, header_style="bold cyan")
         table.add_column("Time", style="dim")
@@ -163,11 +186,13 @@ class QueueDashboard:
         table.add_column("Status")
 
         for record in history[:10]:
-            time_str = datetime.fromisoformat(record["processed_at"]).strftime("%H:%M:%S")
+            time_str = record.processed_at.astimezone().strftime("%H:%M:%S")
             repo_short = record["repo_name"].split("/")[-1]
 
-            status = "✓ Success" if record["success"] else "⚠ Rate Limited"
-            status_style = "green" if record["success"] else "yellow"
+            status, status_style = OUTCOME_STATUS.get(
+                record.outcome,
+                ("✓ Success", "green") if record.success else ("⚠ Rate Limited", "yellow"),
+            )
 
             table.add_row(
                 time_str,
@@ -187,7 +212,7 @@ class QueueDashboard:
         Returns:
             Panel with error log
         """
-        errors = self.db.get_consecutive_errors(limit=5)
+        errors = self.db.get_consecutive_errors(limit=5, typed=True)
 
         table = Table(show_header=True, header_style="bold cyan")
         table.add_column("Time", style="dim")
@@ -195,9 +220,11 @@ class QueueDashboard:
         table.add_column("Message", style="red", no_wrap=False)
 
         for error in errors:
-            time_str = datetime.fromisoformat(error["timestamp"]).strftime("%H:%M")
+            time_str = error.timestamp.astimezone().strftime("%H:%M")
             error_type = error["error_type"]
-            message = error["error_message"][:50] + "..." if len(error["error_message"]) > 50 else error["error_message"]
+            message = error["error_message"]
+            if len(message) > 50:
+                message = message[:50] + "..."
 
             table.add_row(time_str, error_type, message)
 
@@ -233,7 +260,11 @@ class QueueDashboard:
             refresh_seconds: Seconds between refreshes
         """
         try:
-            with Live(self.render_dashboard(), console=self.console, refresh_per_second=1 / refresh_seconds) as live:
+            with Live(
+                self.render_dashboard(),
+                console=self.console,
+                refresh_per_second=1 / refresh_seconds,
+            ) as live:
                 while True:
                     import time
                     time.sleep(refresh_seconds)
@@ -261,8 +292,16 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    try:
+        accounts = accounts_from_env(
+            os.getenv("GITHUB_USERNAME", ""), os.getenv("GITHUB_TOKEN", "")
+        )
+    except ValueError as e:
+        print(f"Error: CODEFRAME_TRAYCER_ACCOUNTS: {e}", file=sys.stderr)
+        sys.exit(1)
+
     db = Database()
-    dashboard = QueueDashboard(db)
+    dashboard = QueueDashboard(db, accounts)
 
     if args.live:
         dashboard.run_live(refresh_seconds=args.refresh)
@@ -1,33 +1,136 @@
 """Database management for the Traycer queue system."""
 
+import atexit
 import sqlite3
+import time
+from collections.abc import Generator
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import UTC, datetime
+from itertools import groupby
 from pathlib import Path
-from typing import Any, Generator
+from typing import TYPE_CHECKING, Any
+
+from .latency import bucket_of
+from .priority import IssueContext, PriorityPolicy, policy_from_env
+from .rows import (
+    EPOCH_COLUMNS,
+    EpochConnection,
+    ErrorRecord,
+    MirroredComment,
+    MirroredIssue,
+    ProcessingRecord,
+    columns,
+    dict_row,
+    row_factory,
+)
+from .tracing import Tracer, traced
+
+if TYPE_CHECKING:
+    from .log_writer import LogRow, LogWriter
+
+# Current time as integer Unix seconds, for column defaults and upserts
+NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
 
 
 class Database:
     """Manages SQLite database for tracking issues, processing history, and errors."""
 
-    def __init__(self, db_path: str | Path = "traycer_queue.db"):
+    # Errors committed before log_error returns even when logs are buffered
+    DURABLE_ERROR_TYPES = frozenset({"circuit_breaker"})
+    # Indexed prefix of each comment for search; Traycer analyses can run far longer
+    SEARCH_BODY_CHARS = 20_000
+
+    def __init__(
+        self,
+        db_path: str | Path = "traycer_queue.db",
+        tracer: Tracer | None = None,
+        priority_policy: PriorityPolicy | None = None,
+    ):
         """Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            tracer: Optional tracer for timing queries
+            priority_policy: Policy scoring queued issues (defaults to env configuration)
         """
         self.db_path = Path(db_path)
+        self.tracer = tracer or Tracer()
+        self.priority_policy = priority_policy or policy_from_env()
+        self.log_writer: LogWriter | None = None
+        self.search_enabled = False
         self._init_db()
 
+    def buffer_logs(self, max_pending: int | None = None) -> "LogWriter":
+        """Write processing and error logs from a background thread from now on.
+
+        Args:
+            max_pending: Bound on buffered rows (defaults to LogWriter.MAX_PENDING)
+
+        Returns:
+            The running log writer
+        """
+        from .log_writer import LogWriter
+
+        if self.log_writer is None:
+            self.log_writer = LogWriter(self, max_pending)
+            self.log_writer.start()
+            atexit.register(self.unbuffer_logs)
+        return self.log_writer
+
+    def unbuffer_logs(self) -> None:
+        """Flush and stop the log writer; logs are written synchronously again."""
+        writer, self.log_writer = self.log_writer, None
+        if writer is not None:
+            writer.stop()
+
+    def flush_logs(self) -> None:
+        """Wait until buffered log rows are committed (no-op without a log writer)."""
+        if self.log_writer is not None:
+            self.log_writer.flush()
+
+    def _write_log(self, query: str, params: tuple[Any, ...], durable: bool = False) -> None:
+        """Write a log row now, or hand it to the log writer if logs are buffered.
+
+        Args:
+            query: INSERT or UPDATE statement
+            params: Statement parameters
+            durable: Commit before returning (after everything buffered before it)
+        """
+        if self.log_writer is not None and not durable:
+            self.log_writer.submit(query, params)
+            return
+        self.flush_logs()
+        with self._get_connection() as conn:
+            conn.execute(query, params)
+
+    def write_logs(self, rows: "list[LogRow]") -> None:
+        """Commit a batch of log statements in one transaction (used by LogWriter).
+
+        Args:
+            rows: (statement, parameters) pairs, in submission order
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for query, group in groupby(rows, key=lambda row: row[0]):
+                cursor.executemany(query, [params for _, params in group])
+
     @contextmanager
-    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+    def _get_connection(
+        self, record: type[tuple] | None = None
+    ) -> Generator[sqlite3.Connection, None, None]:
         """Context manager for database connections.
 
+        Datetime parameters and EPOCH, BOOLEAN and DATE columns are converted by
+        the connection (see rows.py).
+
+        Args:
+            record: Build rows as this typed record (queries must select columns(record))
+
         Yields:
             SQLite connection with row factory enabled
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = sqlite3.connect(self.db_path, factory=EpochConnection)
+        conn.row_factory = dict_row if record is None else row_factory(record)
         try:
             yield conn
             conn.commit()
@@ -41,39 +144,80 @@ class Database:
         """Initialize database schema."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            legacy = self._set_aside_legacy_tables(cursor)
 
             # Table for issues awaiting re-analysis
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS queued_issues (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     repo_name TEXT NOT NULL,
                     issue_number INTEGER NOT NULL,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    next_retry_at TIMESTAMP,
+                    added_at EPOCH DEFAULT ({NOW}),
+                    next_retry_at EPOCH,
                     retry_count INTEGER DEFAULT 0,
                     last_error TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    score INTEGER NOT NULL DEFAULT 0,
+                    labels TEXT,
+                    issue_created_at EPOCH,
+                    claimed_until EPOCH,
+                    rate_limited_at EPOCH,
+                    UNIQUE(repo_name, issue_number)
+                )
+            """)
+            self._add_missing_columns(
+                cursor,
+                "queued_issues",
+                {
+                    "priority": "INTEGER NOT NULL DEFAULT 0",
+                    "score": "INTEGER NOT NULL DEFAULT 0",
+                    "labels": "TEXT",
+                    "issue_created_at": "EPOCH",
+                    "claimed_until": "EPOCH",
+                    "rate_limited_at": "EPOCH",
+                },
+            )
+
+            # Issues that ran out of retries, kept for inspection and requeueing
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS dead_letter_issues (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    repo_name TEXT NOT NULL,
+                    issue_number INTEGER NOT NULL,
+                    added_at EPOCH,
+                    retry_count INTEGER NOT NULL DEFAULT 0,
+                    error_class TEXT NOT NULL,
+                    last_error TEXT,
+                    labels TEXT,
+                    issue_created_at EPOCH,
+                    dead_at EPOCH DEFAULT ({NOW}),
                     UNIQUE(repo_name, issue_number)
                 )
             """)
 
             # Table for processing history (used for slot calculation)
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS processing_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     repo_name TEXT NOT NULL,
                     issue_number INTEGER NOT NULL,
-                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    processed_at EPOCH DEFAULT ({NOW}),
                     success BOOLEAN NOT NULL,
                     rate_limit_message TEXT,
-                    rate_limit_seconds INTEGER
+                    rate_limit_seconds INTEGER,
+                    account TEXT,
+                    outcome TEXT
                 )
             """)
+            self._add_missing_columns(
+                cursor, "processing_history", {"account": "TEXT", "outcome": "TEXT"}
+            )
 
             # Table for error logging
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS error_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp EPOCH DEFAULT ({NOW}),
                     error_type TEXT NOT NULL,
                     error_message TEXT NOT NULL,
                     repo_name TEXT,
@@ -81,6 +225,134 @@ class Database:
                 )
             """)
 
+            # Table for shared GitHub API quota (X-RateLimit-* headers), per token.
+            # Rows are a cache of the last response, so a table keyed by resource
+            # alone (from before token pools) is simply rebuilt
+            cursor.execute("PRAGMA table_info(rate_limit_budget)")
+            budget_columns = {row["name"] for row in cursor.fetchall()}
+            if budget_columns and "token_id" not in budget_columns:
+                cursor.execute("DROP TABLE rate_limit_budget")
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS rate_limit_budget (
+                    token_id TEXT NOT NULL DEFAULT '',
+                    resource TEXT NOT NULL,
+                    remaining INTEGER NOT NULL,
+                    rate_limit INTEGER NOT NULL,
+                    reset_at INTEGER NOT NULL,
+                    updated_at EPOCH DEFAULT ({NOW}),
+                    PRIMARY KEY (token_id, resource)
+                )
+            """)
+
+            # Table for per-component API call counts (capacity planning)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS api_call_counts (
+                    component TEXT NOT NULL,
+                    resource TEXT NOT NULL,
+                    day DATE NOT NULL,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (component, resource, day)
+                )
+            """)
+
+            # Table for end-to-end latency histograms per repo and day (see latency.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS issue_latency (
+                    repo_name TEXT NOT NULL,
+                    day DATE NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (repo_name, day, bucket)
+                )
+            """)
+
+            # Table for per-repo fair-share credit (see fair_share.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS repo_fair_share (
+                    repo_name TEXT PRIMARY KEY,
+                    deficit REAL NOT NULL DEFAULT 0,
+                    slots_used INTEGER NOT NULL DEFAULT 0,
+                    last_served_at EPOCH
+                )
+            """)
+
+            # Table for cached scan metadata (e.g. the Traycer-active repo set)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS scan_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at EPOCH DEFAULT ({NOW})
+                )
+            """)
+
+            # Local mirror of GitHub state (see mirror.py): when each repo was
+            # last synced, its open issues, and metadata of their comments
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mirror_repos (
+                    repo_name TEXT PRIMARY KEY,
+                    synced_at EPOCH NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mirror_issues (
+                    repo_name TEXT NOT NULL,
+                    issue_number INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    assignees TEXT NOT NULL DEFAULT '',
+                    labels TEXT NOT NULL DEFAULT '',
+                    created_at EPOCH NOT NULL,
+                    updated_at EPOCH NOT NULL,
+                    PRIMARY KEY (repo_name, issue_number)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mirror_comments (
+                    comment_id INTEGER PRIMARY KEY,
+                    repo_name TEXT NOT NULL,
+                    issue_number INTEGER NOT NULL,
+                    author TEXT NOT NULL,
+                    created_at EPOCH NOT NULL,
+                    updated_at EPOCH NOT NULL,
+                    kind TEXT,
+                    wait_seconds INTEGER
+                )
+            """)
+
+            # Circuit breaker state per failure domain ('global', 'repo:<name>', 'error:<class>')
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS circuit_breakers (
+                    domain TEXT PRIMARY KEY,
+                    state TEXT NOT NULL DEFAULT 'closed',
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    window_started_at EPOCH,
+                    opened_at EPOCH,
+                    probe_until EPOCH,
+                    last_error TEXT
+                )
+            """)
+
+            self._copy_legacy_rows(cursor, legacy)
+
+            # Full-text index of Traycer comments (rowid = comment ID) and queue
+            # errors (rowid = -queued_issues.id), for `cf issues search`
+            try:
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                        body,
+                        source UNINDEXED,
+                        repo_name UNINDEXED,
+                        issue_number UNINDEXED,
+                        author UNINDEXED,
+                        at UNINDEXED,
+                        version UNINDEXED,
+                        tokenize = 'porter unicode61'
+                    )
+                """)
+                self.search_enabled = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: everything but search keeps working
+                self.search_enabled = False
+
             # Create indexes for common queries
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_queued_issues_retry
@@ -90,40 +362,343 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_processing_history_time
                 ON processing_history(processed_at)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_processing_history_issue
+                ON processing_history(repo_name, issue_number, processed_at)
+            """)
+            # Backs the latest-comment-by-author lookups on the mirror
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mirror_comments_issue
+                ON mirror_comments(repo_name, issue_number, author, created_at)
+            """)
+            # Backs the ready filter of the per-repo dequeue in get_issues_ready_for_processing
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_queued_issues_repo_retry
+                ON queued_issues(repo_name, next_retry_at)
+            """)
+
+    @staticmethod
+    def _add_missing_columns(
+        cursor: sqlite3.Cursor, table: str, columns: dict[str, str]
+    ) -> None:
+        """Add columns introduced after a database was created.
+
+        Args:
+            cursor: Open cursor
+            table: Table to migrate
+            columns: Column name to SQL type/default definition
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    @staticmethod
+    def _set_aside_legacy_tables(cursor: sqlite3.Cursor) -> list[str]:
+        """Rename tables that still store timestamps as text or floats, to be rebuilt.
+
+        Timestamps used to be TIMESTAMP text in mixed formats: naive local time
+        from Python, naive UTC from CURRENT_TIMESTAMP, and ISO strings with an
+        offset from GitHub; circuit breaker times were REAL Unix seconds. Tables
+        with such columns are renamed to `<table>_legacy`, and `_copy_legacy_rows`
+        moves their rows into the rebuilt EPOCH tables; both steps run in one
+        transaction.
+
+        Args:
+            cursor: Open cursor, outside any transaction
+
+        Returns:
+            Names of the tables set aside
+        """
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+        legacy = []
+        for table in [row["name"] for row in cursor.fetchall()]:
+            cursor.execute(f"PRAGMA table_info({table})")
+            if any(
+                row["type"] == "TIMESTAMP"
+                or (row["name"] in EPOCH_COLUMNS and row["type"] == "REAL")
+                for row in cursor.fetchall()
+            ):
+                legacy.append(table)
+        if legacy:
+            cursor.execute("BEGIN")
+            for table in legacy:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        return legacy
+
+    # Legacy columns written as naive local time; other naive values were UTC
+    _LOCAL_TIME_COLUMNS = ("next_retry_at", "claimed_until")
+
+    @classmethod
+    def _copy_legacy_rows(cls, cursor: sqlite3.Cursor, tables: list[str]) -> None:
+        """Move rows of set-aside tables into their rebuilt tables, then drop them.
+
+        Args:
+            cursor: Open cursor
+            tables: Tables returned by _set_aside_legacy_tables
+        """
+        for table in tables:
+            cursor.execute(f"PRAGMA table_info({table})")
+            types = {row["name"]: row["type"] for row in cursor.fetchall()}
+            legacy_rows = cursor.connection.cursor()
+            legacy_rows.row_factory = sqlite3.Row  # Stored text, not epoch seconds yet
+            legacy_rows.execute(f"SELECT * FROM {table}_legacy")
+            rows = legacy_rows.fetchall()
+            if rows:
+                names = [name for name in rows[0].keys() if name in types]
+                epoch = {name for name in names if types[name] == "EPOCH"}
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(names)}) "
+                    f"VALUES ({', '.join('?' * len(names))})",
+                    [
+                        tuple(
+                            cls._legacy_epoch(row[name], name in cls._LOCAL_TIME_COLUMNS)
+                            if name in epoch
+                            else row[name]
+                            for name in names
+                        )
+                        for row in rows
+                    ],
+                )
+            cursor.execute(f"DROP TABLE {table}_legacy")
+
+    @staticmethod
+    def _legacy_epoch(value: Any, local: bool) -> int | None:
+        """Convert a legacy TIMESTAMP or REAL value to Unix seconds.
+
+        Args:
+            value: Stored text ('2026-01-01 10:00:00[.ffffff][+00:00]'), float
+                seconds, or None
+            local: Whether a value without offset is local time rather than UTC
+
+        Returns:
+            Unix seconds, or None
+        """
+        if value is None:
+            return None
+        if isinstance(value, int | float):
+            return int(value)
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None and not local:
+            parsed = parsed.replace(tzinfo=UTC)
+        return int(parsed.timestamp())
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """Normalize a caller's timestamp for comparison with stored ones.
+
+        Callers pass both naive local time (datetime.now()) and timezone-aware
+        GitHub timestamps; stored timestamps read back as aware UTC.
 
+        Args:
+            value: Naive local or timezone-aware datetime
+
+        Returns:
+            Aware UTC datetime
+        """
+        return value.astimezone(UTC)
+
+    def _score(self, row: sqlite3.Row | dict[str, Any] | None, **overrides: Any) -> int:
+        """Score a queue row with the priority policy.
+
+        Args:
+            row: Existing queue row, or None for a new issue
+            **overrides: Field values replacing those of the row
+
+        Returns:
+            Priority score to store on the row
+        """
+        fields = dict(row) if row is not None else {}
+        fields.update(overrides)
+
+        return self.priority_policy.score(
+            IssueContext(
+                repo_name=fields["repo_name"],
+                issue_number=fields["issue_number"],
+                labels=tuple(label for label in (fields.get("labels") or "").split(",") if label),
+                created_at=fields.get("issue_created_at"),
+                retry_count=fields.get("retry_count") or 0,
+                priority=fields.get("priority") or 0,
+            )
+        )
+
+    @traced("db.add_issue")
     def add_issue(
-        self, repo_name: str, issue_number: int, next_retry_at: datetime | None = None
+        self,
+        repo_name: str,
+        issue_number: int,
+        next_retry_at: datetime | None = None,
+        labels: list[str] | None = None,
+        created_at: datetime | None = None,
+        rate_limited_at: datetime | None = None,
     ) -> bool:
         """Add or update an issue in the queue.
 
+        If the issue is already queued, the later of the existing and new retry
+        times wins, so a re-scan cannot pull an issue forward into a window that
+        is still rate limited. The earliest rate-limit time is kept, so latency
+        is measured from the first comment users saw.
+
         Args:
             repo_name: Repository full name (owner/repo)
             issue_number: Issue number
             next_retry_at: When to retry (defaults to now + 32 minutes)
+            labels: Issue label names, used by the priority policy
+            created_at: When the issue was opened, used by the priority policy
+            rate_limited_at: When Traycer's rate-limit comment was posted, used for
+                end-to-end latency (see complete_issue)
+
+        Returns:
+            True if added (new), False if already exists (and was updated)
+        """
+        with self._get_connection() as conn:
+            return self._upsert_issue(
+                conn.cursor(),
+                repo_name,
+                issue_number,
+                next_retry_at,
+                labels,
+                created_at,
+                rate_limited_at,
+            )
+
+    @traced("db.add_issues")
+    def add_issues(self, issues: list[dict[str, Any]]) -> int:
+        """Add or update several issues in one transaction.
+
+        Args:
+            issues: Dicts with add_issue keyword arguments (repo_name, issue_number,
+                and optionally next_retry_at, labels, created_at, rate_limited_at)
+
+        Returns:
+            Number of issues that were newly added
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            return sum(self._upsert_issue(cursor, **issue) for issue in issues)
+
+    def _upsert_issue(
+        self,
+        cursor: sqlite3.Cursor,
+        repo_name: str,
+        issue_number: int,
+        next_retry_at: datetime | None = None,
+        labels: list[str] | None = None,
+        created_at: datetime | None = None,
+        rate_limited_at: datetime | None = None,
+    ) -> bool:
+        """Insert or update a queue row (see add_issue).
 
         Returns:
             True if added (new), False if already exists (and was updated)
         """
+        # Check if issue already exists
+        cursor.execute(
+            "SELECT * FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+            (repo_name, issue_number),
+        )
+        existing = cursor.fetchone()
+
+        overrides: dict[str, Any] = {"repo_name": repo_name, "issue_number": issue_number}
+        if labels is not None:
+            overrides["labels"] = ",".join(labels)
+        if created_at is not None:
+            overrides["issue_created_at"] = created_at
+        score = self._score(existing, **overrides)
+
+        if existing is not None and existing["next_retry_at"]:
+            current = existing["next_retry_at"]
+            if next_retry_at is None or current > self._to_utc(next_retry_at):
+                next_retry_at = current
+
+        cursor.execute(
+            """
+            INSERT INTO queued_issues
+            (repo_name, issue_number, next_retry_at, labels, issue_created_at, score,
+             rate_limited_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(repo_name, issue_number)
+            DO UPDATE SET
+                next_retry_at = excluded.next_retry_at,
+                labels = COALESCE(excluded.labels, labels),
+                issue_created_at = COALESCE(excluded.issue_created_at, issue_created_at),
+                score = excluded.score,
+                rate_limited_at = COALESCE(
+                    MIN(rate_limited_at, excluded.rate_limited_at),
+                    rate_limited_at,
+                    excluded.rate_limited_at
+                )
+        """,
+            (
+                repo_name,
+                issue_number,
+                next_retry_at,
+                overrides.get("labels"),
+                created_at,
+                score,
+                rate_limited_at,
+            ),
+        )
+        return existing is None
+
+    @traced("db.set_priority")
+    def set_priority(self, repo_name: str, issue_number: int, priority: int) -> bool:
+        """Set the explicit priority of a queued issue and rescore it.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            priority: Explicit priority (higher is dequeued sooner, may be negative)
+
+        Returns:
+            True if the issue is queued and was updated, False otherwise
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            # Check if issue already exists
             cursor.execute(
-                "SELECT 1 FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+                "SELECT * FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
                 (repo_name, issue_number),
             )
-            exists = cursor.fetchone() is not None
+            existing = cursor.fetchone()
+            if existing is None:
+                return False
 
             cursor.execute(
                 """
-                INSERT INTO queued_issues (repo_name, issue_number, next_retry_at)
-                VALUES (?, ?, ?)
-                ON CONFLICT(repo_name, issue_number)
-                DO UPDATE SET next_retry_at = excluded.next_retry_at
+                UPDATE queued_issues SET priority = ?, score = ?
+                WHERE repo_name = ? AND issue_number = ?
             """,
-                (repo_name, issue_number, next_retry_at),
+                (priority, self._score(existing, priority=priority), repo_name, issue_number),
             )
-            return not exists
+            return True
+
+    @traced("db.rescore_queue")
+    def rescore_queue(self) -> int:
+        """Recompute every queued issue's stored score and store the ones that changed.
+
+        Stored scores only change with policy weights (age is scored at dequeue,
+        see PriorityPolicy.sql_score), so this runs from `cf issues rescore` after
+        changing them, never per processor run. Rows migrated from before scoring
+        existed start at 0 and are brought up to date here too.
+
+        Returns:
+            Number of issues whose score changed
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM queued_issues")
+            updates = []
+            for row in cursor.fetchall():
+                score = self._score(row)
+                if score != row["score"]:
+                    updates.append((score, row["id"]))
+            cursor.executemany("UPDATE queued_issues SET score = ? WHERE id = ?", updates)
+            return len(updates)
 
+    @traced("db.remove_issue")
     def remove_issue(self, repo_name: str, issue_number: int) -> None:
         """Remove an issue from the queue.
 
@@ -138,152 +713,1503 @@ class Database:
                 (repo_name, issue_number),
             )
 
-    def get_issues_ready_for_processing(self, limit: int | None = None) -> list[dict[str, Any]]:
-        """Get issues ready for processing (next_retry_at <= now).
+    @traced("db.remove_issues")
+    def remove_issues(self, issues: list[tuple[str, int]]) -> None:
+        """Remove several issues from the queue in one transaction.
 
         Args:
-            limit: Maximum number of issues to return
-
-        Returns:
-            List of issue records as dictionaries
+            issues: (repo_name, issue_number) pairs
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            query = """
-                SELECT * FROM queued_issues
-                WHERE next_retry_at IS NULL OR next_retry_at <= ?
-                ORDER BY next_retry_at ASC
-            """
-            if limit:
-                query += f" LIMIT {limit}"
-
-            cursor.execute(query, (datetime.now(),))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.executemany(
+                "DELETE FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+                issues,
+            )
 
-    def increment_retry_count(
-        self, repo_name: str, issue_number: int, error: str, next_retry_at: datetime | None = None
-    ) -> None:
-        """Increment retry count for an issue and log error.
+    @traced("db.complete_issue")
+    def complete_issue(
+        self, repo_name: str, issue_number: int, completed_at: datetime | None = None
+    ) -> float | None:
+        """Remove a successfully re-analyzed issue and record its end-to-end latency.
 
         Args:
             repo_name: Repository full name
             issue_number: Issue number
-            error: Error message to log
-            next_retry_at: Optional new retry time (if rate limited again)
+            completed_at: When the re-analysis landed (defaults to now)
+
+        Returns:
+            Seconds from the rate-limit comment to completion, or None if the
+            issue was not queued or its rate-limit time is unknown
+        """
+        completed_at = completed_at or datetime.now(UTC)
+        return self.complete_issues([(repo_name, issue_number, completed_at)])[0]
+
+    @traced("db.complete_issues")
+    def complete_issues(
+        self, completions: list[tuple[str, int, datetime]]
+    ) -> list[float | None]:
+        """Complete several issues in one transaction (see complete_issue).
+
+        Latencies are added to the issue_latency histogram of the repo and the
+        (UTC) day of completion.
+
+        Args:
+            completions: (repo_name, issue_number, completed_at) triples
+
+        Returns:
+            Latency in seconds per completion, None where unknown
         """
+        latencies: list[float | None] = []
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            if next_retry_at:
+            for repo_name, issue_number, completed_at in completions:
                 cursor.execute(
                     """
-                    UPDATE queued_issues
-                    SET retry_count = retry_count + 1, last_error = ?, next_retry_at = ?
-                    WHERE repo_name = ? AND issue_number = ?
+                    DELETE FROM queued_issues WHERE repo_name = ? AND issue_number = ?
+                    RETURNING rate_limited_at
                 """,
-                    (error, next_retry_at, repo_name, issue_number),
+                    (repo_name, issue_number),
                 )
-            else:
+                row = cursor.fetchone()
+                if row is None or row["rate_limited_at"] is None:
+                    latencies.append(None)
+                    continue
+
+                waited = self._to_utc(completed_at) - row["rate_limited_at"]
+                seconds = max(0.0, waited.total_seconds())
+                latencies.append(seconds)
                 cursor.execute(
                     """
-                    UPDATE queued_issues
-                    SET retry_count = retry_count + 1, last_error = ?
-                    WHERE repo_name = ? AND issue_number = ?
+                    INSERT INTO issue_latency (repo_name, day, bucket, count)
+                    VALUES (?, date(?, 'unixepoch'), ?, 1)
+                    ON CONFLICT(repo_name, day, bucket) DO UPDATE SET count = count + 1
                 """,
-                    (error, repo_name, issue_number),
+                    (repo_name, completed_at, bucket_of(seconds)),
                 )
+        return latencies
 
-    def log_processing(
-        self,
-        repo_name: str,
-        issue_number: int,
-        success: bool,
-        rate_limit_message: str | None = None,
-        rate_limit_seconds: int | None = None,
-    ) -> None:
-        """Log a processing attempt.
+    @traced("db.get_latency_histograms")
+    def get_latency_histograms(
+        self, days: int = 7, repo_name: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Get end-to-end latency histogram rows for the last N days.
 
         Args:
-            repo_name: Repository full name
-            issue_number: Issue number
-            success: Whether processing succeeded
-            rate_limit_message: Rate limit error message if applicable
-            rate_limit_seconds: Seconds to wait from rate limit message
+            days: Number of days to look back
+            repo_name: Only this repository (default: all)
+
+        Returns:
+            List of records with repo_name, day, bucket and count (see latency.py)
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO processing_history
-                (repo_name, issue_number, success, rate_limit_message, rate_limit_seconds)
-                VALUES (?, ?, ?, ?, ?)
+                SELECT * FROM issue_latency
+                WHERE day >= date('now', '-' || ? || ' days')
+                  AND (? IS NULL OR repo_name = ?)
+                ORDER BY day DESC, repo_name, bucket
             """,
-                (repo_name, issue_number, success, rate_limit_message, rate_limit_seconds),
+                (days, repo_name, repo_name),
             )
+            return [dict(row) for row in cursor.fetchall()]
 
-    def log_error(
-        self,
-        error_type: str,
-        error_message: str,
-        repo_name: str | None = None,
-        issue_number: int | None = None,
+    @traced("db.dead_letter_issue")
+    def dead_letter_issue(
+        self, repo_name: str, issue_number: int, error: str, error_class: str
     ) -> None:
-        """Log an error.
+        """Move an issue that ran out of retries from the queue to the dead-letter table.
 
         Args:
-            error_type: Type of error (e.g., 'api_error', 'rate_limit')
-            error_message: Detailed error message
-            repo_name: Repository name if error is issue-specific
-            issue_number: Issue number if error is issue-specific
+            repo_name: Repository full name
+            issue_number: Issue number
+            error: Error of the final attempt
+            error_class: Retry policy error class of the final attempt
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO error_log (error_type, error_message, repo_name, issue_number)
-                VALUES (?, ?, ?, ?)
+                "SELECT id FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+                (repo_name, issue_number),
+            )
+            queued = cursor.fetchone()
+            if queued is not None:
+                self._index_error(cursor, queued["id"], repo_name, issue_number, error)
+            cursor.execute(
+                f"""
+                INSERT INTO dead_letter_issues
+                (repo_name, issue_number, added_at, retry_count, error_class, last_error,
+                 labels, issue_created_at)
+                SELECT repo_name, issue_number, added_at, retry_count + 1, ?, ?,
+                       labels, issue_created_at
+                FROM queued_issues WHERE repo_name = ? AND issue_number = ?
+                ON CONFLICT(repo_name, issue_number) DO UPDATE SET
+                    added_at = excluded.added_at,
+                    retry_count = excluded.retry_count,
+                    error_class = excluded.error_class,
+                    last_error = excluded.last_error,
+                    labels = excluded.labels,
+                    issue_created_at = excluded.issue_created_at,
+                    dead_at = {NOW}
             """,
-                (error_type, error_message, repo_name, issue_number),
+                (error_class, error, repo_name, issue_number),
+            )
+            cursor.execute(
+                "DELETE FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+                (repo_name, issue_number),
             )
 
-    def get_recent_processing_history(self, minutes: int = 30) -> list[dict[str, Any]]:
-        """Get processing history from the last N minutes.
+    @traced("db.get_dead_letters")
+    def get_dead_letters(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Get dead-lettered issues, most recent first.
 
         Args:
-            minutes: Number of minutes to look back
+            limit: Maximum number of issues to return
 
         Returns:
-            List of processing records
+            List of dead-letter records
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                SELECT * FROM processing_history
-                WHERE processed_at >= datetime('now', '-' || ? || ' minutes')
-                ORDER BY processed_at DESC
-            """,
-                (minutes,),
+                "SELECT * FROM dead_letter_issues ORDER BY dead_at DESC, id DESC LIMIT ?",
+                (limit,),
             )
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_consecutive_errors(self, limit: int = 5) -> list[dict[str, Any]]:
-        """Get most recent consecutive errors.
+    @traced("db.requeue_dead_letter")
+    def requeue_dead_letter(self, repo_name: str, issue_number: int) -> bool:
+        """Put a dead-lettered issue back in the queue with a fresh retry count.
 
         Args:
-            limit: Number of recent errors to check
+            repo_name: Repository full name
+            issue_number: Issue number
 
         Returns:
-            List of recent error records
+            True if requeued, False if the issue is not dead-lettered
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                SELECT * FROM error_log
-                WHERE error_type NOT IN ('rate_limit', 'max_retries', 'circuit_breaker')
+                "SELECT * FROM dead_letter_issues WHERE repo_name = ? AND issue_number = ?",
+                (repo_name, issue_number),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return False
+
+            self._upsert_issue(
+                cursor,
+                repo_name,
+                issue_number,
+                datetime.now(UTC),
+                labels=[label for label in (row["labels"] or "").split(",") if label],
+                created_at=row["issue_created_at"],
+            )
+            cursor.execute("DELETE FROM dead_letter_issues WHERE id = ?", (row["id"],))
+            return True
+
+    @traced("db.was_dead_lettered_since")
+    def was_dead_lettered_since(self, repo_name: str, issue_number: int, since: datetime) -> bool:
+        """Check whether an issue was given up on after a given time.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            since: Cutoff (naive values are local time)
+
+        Returns:
+            True if the issue is dead-lettered and was moved there after `since`
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT 1 FROM dead_letter_issues
+                WHERE repo_name = ? AND issue_number = ? AND dead_at >= ?
+            """,
+                (repo_name, issue_number, since),
+            )
+            return cursor.fetchone() is not None
+
+    @traced("db.get_issues_ready_for_processing")
+    def get_issues_ready_for_processing(
+        self, limit: int | None = None, repo_name: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Get issues ready for processing (next_retry_at <= now).
+
+        Issues are interleaved across repositories: each repo's best-scored issue
+        comes first, then each repo's second, and so on, with score and retry time
+        deciding order within a round. A repo with hundreds of ready issues
+        therefore cannot take every slot in a window. Scores are the stored score
+        plus the policy's clock-dependent SQL term, computed in the query.
+
+        Args:
+            limit: Maximum number of issues to return
+            repo_name: Only return issues from this repository
+
+        Returns:
+            List of issue records as dictionaries
+        """
+        now = int(time.time())
+        term, term_params = self.priority_policy.sql_score(now)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if repo_name is not None:
+                query = f"""
+                    SELECT * FROM queued_issues
+                    WHERE repo_name = ? AND (next_retry_at IS NULL OR next_retry_at <= ?)
+                    ORDER BY score + ({term}) DESC, next_retry_at ASC, id
+                """
+                if limit:
+                    query += f" LIMIT {limit}"
+                cursor.execute(query, (repo_name, now, *term_params))
+                return [dict(row) for row in cursor.fetchall()]
+
+            query = f"""
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY repo_name ORDER BY current_score DESC, next_retry_at ASC, id
+                    ) AS repo_rank
+                    FROM (
+                        SELECT *, score + ({term}) AS current_score
+                        FROM queued_issues
+                        WHERE next_retry_at IS NULL OR next_retry_at <= ?
+                    )
+                )
+                ORDER BY repo_rank, current_score DESC, next_retry_at ASC, id
+            """
+            if limit:
+                query += f" LIMIT {limit}"
+
+            cursor.execute(query, (*term_params, now))
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.count_queued_issues")
+    def count_queued_issues(self, repo_name: str | None = None) -> int:
+        """Count queued issues without loading them.
+
+        Args:
+            repo_name: Only count issues from this repository
+
+        Returns:
+            Number of queued issues
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if repo_name is None:
+                cursor.execute("SELECT COUNT(*) FROM queued_issues")
+            else:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM queued_issues WHERE repo_name = ?", (repo_name,)
+                )
+            return cursor.fetchone()[0]
+
+    @traced("db.count_ready_issues")
+    def count_ready_issues(self, repo_name: str | None = None) -> int:
+        """Count issues ready for processing without loading them.
+
+        Args:
+            repo_name: Only count issues from this repository
+
+        Returns:
+            Number of issues with next_retry_at <= now
+        """
+        query = (
+            "SELECT COUNT(*) FROM queued_issues WHERE (next_retry_at IS NULL OR next_retry_at <= ?)"
+        )
+        params: list[Any] = [int(time.time())]
+        if repo_name is not None:
+            query += " AND repo_name = ?"
+            params.append(repo_name)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+
+    def iter_queued_issues(
+        self, ready_only: bool = False, page_size: int = 500
+    ) -> Generator[dict[str, Any], None, None]:
+        """Iterate over the queue in (next_retry_at, id) order, one page at a time.
+
+        Pages are fetched with keyset pagination on the retry-time index, so
+        memory stays flat however long the queue is, and no read transaction is
+        held open between pages while the caller works.
+
+        Args:
+            ready_only: Only yield issues with next_retry_at <= now
+            page_size: Rows fetched per query
+
+        Yields:
+            Issue records as dictionaries
+        """
+        now = int(time.time())
+        ready = " AND next_retry_at <= ?" if ready_only else ""
+
+        # Rows without a retry time sort first and are always ready
+        last_id = 0
+        while True:
+            page = self._fetch_page(
+                "SELECT * FROM queued_issues WHERE next_retry_at IS NULL AND id > ? "
+                "ORDER BY id LIMIT ?",
+                (last_id, page_size),
+            )
+            yield from page
+            if len(page) < page_size:
+                break
+            last_id = page[-1]["id"]
+
+        last_key: tuple[Any, int] | None = None
+        while True:
+            if last_key is None:
+                where, params = "next_retry_at IS NOT NULL", []
+            else:
+                where, params = "(next_retry_at, id) > (?, ?)", list(last_key)
+            if ready_only:
+                params.append(now)
+            page = self._fetch_page(
+                f"SELECT * FROM queued_issues WHERE {where}{ready} "
+                "ORDER BY next_retry_at, id LIMIT ?",
+                (*params, page_size),
+            )
+            yield from page
+            if len(page) < page_size:
+                break
+            last_key = (page[-1]["next_retry_at"], page[-1]["id"])
+
+    @traced("db.get_queue_schedule")
+    def get_queue_schedule(self) -> list[tuple[int, int, int, str, int]]:
+        """Get every queued issue's scheduling fields as plain tuples, for forecasting.
+
+        Returns:
+            (next_retry_at epoch seconds or 0 if unset, -score, id, repo_name,
+            issue_number) tuples, unordered; scores include the age term as of now
+        """
+        term, term_params = self.priority_policy.sql_score(int(time.time()))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Plain tuples and raw integers: no row objects or datetimes per issue
+            cursor.row_factory = None
+            cursor.execute(
+                f"""
+                SELECT COALESCE(next_retry_at, 0), -(score + ({term})), id, repo_name,
+                    issue_number
+                FROM queued_issues
+            """,
+                term_params,
+            )
+            return cursor.fetchall()
+
+    @traced("db.fetch_page")
+    def _fetch_page(self, query: str, params: tuple[Any, ...]) -> list[dict[str, Any]]:
+        """Run one page query of a keyset iteration."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.get_preflight_state")
+    def get_preflight_state(
+        self, window_minutes: int, cooldowns: dict[str, int]
+    ) -> dict[str, Any]:
+        """Read everything a pre-flight check needs in one query.
+
+        Each sub-select is answered from an index (MIN/EXISTS on the retry-time
+        index, a range count on the history-time index, primary-key lookups on
+        the breakers), so the cost does not grow with the queue.
+
+        Args:
+            window_minutes: Slot recharge window for counting our recent attempts
+            cooldowns: Cooldown seconds per circuit breaker domain that halts all
+                processing
+
+        Returns:
+            Dict with ready (0/1), recent_attempts, and next_retry_at,
+            oldest_attempt and breaker_open_until (epoch seconds, or None)
+        """
+        now = int(time.time())
+        values = ",".join("(?, ?)" for _ in cooldowns) or "(NULL, 0)"
+        self.flush_logs()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row  # Keep epoch seconds, not datetimes
+            cursor.execute(
+                f"""
+                SELECT
+                    EXISTS (
+                        SELECT 1 FROM queued_issues
+                        WHERE next_retry_at IS NULL OR next_retry_at <= ?
+                    ) AS ready,
+                    (SELECT MIN(next_retry_at) FROM queued_issues) AS next_retry_at,
+                    (
+                        SELECT COUNT(*) FROM processing_history
+                        WHERE processed_at >= ?
+                    ) AS recent_attempts,
+                    (
+                        SELECT MIN(processed_at) FROM processing_history
+                        WHERE processed_at >= ?
+                    ) AS oldest_attempt,
+                    (
+                        SELECT MAX(b.opened_at + c.column2)
+                        FROM (VALUES {values}) AS c
+                        JOIN circuit_breakers b ON b.domain = c.column1
+                        WHERE b.state = 'open'
+                    ) AS breaker_open_until
+            """,
+                (
+                    now,
+                    now - window_minutes * 60,
+                    now - window_minutes * 60,
+                    *(item for pair in cooldowns.items() for item in pair),
+                ),
+            )
+            return dict(cursor.fetchone())
+
+    @traced("db.increment_retry_count")
+    def increment_retry_count(
+        self, repo_name: str, issue_number: int, error: str, next_retry_at: datetime | None = None
+    ) -> None:
+        """Increment retry count for an issue and log error.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            error: Error message to log
+            next_retry_at: Optional new retry time (if rate limited again)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM queued_issues WHERE repo_name = ? AND issue_number = ?",
+                (repo_name, issue_number),
+            )
+            existing = cursor.fetchone()
+            if existing is None:
+                return
+            score = self._score(existing, retry_count=(existing["retry_count"] or 0) + 1)
+            self._index_error(cursor, existing["id"], repo_name, issue_number, error)
+
+            if next_retry_at:
+                cursor.execute(
+                    """
+                    UPDATE queued_issues
+                    SET retry_count = retry_count + 1, last_error = ?, next_retry_at = ?,
+                        score = ?, claimed_until = NULL
+                    WHERE repo_name = ? AND issue_number = ?
+                """,
+                    (error, next_retry_at, score, repo_name, issue_number),
+                )
+            else:
+                cursor.execute(
+                    """
+                    UPDATE queued_issues
+                    SET retry_count = retry_count + 1, last_error = ?, score = ?,
+                        claimed_until = NULL
+                    WHERE repo_name = ? AND issue_number = ?
+                """,
+                    (error, score, repo_name, issue_number),
+                )
+
+    @traced("db.log_processing")
+    def log_processing(
+        self,
+        repo_name: str,
+        issue_number: int,
+        success: bool,
+        rate_limit_message: str | None = None,
+        rate_limit_seconds: int | None = None,
+        account: str | None = None,
+    ) -> None:
+        """Log a processing attempt.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            success: Whether processing succeeded
+            rate_limit_message: Rate limit error message if applicable
+            rate_limit_seconds: Seconds to wait from rate limit message
+            account: Traycer account (slot bucket) the attempt was made with
+        """
+        self._write_log(
+            """
+            INSERT INTO processing_history
+            (repo_name, issue_number, success, rate_limit_message, rate_limit_seconds, account)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (repo_name, issue_number, success, rate_limit_message, rate_limit_seconds, account),
+        )
+
+    @traced("db.record_trigger")
+    def record_trigger(
+        self, repo_name: str, issue_number: int, account: str | None = None
+    ) -> int:
+        """Record a Traycer trigger the moment it lands, before its outcome is known.
+
+        The toggle has spent a slot whatever happens next, so the attempt is
+        counted by slot calculation from here on; `update_trigger` fills in how
+        it ended.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            account: Traycer account (slot bucket) the attempt was made with
+
+        Returns:
+            ID of the processing_history row
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO processing_history
+                (repo_name, issue_number, success, account, outcome)
+                VALUES (?, ?, 0, ?, 'pending')
+            """,
+                (repo_name, issue_number, account),
+            )
+            return cursor.lastrowid
+
+    @traced("db.update_trigger")
+    def update_trigger(
+        self,
+        attempt_id: int,
+        outcome: str,
+        rate_limit_message: str | None = None,
+        rate_limit_seconds: int | None = None,
+    ) -> None:
+        """Record how a trigger attempt ended.
+
+        Args:
+            attempt_id: Row ID returned by record_trigger
+            outcome: 'success', 'rate_limited', 'unknown' or 'failed'
+            rate_limit_message: Rate limit error message if applicable
+            rate_limit_seconds: Seconds to wait from rate limit message
+        """
+        self._write_log(
+            """
+            UPDATE processing_history
+            SET outcome = ?, success = ?, rate_limit_message = ?, rate_limit_seconds = ?
+            WHERE id = ?
+        """,
+            (outcome, outcome == "success", rate_limit_message, rate_limit_seconds, attempt_id),
+        )
+
+    @traced("db.log_error")
+    def log_error(
+        self,
+        error_type: str,
+        error_message: str,
+        repo_name: str | None = None,
+        issue_number: int | None = None,
+    ) -> None:
+        """Log an error.
+
+        Args:
+            error_type: Type of error (e.g., 'api_error', 'rate_limit')
+            error_message: Detailed error message
+            repo_name: Repository name if error is issue-specific
+            issue_number: Issue number if error is issue-specific
+        """
+        self._write_log(
+            """
+            INSERT INTO error_log (error_type, error_message, repo_name, issue_number)
+            VALUES (?, ?, ?, ?)
+        """,
+            (error_type, error_message, repo_name, issue_number),
+            durable=error_type in self.DURABLE_ERROR_TYPES,
+        )
+
+    @traced("db.get_recent_processing_history")
+    def get_recent_processing_history(
+        self,
+        minutes: int = 30,
+        typed: bool = False,
+        account: str | None = None,
+        include_unattributed: bool = False,
+    ) -> list[dict[str, Any]] | list[ProcessingRecord]:
+        """Get processing history from the last N minutes.
+
+        Args:
+            minutes: Number of minutes to look back
+            typed: Return ProcessingRecord rows with processed_at as a datetime
+            account: Only attempts made with this Traycer account (None for all)
+            include_unattributed: With account, also include attempts logged
+                without one (history from before accounts were recorded)
+
+        Returns:
+            List of processing records
+        """
+        self.flush_logs()
+        record = ProcessingRecord if typed else None
+        selected = columns(ProcessingRecord) if typed else "*"
+        query = f"""
+            SELECT {selected} FROM processing_history
+            WHERE processed_at >= ?
+        """
+        params: list[Any] = [int(time.time()) - minutes * 60]
+        if account is not None:
+            query += " AND (account = ? OR (? AND account IS NULL))"
+            params += [account, include_unattributed]
+        query += " ORDER BY processed_at DESC"
+
+        with self._get_connection(record) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            if typed:
+                return cursor.fetchall()
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.get_consecutive_errors")
+    def get_consecutive_errors(
+        self, limit: int = 5, typed: bool = False
+    ) -> list[dict[str, Any]] | list[ErrorRecord]:
+        """Get most recent consecutive errors.
+
+        Args:
+            limit: Number of recent errors to check
+            typed: Return ErrorRecord rows with timestamp as a datetime
+
+        Returns:
+            List of recent error records
+        """
+        self.flush_logs()
+        record = ErrorRecord if typed else None
+        selected = columns(ErrorRecord) if typed else "*"
+        with self._get_connection(record) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {selected} FROM error_log
+                WHERE error_type NOT IN (
+                    'rate_limit', 'max_retries', 'circuit_breaker', 'rate_budget'
+                )
                 ORDER BY timestamp DESC
                 LIMIT ?
             """,
                 (limit,),
             )
+            if typed:
+                return cursor.fetchall()
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.save_rate_budget")
+    def save_rate_budget(
+        self, resource: str, remaining: int, limit: int, reset_at: int, token_id: str = ""
+    ) -> None:
+        """Store the latest known GitHub quota for a rate-limit resource.
+
+        Args:
+            resource: Rate-limit resource ('core', 'search', 'graphql')
+            remaining: Calls remaining in the current window
+            limit: Calls allowed per window
+            reset_at: Unix epoch seconds when the window resets
+            token_id: Token the quota belongs to ('' if unknown)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                INSERT INTO rate_limit_budget (token_id, resource, remaining, rate_limit, reset_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(token_id, resource) DO UPDATE SET
+                    remaining = excluded.remaining,
+                    rate_limit = excluded.rate_limit,
+                    reset_at = excluded.reset_at,
+                    updated_at = {NOW}
+            """,
+                (token_id, resource, remaining, limit, reset_at),
+            )
+
+    @traced("db.get_rate_budget")
+    def get_rate_budget(self, resource: str, token_id: str = "") -> dict[str, Any] | None:
+        """Get the stored GitHub quota for a rate-limit resource.
+
+        Args:
+            resource: Rate-limit resource ('core', 'search', 'graphql')
+            token_id: Token the quota belongs to ('' if unknown)
+
+        Returns:
+            Budget record, or None if no response has been recorded yet
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM rate_limit_budget WHERE token_id = ? AND resource = ?",
+                (token_id, resource),
+            )
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    @traced("db.get_rate_budgets")
+    def get_rate_budgets(self) -> list[dict[str, Any]]:
+        """Get the stored GitHub quota for all tokens and rate-limit resources.
+
+        Returns:
+            List of budget records
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM rate_limit_budget ORDER BY resource, token_id")
             return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.add_api_calls")
+    def add_api_calls(self, component: str, resource: str, calls: int) -> None:
+        """Add to today's API call count for a component.
+
+        Args:
+            component: Calling component (e.g. 'scanner', 'processor')
+            resource: Rate-limit resource the calls counted against
+            calls: Number of calls to add
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO api_call_counts (component, resource, day, calls)
+                VALUES (?, ?, date('now'), ?)
+                ON CONFLICT(component, resource, day) DO UPDATE SET calls = calls + excluded.calls
+            """,
+                (component, resource, calls),
+            )
+
+    @traced("db.get_api_call_counts")
+    def get_api_call_counts(self, days: int = 7) -> list[dict[str, Any]]:
+        """Get per-component API call counts for the last N days.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of records with component, resource, day and calls
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM api_call_counts
+                WHERE day >= date('now', '-' || ? || ' days')
+                ORDER BY day DESC, component, resource
+            """,
+                (days,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.get_ready_counts_by_repo")
+    def get_ready_counts_by_repo(self) -> dict[str, int]:
+        """Count issues ready for processing per repository.
+
+        Returns:
+            Mapping of repo_name to number of ready issues
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT repo_name, COUNT(*) FROM queued_issues
+                WHERE next_retry_at IS NULL OR next_retry_at <= ?
+                GROUP BY repo_name
+            """,
+                (int(time.time()),),
+            )
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
+    @traced("db.get_fair_share_state")
+    def get_fair_share_state(self) -> dict[str, dict[str, Any]]:
+        """Get persisted fair-share credit and usage per repository.
+
+        Returns:
+            Mapping of repo_name to its repo_fair_share record
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM repo_fair_share")
+            return {row["repo_name"]: dict(row) for row in cursor.fetchall()}
+
+    @traced("db.save_fair_share_state")
+    def save_fair_share_state(self, deficits: dict[str, float], slots: dict[str, int]) -> None:
+        """Persist fair-share credit after a window's allocation.
+
+        Repositories missing from `deficits` had nothing ready and lose their credit.
+
+        Args:
+            deficits: Credit per active repository
+            slots: Slots spent per repository this window
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE repo_fair_share SET deficit = 0")
+            cursor.executemany(
+                f"""
+                INSERT INTO repo_fair_share (repo_name, deficit, slots_used, last_served_at)
+                VALUES (?, ?, ?, CASE WHEN ? > 0 THEN {NOW} END)
+                ON CONFLICT(repo_name) DO UPDATE SET
+                    deficit = excluded.deficit,
+                    slots_used = slots_used + excluded.slots_used,
+                    last_served_at = COALESCE(excluded.last_served_at, last_served_at)
+            """,
+                [
+                    (repo, deficit, slots.get(repo, 0), slots.get(repo, 0))
+                    for repo, deficit in deficits.items()
+                ],
+            )
+
+    @traced("db.get_repo_usage")
+    def get_repo_usage(self, days: int = 7) -> list[dict[str, Any]]:
+        """Get processing attempts per repository per day.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of records with repo_name, day, attempts and succeeded
+        """
+        self.flush_logs()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT repo_name, date(processed_at, 'unixepoch') AS day,
+                       COUNT(*) AS attempts, SUM(success) AS succeeded
+                FROM processing_history
+                WHERE processed_at >= ?
+                GROUP BY repo_name, day
+                ORDER BY day DESC, attempts DESC
+            """,
+                (int(time.time()) - days * 86400,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.claim_issue")
+    def claim_issue(self, repo_name: str, issue_number: int, lease_seconds: int = 300) -> bool:
+        """Mark a queued issue as in flight so overlapping runs skip it.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            lease_seconds: How long the claim holds if never released
+
+        Returns:
+            True if claimed, False if another run holds an unexpired claim
+        """
+        now = int(time.time())
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE queued_issues SET claimed_until = ?
+                WHERE repo_name = ? AND issue_number = ?
+                AND (claimed_until IS NULL OR claimed_until <= ?)
+            """,
+                (now + lease_seconds, repo_name, issue_number, now),
+            )
+            return cursor.rowcount == 1
+
+    @traced("db.release_issue")
+    def release_issue(self, repo_name: str, issue_number: int) -> None:
+        """Clear an in-flight claim.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE queued_issues SET claimed_until = NULL
+                WHERE repo_name = ? AND issue_number = ?
+            """,
+                (repo_name, issue_number),
+            )
+
+    @traced("db.defer_recent_attempts")
+    def defer_recent_attempts(self, minutes: int = 30, buffer_minutes: int = 2) -> int:
+        """Push back ready issues that were already attempted within the last N minutes.
+
+        A second toggle inside the recharge window only burns another slot, so
+        such issues are rescheduled to when their last attempt's slot recharges.
+
+        Args:
+            minutes: Attempt window (the slot recharge time)
+            buffer_minutes: Extra delay added after the window
+
+        Returns:
+            Number of issues deferred
+        """
+        self.flush_logs()
+        now = int(time.time())
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE queued_issues SET next_retry_at = ? + (
+                    SELECT MAX(p.processed_at) FROM processing_history p
+                    WHERE p.repo_name = queued_issues.repo_name
+                    AND p.issue_number = queued_issues.issue_number
+                )
+                WHERE (next_retry_at IS NULL OR next_retry_at <= ?)
+                AND EXISTS (
+                    SELECT 1 FROM processing_history p
+                    WHERE p.repo_name = queued_issues.repo_name
+                    AND p.issue_number = queued_issues.issue_number
+                    AND p.processed_at >= ?
+                )
+            """,
+                ((minutes + buffer_minutes) * 60, now, now - minutes * 60),
+            )
+            return cursor.rowcount
+
+    @traced("db.was_processed_since")
+    def was_processed_since(self, repo_name: str, issue_number: int, since: datetime) -> bool:
+        """Check whether an issue was successfully re-analyzed after a given time.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            since: Cutoff (naive values are local time)
+
+        Returns:
+            True if a successful processing attempt was logged after `since`
+        """
+        self.flush_logs()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT 1 FROM processing_history
+                WHERE repo_name = ? AND issue_number = ? AND success = 1
+                AND processed_at >= ?
+                LIMIT 1
+            """,
+                (repo_name, issue_number, since),
+            )
+            return cursor.fetchone() is not None
+
+    @traced("db.get_cached")
+    def get_cached(self, key: str, max_age_seconds: int) -> str | None:
+        """Get a cached scan value if it is fresh enough.
+
+        Args:
+            key: Cache key
+            max_age_seconds: Maximum age of the value
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT value FROM scan_cache
+                WHERE key = ? AND updated_at >= ?
+            """,
+                (key, int(time.time()) - max_age_seconds),
+            )
+            row = cursor.fetchone()
+            return row["value"] if row else None
+
+    @traced("db.set_cached")
+    def set_cached(self, key: str, value: str) -> None:
+        """Store a scan value in the cache.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                INSERT INTO scan_cache (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value, updated_at = {NOW}
+            """,
+                (key, value),
+            )
+
+    @traced("db.get_mirror_synced_at")
+    def get_mirror_synced_at(self, repo_name: str) -> datetime | None:
+        """Get when a repository was last synced into the mirror.
+
+        Args:
+            repo_name: Repository full name
+
+        Returns:
+            Sync time (aware UTC), or None if the repo was never synced
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT synced_at FROM mirror_repos WHERE repo_name = ?", (repo_name,))
+            row = cursor.fetchone()
+            return row["synced_at"] if row else None
+
+    @traced("db.save_mirror_sync")
+    def save_mirror_sync(
+        self,
+        repo_name: str,
+        synced_at: datetime,
+        issues: list[MirroredIssue],
+        closed: list[int],
+        comments: list[MirroredComment],
+    ) -> None:
+        """Apply one repository's sync to the mirror in a single transaction.
+
+        The sync time only advances together with the data fetched since the
+        previous one, so an interrupted sync is simply repeated.
+
+        Args:
+            repo_name: Repository full name
+            synced_at: Next sync fetches changes since this time
+            issues: Open issues that changed
+            closed: Numbers of issues that were closed (dropped with their comments)
+            comments: Comments that changed
+        """
+        gone = [(repo_name, issue_number) for issue_number in closed]
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO mirror_issues ({columns(MirroredIssue)}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                issues,
+            )
+            cursor.executemany(
+                "DELETE FROM mirror_issues WHERE repo_name = ? AND issue_number = ?", gone
+            )
+            cursor.executemany(
+                "DELETE FROM mirror_comments WHERE repo_name = ? AND issue_number = ?", gone
+            )
+            self._save_mirror_comments(cursor, comments)
+            cursor.execute(
+                """
+                INSERT INTO mirror_repos (repo_name, synced_at) VALUES (?, ?)
+                ON CONFLICT(repo_name) DO UPDATE SET synced_at = excluded.synced_at
+            """,
+                (repo_name, synced_at),
+            )
+
+    @traced("db.save_mirror_comments")
+    def save_mirror_comments(self, comments: list[MirroredComment]) -> None:
+        """Add or update comments in the mirror.
+
+        Args:
+            comments: Comments that changed
+        """
+        with self._get_connection() as conn:
+            self._save_mirror_comments(conn.cursor(), comments)
+
+    @staticmethod
+    def _save_mirror_comments(cursor: sqlite3.Cursor, comments: list[MirroredComment]) -> None:
+        """Upsert mirrored comments on an open cursor."""
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO mirror_comments ({columns(MirroredComment)}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            comments,
+        )
+
+    @traced("db.get_mirror_comments")
+    def get_mirror_comments(self, repo_name: str, issue_number: int) -> list[MirroredComment]:
+        """Get an issue's mirrored comments.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+
+        Returns:
+            Mirrored comments, unordered
+        """
+        with self._get_connection(record=MirroredComment) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {columns(MirroredComment)} FROM mirror_comments
+                WHERE repo_name = ? AND issue_number = ?
+            """,
+                (repo_name, issue_number),
+            )
+            return cursor.fetchall()
+
+    @traced("db.get_mirror_comment_cursor")
+    def get_mirror_comment_cursor(self, repo_name: str, issue_number: int) -> datetime | None:
+        """Get the latest edit time among an issue's mirrored comments.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+
+        Returns:
+            Time to fetch newer comments from, or None if none are mirrored
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT updated_at FROM mirror_comments
+                WHERE repo_name = ? AND issue_number = ?
+                ORDER BY updated_at DESC LIMIT 1
+            """,
+                (repo_name, issue_number),
+            )
+            row = cursor.fetchone()
+            return row["updated_at"] if row else None
+
+    @traced("db.get_latest_mirror_comment")
+    def get_latest_mirror_comment(
+        self, repo_name: str, issue_number: int, author: str
+    ) -> MirroredComment | None:
+        """Get an author's most recent mirrored comment on an issue.
+
+        Args:
+            repo_name: Repository full name
+            issue_number: Issue number
+            author: Comment author login
+
+        Returns:
+            Latest comment, or None if the author has none mirrored
+        """
+        with self._get_connection(record=MirroredComment) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {columns(MirroredComment)} FROM mirror_comments
+                WHERE repo_name = ? AND issue_number = ? AND author = ?
+                ORDER BY created_at DESC, comment_id DESC LIMIT 1
+            """,
+                (repo_name, issue_number, author),
+            )
+            return cursor.fetchone()
+
+    @traced("db.get_latest_mirror_comments")
+    def get_latest_mirror_comments(self, repo_name: str, author: str) -> list[dict[str, Any]]:
+        """Get an author's most recent comment on each open mirrored issue of a repo.
+
+        Args:
+            repo_name: Repository full name
+            author: Comment author login
+
+        Returns:
+            Records with issue_number, labels, issue_created_at, and the comment's
+            commented_at, kind and wait_seconds; issues without such a comment
+            are left out
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT i.issue_number, i.labels, i.created_at AS issue_created_at,
+                       c.created_at AS commented_at, c.kind, c.wait_seconds
+                FROM mirror_issues i
+                JOIN mirror_comments c ON c.comment_id = (
+                    SELECT comment_id FROM mirror_comments
+                    WHERE repo_name = i.repo_name AND issue_number = i.issue_number
+                      AND author = ?
+                    ORDER BY created_at DESC, comment_id DESC LIMIT 1
+                )
+                WHERE i.repo_name = ?
+                ORDER BY i.issue_number
+            """,
+                (author, repo_name),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.get_mirror_summary")
+    def get_mirror_summary(self, author: str) -> list[dict[str, Any]]:
+        """Get per-repository status from the mirror and the queue, without GitHub calls.
+
+        Args:
+            author: Login whose comments count as Traycer activity
+
+        Returns:
+            Records with repo_name, synced_at, open_issues, unassigned,
+            commented (open issues the author commented on), queued and
+            dead_letters, busiest repos first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT r.repo_name, r.synced_at,
+                       COUNT(i.issue_number) AS open_issues,
+                       COALESCE(SUM(i.assignees = ''), 0) AS unassigned,
+                       COALESCE(SUM(EXISTS (
+                           SELECT 1 FROM mirror_comments c
+                           WHERE c.repo_name = i.repo_name AND c.issue_number = i.issue_number
+                             AND c.author = ?
+                       )), 0) AS commented,
+                       (SELECT COUNT(*) FROM queued_issues q
+                        WHERE q.repo_name = r.repo_name) AS queued,
+                       (SELECT COUNT(*) FROM dead_letter_issues d
+                        WHERE d.repo_name = r.repo_name) AS dead_letters
+                FROM mirror_repos r
+                LEFT JOIN mirror_issues i ON i.repo_name = r.repo_name
+                GROUP BY r.repo_name
+                ORDER BY open_issues DESC, r.repo_name
+            """,
+                (author,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.index_comments")
+    def index_comments(
+        self, comments: list[tuple[int, str, int, str, datetime, datetime, str]]
+    ) -> int:
+        """Add comments to the full-text search index.
+
+        Comments already indexed at the same edit time are skipped, so scans can
+        pass every comment they see.
+
+        Args:
+            comments: (comment_id, repo_name, issue_number, author, created_at,
+                updated_at, body) tuples
+
+        Returns:
+            Number of comments (re)indexed
+        """
+        if not self.search_enabled or not comments:
+            return 0
+        placeholders = ",".join("?" * len(comments))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT rowid, version FROM search_index WHERE rowid IN ({placeholders})",
+                [comment[0] for comment in comments],
+            )
+            indexed = {row["rowid"]: row["version"] for row in cursor.fetchall()}
+            changed = [
+                comment
+                for comment in comments
+                if indexed.get(comment[0]) != int(comment[5].timestamp())
+            ]
+            cursor.executemany(
+                "DELETE FROM search_index WHERE rowid = ?",
+                [(comment[0],) for comment in changed if comment[0] in indexed],
+            )
+            cursor.executemany(
+                """
+                INSERT INTO search_index
+                (rowid, body, source, repo_name, issue_number, author, at, version)
+                VALUES (?, ?, 'comment', ?, ?, ?, ?, ?)
+            """,
+                [
+                    (comment_id, body[: self.SEARCH_BODY_CHARS], repo, number, author, at, version)
+                    for comment_id, repo, number, author, at, version, body in changed
+                ],
+            )
+            return len(changed)
+
+    def _index_error(
+        self, cursor: sqlite3.Cursor, queue_id: int, repo_name: str, issue_number: int, error: str
+    ) -> None:
+        """Replace a queued issue's error in the search index (its last_error)."""
+        if not self.search_enabled:
+            return
+        now = int(time.time())
+        cursor.execute("DELETE FROM search_index WHERE rowid = ?", (-queue_id,))
+        cursor.execute(
+            """
+            INSERT INTO search_index
+            (rowid, body, source, repo_name, issue_number, author, at, version)
+            VALUES (?, ?, 'error', ?, ?, NULL, ?, ?)
+        """,
+            (-queue_id, error, repo_name, issue_number, now, now),
+        )
+
+    @traced("db.search")
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        source: str | None = None,
+        repo_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Full-text search over indexed Traycer comments and queue errors.
+
+        Args:
+            query: FTS5 query (e.g. 'timeout', '"rate limit" NOT analysis', 'auth*');
+                text that is not valid FTS5 syntax is searched as plain words
+            limit: Maximum number of results
+            source: Only 'comment' or 'error' results (default: both)
+            repo_name: Only this repository (default: all)
+
+        Returns:
+            Best matches first, with source, repo_name, issue_number, author, at
+            (aware UTC) and a snippet with matches in [brackets]
+        """
+        if not self.search_enabled:
+            return []
+        try:
+            rows = self._search(query, limit, source, repo_name)
+        except sqlite3.OperationalError:
+            # Stray quotes, colons or operators: match the words literally instead
+            words = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+            rows = self._search(words, limit, source, repo_name) if words else []
+        for row in rows:
+            row["at"] = datetime.fromtimestamp(row["at"], UTC)
+        return rows
+
+    def _search(
+        self, query: str, limit: int, source: str | None, repo_name: str | None
+    ) -> list[dict[str, Any]]:
+        """Run one search_index MATCH query, best (lowest bm25 rank) first."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT source, repo_name, issue_number, author, at,
+                       snippet(search_index, 0, '[', ']', '…', 16) AS snippet
+                FROM search_index
+                WHERE search_index MATCH ?
+                  AND (? IS NULL OR source = ?)
+                  AND (? IS NULL OR repo_name = ?)
+                ORDER BY rank
+                LIMIT ?
+            """,
+                (query, source, source, repo_name, repo_name, limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @traced("db.get_circuit_breakers")
+    def get_circuit_breakers(self, domains: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        """Get circuit breaker rows.
+
+        Args:
+            domains: Domains to fetch (None for every breaker that is not closed)
+
+        Returns:
+            Mapping of domain to breaker row
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if domains is None:
+                cursor.execute("SELECT * FROM circuit_breakers WHERE state != 'closed'")
+            else:
+                placeholders = ",".join("?" * len(domains))
+                cursor.execute(
+                    f"SELECT * FROM circuit_breakers WHERE domain IN ({placeholders})",
+                    list(domains),
+                )
+            return {row["domain"]: dict(row) for row in cursor.fetchall()}
+
+    @traced("db.record_breaker_failure")
+    def record_breaker_failure(
+        self, domain: str, now: int, threshold: int, window_seconds: int, error: str = ""
+    ) -> str:
+        """Count a failure against a breaker, opening it at the threshold.
+
+        A failure while half-open re-opens the breaker immediately. Runs as a
+        single upsert so concurrent processes cannot lose each other's counts.
+
+        Args:
+            domain: Failure domain
+            now: Current Unix time
+            threshold: Failures within the window that open the breaker
+            window_seconds: Failures older than this no longer count
+            error: Error message to keep for display
+
+        Returns:
+            Breaker state after the failure
+        """
+        params = {
+            "domain": domain,
+            "now": now,
+            "cutoff": now - window_seconds,
+            "threshold": threshold,
+            "error": error[:500],
+        }
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO circuit_breakers
+                    (domain, state, failures, window_started_at, opened_at, last_error)
+                VALUES (
+                    :domain,
+                    CASE WHEN :threshold <= 1 THEN 'open' ELSE 'closed' END,
+                    1,
+                    :now,
+                    CASE WHEN :threshold <= 1 THEN :now END,
+                    :error
+                )
+                ON CONFLICT(domain) DO UPDATE SET
+                    state = CASE
+                        WHEN state != 'closed' THEN 'open'
+                        WHEN (CASE WHEN window_started_at >= :cutoff THEN failures + 1 ELSE 1 END)
+                            >= :threshold THEN 'open'
+                        ELSE 'closed'
+                    END,
+                    opened_at = CASE
+                        WHEN state = 'half_open' THEN :now
+                        WHEN state = 'open' THEN opened_at
+                        WHEN (CASE WHEN window_started_at >= :cutoff THEN failures + 1 ELSE 1 END)
+                            >= :threshold THEN :now
+                        ELSE NULL
+                    END,
+                    failures = CASE
+                        WHEN window_started_at >= :cutoff THEN failures + 1 ELSE 1
+                    END,
+                    window_started_at = CASE
+                        WHEN window_started_at >= :cutoff THEN window_started_at ELSE :now
+                    END,
+                    probe_until = NULL,
+                    last_error = :error
+                RETURNING state
+            """,
+                params,
+            )
+            return cursor.fetchone()["state"]
+
+    @traced("db.begin_breaker_probe")
+    def begin_breaker_probe(
+        self, domain: str, now: int, cooldown_seconds: int, probe_seconds: int
+    ) -> bool:
+        """Move an open breaker whose cooldown has elapsed to half-open.
+
+        Only one caller wins the transition and becomes the probe; a probe that
+        never reports back loses its lease after probe_seconds.
+
+        Args:
+            domain: Failure domain
+            now: Current Unix time
+            cooldown_seconds: Time a breaker stays open before probing
+            probe_seconds: Lease on the probe
+
+        Returns:
+            True if this caller is now the probe
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE circuit_breakers
+                SET state = 'half_open', probe_until = ?
+                WHERE domain = ?
+                AND (
+                    (state = 'open' AND opened_at <= ?)
+                    OR (state = 'half_open' AND probe_until <= ?)
+                )
+            """,
+                (now + probe_seconds, domain, now - cooldown_seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    @traced("db.reset_breakers")
+    def reset_breakers(self, domains: list[str]) -> None:
+        """Close breakers after a success, clearing their failure counts.
+
+        Args:
+            domains: Failure domains the successful work went through
+        """
+        if not domains:
+            return
+        placeholders = ",".join("?" * len(domains))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                UPDATE circuit_breakers
+                SET state = 'closed', failures = 0, window_started_at = NULL,
+                    opened_at = NULL, probe_until = NULL
+                WHERE domain IN ({placeholders}) AND (state != 'closed' OR failures > 0)
+            """,
+                list(domains),
+            )
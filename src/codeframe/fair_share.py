@@ -0,0 +1,121 @@
+"""Weighted fair-share allocation of processing slots across repositories."""
+
+import heapq
+import os
+from typing import NamedTuple
+
+from .database import Database
+from .priority import parse_weights
+
+
+class Allocation(NamedTuple):
+    """Slots granted per repository for one processing window."""
+
+    slots: dict[str, int]  # repo_name -> slots granted this window
+    deficits: dict[str, float]  # repo_name -> credit carried into the next window
+
+
+class FairShareAllocator:
+    """Splits each window's slots across repositories by weight (deficit round robin).
+
+    Every window, each repository with ready issues earns credit in proportion to
+    its weight, scaled so the credit handed out equals the slots available. Slots
+    then go one at a time to the repository holding the most credit, and unspent
+    credit carries over to the next window. A repository whose share is below one
+    slot per window therefore still accumulates enough credit to be served within
+    a bounded number of windows, however deep another repository's backlog is.
+    Repositories with nothing ready forfeit their credit, so idle time cannot be
+    banked and spent in a burst later.
+    """
+
+    DEFAULT_WEIGHT = 1.0
+
+    def __init__(self, db: Database, weights: dict[str, float] | None = None):
+        """Initialize allocator.
+
+        Args:
+            db: Database instance holding persisted credit
+            weights: Share weight per repository full name (defaults to
+                CODEFRAME_REPO_SHARES, e.g. "owner/app=3"; unlisted repos get 1)
+        """
+        self.db = db
+        if weights is None:
+            weights = parse_weights(os.getenv("CODEFRAME_REPO_SHARES"))
+        self.weights = weights
+
+    def weight(self, repo_name: str) -> float:
+        """Share weight of a repository."""
+        return max(0.0, float(self.weights.get(repo_name, self.DEFAULT_WEIGHT)))
+
+    def allocate(self, available_slots: int, ready_counts: dict[str, int]) -> Allocation:
+        """Decide how many slots each repository gets this window.
+
+        Does not persist anything; call commit() once the batch has run.
+
+        Args:
+            available_slots: Slots available in this window
+            ready_counts: Number of ready issues per repository
+
+        Returns:
+            Allocation with granted slots and updated credit
+        """
+        active = {repo: count for repo, count in ready_counts.items() if count > 0}
+        total_weight = sum(self.weight(repo) for repo in active)
+        if available_slots <= 0 or not active or total_weight <= 0:
+            return Allocation(slots={}, deficits={})
+
+        state = self.db.get_fair_share_state()
+        deficits = {
+            repo: state.get(repo, {}).get("deficit", 0.0)
+            + available_slots * self.weight(repo) / total_weight
+            for repo in active
+        }
+
+        # Max-heap on credit; ties go to the repo served least recently (never first)
+        served = {repo: state.get(repo, {}).get("last_served_at") for repo in active}
+        heap = [
+            (-deficits[repo], served[repo].timestamp() if served[repo] else 0.0, repo)
+            for repo in active
+            if self.weight(repo) > 0
+        ]
+        heapq.heapify(heap)
+
+        slots: dict[str, int] = {}
+        remaining = min(available_slots, sum(active.values()))
+        while remaining > 0 and heap:
+            _, served_at, repo = heapq.heappop(heap)
+            slots[repo] = slots.get(repo, 0) + 1
+            deficits[repo] -= 1
+            remaining -= 1
+            if slots[repo] < active[repo]:
+                heapq.heappush(heap, (-deficits[repo], served_at, repo))
+
+        # Drained repos forfeit leftover credit (standard DRR reset)
+        for repo in active:
+            if slots.get(repo, 0) >= active[repo]:
+                deficits[repo] = 0.0
+
+        return Allocation(slots=slots, deficits=deficits)
+
+    def commit(self, allocation: Allocation, used: dict[str, int] | None = None) -> None:
+        """Persist credit and usage for an allocation that was processed.
+
+        Slots a repository was granted but did not spend (its issue was in
+        flight elsewhere, its circuit was open, or the batch stopped early) are
+        refunded, so skipped work does not cost the repository its share.
+
+        Args:
+            allocation: Allocation returned by allocate()
+            used: Slots actually spent per repository (default: all granted slots)
+        """
+        if not allocation.deficits:
+            return
+        if used is None:
+            used = allocation.slots
+
+        deficits = dict(allocation.deficits)
+        spent = {}
+        for repo, granted in allocation.slots.items():
+            spent[repo] = min(granted, used.get(repo, 0))
+            deficits[repo] += granted - spent[repo]
+        self.db.save_fair_share_state(deficits, spent)
@@ -0,0 +1,173 @@
+"""Expected processing time (ETA) for every queued issue.
+
+The forecast replays the processor's scheduling in one pass over the queue:
+
+- Slots: every account bucket's slots, each free at its recharge time (now for
+  free slots, 30 minutes after the attempt that used it otherwise). A slot that
+  is used becomes free again one recharge window later.
+- Runs: the processor runs every `run_interval_minutes` (see crontab.example),
+  so work happens at the first run once a slot is free and an issue is ready.
+- Order: issues become ready at `next_retry_at`. Ready issues are taken
+  repository by repository in weighted round robin (the fair-share allocator's
+  steady state), and by score, retry time and id within a repository, as in
+  `get_issues_ready_for_processing`.
+
+Every trigger is assumed to succeed (a rate-limited issue would be requeued
+later), so ETAs are the earliest each issue can expect. The pass uses heaps for
+slots, repositories and each repository's ready issues: O(n log n) for n
+queued issues, reading the queue as plain tuples.
+"""
+
+import heapq
+import math
+import os
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from .database import Database
+from .fair_share import FairShareAllocator
+from .slot_calculator import SlotCalculator, SlotStatus
+
+QueueEntry = tuple[int, int, int, str, int]  # As returned by Database.get_queue_schedule
+
+
+class IssueEta(NamedTuple):
+    """Expected processing time of one queued issue."""
+
+    repo_name: str
+    issue_number: int
+    eta: datetime  # Aware UTC
+
+
+def forecast(
+    queue: list[QueueEntry],
+    slot_free_at: list[float],
+    now: float,
+    run_interval_seconds: float = 0,
+    recharge_seconds: float = SlotCalculator.SLOT_RECHARGE_MINUTES * 60,
+    weight: Callable[[str], float] | None = None,
+) -> list[IssueEta]:
+    """Compute when each queued issue is expected to be processed.
+
+    Args:
+        queue: (next_retry_at epoch seconds or 0, -score, id, repo_name,
+            issue_number) per queued issue, in any order
+        slot_free_at: Epoch seconds when each slot (of every bucket) is next free
+        now: Current epoch seconds
+        run_interval_seconds: Time between processor runs (0 for continuous)
+        recharge_seconds: Time a used slot takes to recharge
+        weight: Fair-share weight per repository (default 1 for every repo)
+
+    Returns:
+        ETAs in expected processing order; empty if there are no slots. Repos
+        with weight 0 are never processed and get no ETA
+    """
+    if not slot_free_at:
+        return []
+    shares = {repo_name: weight(repo_name) if weight else 1.0 for _, _, _, repo_name, _ in queue}
+
+    def next_run(at: float) -> float:
+        if run_interval_seconds <= 0:
+            return at
+        return math.ceil(at / run_interval_seconds) * run_interval_seconds
+
+    pending = sorted(entry for entry in queue if shares[entry[3]] > 0)
+    slots = list(slot_free_at)
+    heapq.heapify(slots)
+
+    # Per-repo heaps of ready issues, and a heap of repos with ready issues
+    # keyed by virtual service time (served / weight) as in fair queueing
+    ready: dict[str, list[tuple[int, int, int, int]]] = {}
+    served: dict[str, float] = {}
+    repos: list[tuple[float, str]] = []
+    clock = 0.0  # Virtual time of the last repo served
+    ready_count = 0
+
+    etas = []
+    index = 0
+    at = now
+    while index < len(pending) or ready_count:
+        # Time only moves forward: a slot that was idle waiting for work is used now
+        at = max(heapq.heappop(slots), at)
+        if not ready_count and pending[index][0] > at:
+            at = pending[index][0]
+        at = next_run(at)
+
+        while index < len(pending) and pending[index][0] <= at:
+            retry_at, neg_score, issue_id, repo_name, issue_number = pending[index]
+            index += 1
+            repo_ready = ready.setdefault(repo_name, [])
+            if not repo_ready:
+                # A repo joining the round starts level with the others
+                served[repo_name] = max(served.get(repo_name, 0.0), clock)
+                heapq.heappush(repos, (served[repo_name], repo_name))
+            heapq.heappush(repo_ready, (neg_score, retry_at, issue_id, issue_number))
+            ready_count += 1
+
+        clock, repo_name = heapq.heappop(repos)
+        _, _, _, issue_number = heapq.heappop(ready[repo_name])
+        ready_count -= 1
+        etas.append(IssueEta(repo_name, issue_number, datetime.fromtimestamp(at, UTC)))
+
+        served[repo_name] = clock + 1 / shares[repo_name]
+        if ready[repo_name]:
+            heapq.heappush(repos, (served[repo_name], repo_name))
+        heapq.heappush(slots, at + recharge_seconds)
+
+    return etas
+
+
+class QueueForecaster:
+    """Forecasts the queue from the database and the account buckets' slot state."""
+
+    DEFAULT_RUN_INTERVAL_MINUTES = 32  # crontab.example: recharge window + 2 minutes
+
+    def __init__(
+        self,
+        db: Database,
+        slot_calculators: list[SlotCalculator],
+        allocator: FairShareAllocator | None = None,
+        run_interval_minutes: float | None = None,
+    ):
+        """Initialize forecaster.
+
+        Args:
+            db: Database instance
+            slot_calculators: One per account bucket
+            allocator: Fair-share weights (defaults to CODEFRAME_REPO_SHARES)
+            run_interval_minutes: Minutes between processor runs (defaults to
+                CODEFRAME_RUN_INTERVAL_MINUTES, else DEFAULT_RUN_INTERVAL_MINUTES)
+        """
+        self.db = db
+        self.slot_calculators = slot_calculators
+        self.allocator = allocator or FairShareAllocator(db)
+        if run_interval_minutes is None:
+            run_interval_minutes = float(
+                os.getenv("CODEFRAME_RUN_INTERVAL_MINUTES", self.DEFAULT_RUN_INTERVAL_MINUTES)
+            )
+        self.run_interval_minutes = run_interval_minutes
+
+    def forecast(self, statuses: list[SlotStatus], now: datetime | None = None) -> list[IssueEta]:
+        """Compute an ETA for every queued issue.
+
+        Args:
+            statuses: Current slot status of each bucket, in slot_calculators order
+            now: Current time (defaults to now, in UTC)
+
+        Returns:
+            ETAs in expected processing order
+        """
+        now = now or datetime.now(UTC)
+        slot_free_at = [
+            at.timestamp()
+            for calculator, status in zip(self.slot_calculators, statuses)
+            for at in calculator.recharge_times(status.consumed_slots, now)
+        ]
+        return forecast(
+            self.db.get_queue_schedule(),
+            slot_free_at,
+            now.timestamp(),
+            run_interval_seconds=self.run_interval_minutes * 60,
+            weight=self.allocator.weight,
+        )
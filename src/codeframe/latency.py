@@ -0,0 +1,110 @@
+"""End-to-end latency: from Traycer's rate-limit comment to the successful re-analysis.
+
+This is the wait users feel. Each queued issue keeps the time of the earliest
+rate-limit comment that queued it (`rate_limited_at`); when the issue leaves the
+queue re-analyzed, the elapsed time is added to a per-repo, per-day histogram.
+
+Histograms are stored compactly as counts in log-spaced buckets, four per
+doubling (each bucket spans about 19%), so a repo-day costs at most a few dozen
+rows however many issues it had. Percentiles are read back as the upper bound
+of the bucket holding them, so p95 is never understated.
+"""
+
+import math
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+BUCKETS_PER_DOUBLING = 4
+
+
+class LatencySummary(NamedTuple):
+    """Latency percentiles of one group of histogram rows, in seconds."""
+
+    key: str  # Repo name or day, '' for everything
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def bucket_of(seconds: float) -> int:
+    """Histogram bucket holding a latency.
+
+    Bucket 0 holds latencies under one second; bucket b > 0 holds
+    [2^((b-1)/4), 2^(b/4)) seconds.
+
+    Args:
+        seconds: Latency in seconds
+
+    Returns:
+        Bucket index
+    """
+    if seconds < 1:
+        return 0
+    return math.floor(math.log2(seconds) * BUCKETS_PER_DOUBLING) + 1
+
+
+def bucket_upper_seconds(bucket: int) -> float:
+    """Upper bound of a histogram bucket, in seconds."""
+    return 2 ** (bucket / BUCKETS_PER_DOUBLING)
+
+
+def percentile(counts: dict[int, int], q: float) -> float:
+    """Estimate a percentile from bucket counts.
+
+    Args:
+        counts: Count per bucket
+        q: Quantile between 0 and 1 (e.g. 0.95)
+
+    Returns:
+        Upper bound of the bucket holding the percentile, or 0.0 if empty
+    """
+    rank = max(1, math.ceil(q * sum(counts.values())))
+    running = 0
+    for bucket in sorted(counts):
+        running += counts[bucket]
+        if running >= rank:
+            return bucket_upper_seconds(bucket)
+    return 0.0
+
+
+def summarize(
+    rows: Iterable[dict[str, Any]], key: Callable[[dict[str, Any]], str] = lambda row: ""
+) -> list[LatencySummary]:
+    """Merge histogram rows into per-group percentiles.
+
+    Args:
+        rows: Histogram rows with bucket and count (see Database.get_latency_histograms)
+        key: Group of a row (default: one group for all rows)
+
+    Returns:
+        Summaries sorted by key
+    """
+    groups: dict[str, dict[int, int]] = {}
+    for row in rows:
+        counts = groups.setdefault(key(row), {})
+        counts[row["bucket"]] = counts.get(row["bucket"], 0) + row["count"]
+
+    return [
+        LatencySummary(
+            key=name,
+            count=sum(counts.values()),
+            p50=percentile(counts, 0.50),
+            p95=percentile(counts, 0.95),
+            p99=percentile(counts, 0.99),
+            max=bucket_upper_seconds(max(counts)),
+        )
+        for name, counts in sorted(groups.items())
+    ]
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a latency for display (e.g. '45s', '12m', '3.5h', '2.1d')."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
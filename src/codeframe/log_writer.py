@@ -0,0 +1,161 @@
+"""Background writer for processing and error logs.
+
+Without it, every `update_trigger`, `log_processing` and `log_error` call
+opens a connection and commits one row inside the processing and scanning
+loops, so a slow disk or a locked database stalls GitHub work. With it, those
+calls only append to a bounded in-memory queue; a single writer thread drains
+it into grouped transactions.
+
+Guarantees:
+
+- Bounded memory: when MAX_PENDING rows are waiting, callers block until the
+  writer catches up rather than growing the queue.
+- Read-your-writes: `Database` methods that read the logs flush first, so slot
+  calculation and pre-flight checks never miss a buffered row.
+- Durable breaker trips: `circuit_breaker` errors flush everything before them
+  and are committed before `log_error` returns.
+- Flush on exit: `Database.buffer_logs` registers `stop` with atexit.
+- Kept on failure: a batch that fails to commit (e.g. the database is locked
+  by another process) is kept and retried first, with exponential backoff.
+  Only after MAX_WRITE_ATTEMPTS failures in a row is it dropped, counted in
+  `stats["dropped"]` and the tracer's `log_rows_dropped` counter.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .database import Database
+
+LogRow = tuple[str, tuple[Any, ...]]  # (INSERT/UPDATE statement, parameters)
+
+
+class LogWriter:
+    """Buffers log statements and commits them in batches from a writer thread."""
+
+    MAX_PENDING = 1000
+    BATCH_SIZE = 200
+    FLUSH_INTERVAL_SECONDS = 1.0
+    MAX_WRITE_ATTEMPTS = 5
+    RETRY_BACKOFF_SECONDS = 0.5  # Doubled after each failed attempt
+
+    def __init__(self, db: Database, max_pending: int | None = None):
+        """Initialize writer.
+
+        Args:
+            db: Database the log rows are written to
+            max_pending: Bound on buffered rows (defaults to MAX_PENDING)
+        """
+        self.db = db
+        self.pending: queue.Queue[LogRow] = queue.Queue(max_pending or self.MAX_PENDING)
+        self.stats = {"written": 0, "batches": 0, "failed_writes": 0, "dropped": 0}
+        self._unwritten: list[LogRow] = []  # Batch that failed to commit, retried first
+        self._failures = 0  # Failed attempts at the unwritten batch
+        self._stop = threading.Event()
+        self._writer: threading.Thread | None = None
+
+    def submit(self, query: str, params: tuple[Any, ...]) -> None:
+        """Buffer one log statement, blocking while the buffer is full.
+
+        Args:
+            query: INSERT or UPDATE statement
+            params: Statement parameters
+        """
+        self.pending.put((query, params))
+        if self._writer is None:
+            self.flush()
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        self._stop.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def stop(self) -> None:
+        """Stop the writer after flushing everything still buffered."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Return once every row submitted so far is committed."""
+        if self._writer is not None:
+            self.pending.join()
+            return
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            if not self._write(batch):
+                time.sleep(self._backoff())
+
+    def _write_loop(self) -> None:
+        """Writer thread: drain the buffer in batches until stopped."""
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch and not self._write(batch):
+                # Back off before retrying, e.g. while another process holds the lock
+                self._stop.wait(self._backoff())
+
+    def _backoff(self) -> float:
+        """Seconds to wait before retrying the unwritten batch."""
+        return self.RETRY_BACKOFF_SECONDS * 2 ** (self._failures - 1)
+
+    def _drain(self, block: bool) -> list[LogRow]:
+        """Take up to BATCH_SIZE buffered rows, starting with any unwritten batch.
+
+        Args:
+            block: Wait up to FLUSH_INTERVAL_SECONDS for the first row
+
+        Returns:
+            Rows taken from the buffer, oldest first
+        """
+        batch, self._unwritten = self._unwritten, []
+        try:
+            if block and not batch:
+                batch.append(self.pending.get(timeout=self.FLUSH_INTERVAL_SECONDS))
+            while len(batch) < self.BATCH_SIZE:
+                batch.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _done(self, batch: list[LogRow]) -> None:
+        """Mark taken rows as handled, releasing flush()."""
+        for _ in batch:
+            self.pending.task_done()
+
+    def _write(self, batch: list[LogRow]) -> bool:
+        """Commit a batch in one transaction.
+
+        Args:
+            batch: Rows in submission order
+
+        Returns:
+            True if the batch is done with (committed, or dropped after
+            MAX_WRITE_ATTEMPTS); False if it was kept for retry
+        """
+        try:
+            self.db.write_logs(batch)
+        except Exception:
+            # Logging about a failed log write would hit the same database
+            self._failures += 1
+            self.stats["failed_writes"] += 1
+            self.db.tracer.count("log_write_failures")
+            if self._failures < self.MAX_WRITE_ATTEMPTS:
+                self._unwritten = batch
+                return False
+            self.stats["dropped"] += len(batch)
+            self.db.tracer.count("log_rows_dropped", len(batch))
+        else:
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        self._failures = 0
+        self._done(batch)
+        return True
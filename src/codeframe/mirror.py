@@ -0,0 +1,218 @@
+"""Local mirror of repositories, open issues and comment metadata.
+
+Scans and result checks used to list every open issue and every comment over
+the network each time. The mirror keeps that state in SQLite and fetches only
+deltas:
+
+- A repository's first sync lists its open issues and all their comments.
+  Later syncs list only issues updated since the previous sync (`since`),
+  closed ones included so they can be dropped, and fetch only comments
+  updated since then on issues that have comments.
+- A single issue's comments can be refreshed from its newest mirrored comment
+  (`refresh_issue`), which is what the processor needs after a trigger and
+  what the walk and search scanners use to check each candidate issue.
+
+Comments are stored as metadata (ID, author, timestamps) plus the parsed
+classification of the bot's comments; bodies are not kept, except that the
+bot's comments go into the full-text search index. A comment fetched again with
+the same ID and `updated_at` keeps its stored classification instead of being
+parsed and indexed again. Readers then answer "what did Traycer last say on
+this issue" with a local query.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from .comment_parser import ParsedComment, parse_comment
+from .database import Database
+from .rows import MirroredComment, MirroredIssue
+from .token_pool import TokenPool
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from github.Issue import Issue
+    from github.IssueComment import IssueComment
+    from github.Repository import Repository
+
+
+class GitHubMirror:
+    """Keeps the database's mirror tables current with incremental syncs."""
+
+    SYNC_OVERLAP_SECONDS = 60  # Re-cover the end of the previous sync to absorb clock skew
+
+    def __init__(
+        self,
+        db: Database,
+        pool: TokenPool,
+        bot_login: str,
+        tracer: Tracer | None = None,
+    ):
+        """Initialize mirror.
+
+        Args:
+            db: Database holding the mirror tables
+            pool: Token pool GitHub calls are made through
+            bot_login: Login whose comments are classified (Traycer's bot)
+            tracer: Optional tracer (defaults to the database's tracer)
+        """
+        self.db = db
+        self.pool = pool
+        self.bot_login = bot_login
+        self.tracer = tracer or db.tracer
+
+    def sync_repo(self, repo: Repository) -> int:
+        """Bring one repository's open issues and their comments up to date.
+
+        Args:
+            repo: GitHub repository object
+
+        Returns:
+            Number of issues that changed since the previous sync
+        """
+        repo_name = repo.full_name
+        since = self.db.get_mirror_synced_at(repo_name)
+        started = datetime.now(UTC)
+
+        if since is None:
+            listing = repo.get_issues(state="open")
+        else:
+            listing = repo.get_issues(state="all", since=since)
+        issues: list[Issue] = self.pool.fetch_all("github.get_issues", listing)
+
+        changed: list[MirroredIssue] = []
+        closed: list[int] = []
+        comments: list[MirroredComment] = []
+        for issue in issues:
+            if issue.pull_request:
+                continue
+            if issue.state == "closed":
+                closed.append(issue.number)
+                continue
+            changed.append(
+                MirroredIssue(
+                    repo_name=repo_name,
+                    issue_number=issue.number,
+                    title=issue.title,
+                    assignees=",".join(user.login for user in issue.assignees),
+                    labels=",".join(label.name for label in issue.labels),
+                    created_at=issue.created_at,
+                    updated_at=issue.updated_at,
+                )
+            )
+            if issue.comments:
+                comments += self._fetch_comments(repo_name, issue, since)
+
+        self.db.save_mirror_sync(
+            repo_name,
+            started - timedelta(seconds=self.SYNC_OVERLAP_SECONDS),
+            changed,
+            closed,
+            comments,
+        )
+        return len(changed) + len(closed)
+
+    def refresh_issue(self, repo_name: str, issue: Issue) -> ParsedComment | None:
+        """Fetch an issue's new comments and return the bot's latest classification.
+
+        Args:
+            repo_name: Repository full name
+            issue: GitHub issue object
+
+        Returns:
+            Classification of the bot's most recent comment, or None if it has
+            not commented
+        """
+        latest = self.refresh_latest_comment(repo_name, issue)
+        if latest is None:
+            return None
+        return ParsedComment(latest.kind, latest.wait_seconds)
+
+    def refresh_latest_comment(self, repo_name: str, issue: Issue) -> MirroredComment | None:
+        """Fetch an issue's new comments and return the bot's latest mirrored comment.
+
+        Only comments updated since the newest mirrored one are fetched and
+        classified; older ones keep the classification stored with them.
+
+        Args:
+            repo_name: Repository full name
+            issue: GitHub issue object
+
+        Returns:
+            The bot's most recent comment, or None if it has not commented
+        """
+        since = self.db.get_mirror_comment_cursor(repo_name, issue.number)
+        self.db.save_mirror_comments(self._fetch_comments(repo_name, issue, since))
+        return self.db.get_latest_mirror_comment(repo_name, issue.number, self.bot_login)
+
+    def _fetch_comments(
+        self, repo_name: str, issue: Issue, since: datetime | None
+    ) -> list[MirroredComment]:
+        """Fetch an issue's comments updated since a time and classify the bot's.
+
+        Args:
+            repo_name: Repository full name
+            issue: GitHub issue object
+            since: Only comments updated at or after this time (None for all)
+
+        Returns:
+            Mirror rows for the fetched comments
+        """
+
+        if since is None:
+            listing = issue.get_comments()
+        else:
+            listing = issue.get_comments(since=since)
+        comments: list[IssueComment] = self.pool.fetch_all("github.get_comments", listing)
+        # Fetches from a cursor overlap what is mirrored; unchanged comments keep
+        # their classification
+        mirrored = {}
+        if since is not None:
+            mirrored = {
+                row.comment_id: row for row in self.db.get_mirror_comments(repo_name, issue.number)
+            }
+        parsed = {}
+        fresh = []
+        for comment in comments:
+            if comment.user.login != self.bot_login:
+                continue
+            known = mirrored.get(comment.id)
+            if known is not None and known.updated_at == (comment.updated_at or comment.created_at):
+                self.tracer.count("cache_hits")
+                parsed[comment.id] = ParsedComment(known.kind, known.wait_seconds)
+                continue
+            self.tracer.count("bytes", len(comment.body or ""))
+            parsed[comment.id] = parse_comment(comment.body)
+            fresh.append(comment)
+        self.db.index_comments(
+            [
+                (
+                    comment.id,
+                    repo_name,
+                    issue.number,
+                    comment.user.login,
+                    comment.created_at,
+                    comment.updated_at or comment.created_at,
+                    comment.body or "",
+                )
+                for comment in fresh
+            ]
+        )
+
+        rows = []
+        for comment in comments:
+            classification = parsed.get(comment.id)
+            rows.append(
+                MirroredComment(
+                    comment_id=comment.id,
+                    repo_name=repo_name,
+                    issue_number=issue.number,
+                    author=comment.user.login,
+                    created_at=comment.created_at,
+                    updated_at=comment.updated_at or comment.created_at,
+                    kind=classification.kind if classification else None,
+                    wait_seconds=classification.wait_seconds if classification else None,
+                )
+            )
+        return rows
@@ -0,0 +1,188 @@
+"""Pluggable priority policies for the retry queue.
+
+A policy turns what we know about a queued issue into an integer score. The
+static part (`score`) is stored on the `queued_issues` row whenever the row is
+written. The part that depends on the clock (issue age) would drift as rows sit
+in the queue, so it is a SQL expression (`sql_score`) that dequeue adds to the
+stored score inside the query; neither part is computed over the queue in Python.
+
+Per-repository weighting is not a score: repositories share slots through the
+fair-share allocator (`CODEFRAME_REPO_SHARES`, see fair_share.py).
+"""
+
+import os
+from datetime import datetime
+from typing import Any, NamedTuple
+
+
+class IssueContext(NamedTuple):
+    """Queue-row fields available to priority policies."""
+
+    repo_name: str
+    issue_number: int
+    labels: tuple[str, ...] = ()
+    created_at: datetime | None = None
+    retry_count: int = 0
+    priority: int = 0  # Explicit priority set via the CLI
+
+
+class PriorityPolicy:
+    """Base policy: every issue scores 0, leaving retry time as the only ordering."""
+
+    def score(self, issue: IssueContext) -> int:
+        """Score an issue; higher scores are dequeued first.
+
+        Args:
+            issue: Queue-row fields
+
+        Returns:
+            Integer priority score, stored on the queue row
+        """
+        return 0
+
+    def sql_score(self, now: int) -> tuple[str, tuple[Any, ...]]:
+        """SQL expression for the clock-dependent part of the score.
+
+        Evaluated over `queued_issues` columns at dequeue and added to the stored
+        score, so it never goes stale.
+
+        Args:
+            now: Current time as epoch seconds
+
+        Returns:
+            (expression, parameters) tuple
+        """
+        return "0", ()
+
+
+class ExplicitPriority(PriorityPolicy):
+    """Scores by the operator-set `priority` column."""
+
+    def __init__(self, weight: int = 100):
+        """Initialize policy.
+
+        Args:
+            weight: Points per unit of explicit priority (dominates other policies)
+        """
+        self.weight = weight
+
+    def score(self, issue: IssueContext) -> int:
+        return issue.priority * self.weight
+
+
+class LabelPriority(PriorityPolicy):
+    """Scores by issue labels (e.g. bug=10, urgent=50)."""
+
+    def __init__(self, weights: dict[str, int]):
+        """Initialize policy.
+
+        Args:
+            weights: Points per label name (case-insensitive)
+        """
+        self.weights = {label.lower(): points for label, points in weights.items()}
+
+    def score(self, issue: IssueContext) -> int:
+        return sum(self.weights.get(label.lower(), 0) for label in issue.labels)
+
+
+class IssueAgePriority(PriorityPolicy):
+    """Scores older issues higher, capped so age never outranks explicit priority."""
+
+    def __init__(self, points_per_day: int = 1, max_points: int = 30):
+        """Initialize policy.
+
+        Args:
+            points_per_day: Points per day since the issue was opened
+            max_points: Upper bound on age points
+        """
+        self.points_per_day = points_per_day
+        self.max_points = max_points
+
+    def sql_score(self, now: int) -> tuple[str, tuple[Any, ...]]:
+        # Scalar MIN() is NULL when issue_created_at is, so unknown ages score 0
+        return (
+            "COALESCE(MIN(?, MAX(0, (? - issue_created_at) / 86400) * ?), 0)",
+            (self.max_points, now, self.points_per_day),
+        )
+
+
+class RetryCountPriority(PriorityPolicy):
+    """Penalizes issues that keep failing so fresh work is not starved."""
+
+    def __init__(self, penalty: int = 5):
+        """Initialize policy.
+
+        Args:
+            penalty: Points subtracted per previous retry
+        """
+        self.penalty = penalty
+
+    def score(self, issue: IssueContext) -> int:
+        return -issue.retry_count * self.penalty
+
+
+class CompositePriority(PriorityPolicy):
+    """Sums the scores of several policies."""
+
+    def __init__(self, policies: list[PriorityPolicy]):
+        """Initialize policy.
+
+        Args:
+            policies: Policies whose scores are added together
+        """
+        self.policies = policies
+
+    def score(self, issue: IssueContext) -> int:
+        return sum(policy.score(issue) for policy in self.policies)
+
+    def sql_score(self, now: int) -> tuple[str, tuple[Any, ...]]:
+        terms = [policy.sql_score(now) for policy in self.policies]
+        terms = [(expression, params) for expression, params in terms if expression != "0"]
+        if not terms:
+            return "0", ()
+        return (
+            " + ".join(f"({expression})" for expression, _ in terms),
+            tuple(param for _, params in terms for param in params),
+        )
+
+
+def parse_weights(value: str | None) -> dict[str, int]:
+    """Parse a 'name=points,name=points' configuration string.
+
+    Args:
+        value: Configuration string (empty or None for no weights)
+
+    Returns:
+        Mapping of name to integer points
+    """
+    weights = {}
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, points = item.rpartition("=")
+        if not name:
+            raise ValueError(f"Invalid weight '{item}', expected name=points")
+        weights[name.strip()] = int(points)
+    return weights
+
+
+def policy_from_env() -> PriorityPolicy:
+    """Build the deployment's priority policy from environment variables.
+
+    Reads:
+        CODEFRAME_PRIORITY_LABELS: Label weights, e.g. "bug=10,urgent=50"
+        CODEFRAME_PRIORITY_AGE_POINTS: Points per day of issue age (default: 1)
+        CODEFRAME_PRIORITY_RETRY_PENALTY: Points subtracted per retry (default: 5)
+
+    Returns:
+        Composite policy of explicit, label, age and retry scoring
+    """
+    return CompositePriority(
+        [
+            ExplicitPriority(),
+            LabelPriority(parse_weights(os.getenv("CODEFRAME_PRIORITY_LABELS"))),
+            IssueAgePriority(points_per_day=int(os.getenv("CODEFRAME_PRIORITY_AGE_POINTS", "1"))),
+            RetryCountPriority(penalty=int(os.getenv("CODEFRAME_PRIORITY_RETRY_PENALTY", "5"))),
+        ]
+    )
@@ -1,16 +1,29 @@
 """Queue processor for re-analyzing rate-limited issues."""
 
-import re
-import time
-from datetime import datetime
-from typing import Any
+from __future__ import annotations
 
-from github import Auth, Github, GithubException
-from github.Issue import Issue
+import heapq
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
 
+from .accounts import SlotBucket, TraycerAccount, accounts_from_env, make_buckets
+from .circuit_breaker import CircuitBreaker, classify_failure, repo_domain
+from .comment_parser import ANALYSIS, RATE_LIMITED, ParsedComment
 from .database import Database
+from .fair_share import FairShareAllocator
+from .latency import format_seconds
+from .mirror import GitHubMirror
+from .rate_budget import RateBudgetExceededError
+from .retry_policy import PERMANENT, UNKNOWN, RetryPolicy, retry_policy_from_env
 from .scanner import IssueScanner
 from .slot_calculator import SlotCalculator
+from .token_pool import TokenPool, tokens_from_env
+from .tracing import JsonLinesSink, Tracer, profiled
+
+if TYPE_CHECKING:
+    # PyGithub takes ~0.25s to import; cron ticks with nothing to do never need it
+    from github.Issue import Issue
 
 
 class CircuitBreakerError(Exception):
@@ -19,27 +32,99 @@ class CircuitBreakerError(Exception):
     pass
 
 
+class Preflight(NamedTuple):
+    """Whether a processor run could do anything right now."""
+
+    can_run: bool
+    reason: str
+    next_wake_at: datetime | None  # Aware UTC; None when the queue is empty
+
+
+def check_preflight(db: Database, account_count: int = 1) -> Preflight:
+    """Decide from local state alone whether a processor run could do any work.
+
+    Reads the queue, our recent attempts and the systemic circuit breakers in a
+    single indexed query. It makes no API calls and skips external activity
+    detection, so it can only under-count consumed slots: a 'cannot run' answer
+    is definitive, while 'can run' still leaves the final word to the full run.
+
+    Args:
+        db: Database instance
+        account_count: Number of Traycer accounts (slot buckets) in use
+
+    Returns:
+        Preflight with the earliest time work could be possible
+    """
+    breaker = CircuitBreaker(db)
+    state = db.get_preflight_state(
+        SlotCalculator.SLOT_RECHARGE_MINUTES,
+        {domain: breaker.policy(domain).cooldown_seconds for domain in breaker.systemic_domains},
+    )
+    now = datetime.now(UTC)
+
+    if not state["ready"] and state["next_retry_at"] is None:
+        return Preflight(False, "queue empty", None)
+
+    # Every blocker must clear before a run can do work
+    blockers: dict[str, datetime] = {}
+    if not state["ready"]:
+        blockers["no issues ready"] = datetime.fromtimestamp(state["next_retry_at"], UTC)
+    if state["recent_attempts"] >= SlotCalculator.TOTAL_SLOTS * account_count:
+        oldest = datetime.fromtimestamp(state["oldest_attempt"], UTC)
+        blockers["no slots"] = oldest + timedelta(minutes=SlotCalculator.SLOT_RECHARGE_MINUTES)
+    if state["breaker_open_until"] and state["breaker_open_until"] > now.timestamp():
+        blockers["circuit open"] = datetime.fromtimestamp(
+            state["breaker_open_until"], UTC
+        )
+
+    if not blockers:
+        return Preflight(True, "work available", now)
+    return Preflight(False, ", ".join(blockers), max(blockers.values()))
+
+
 class QueueProcessor:
     """Processes queued issues by toggling assignment to trigger Traycer re-analysis."""
 
-    MAX_RETRIES = 3
-    CIRCUIT_BREAKER_THRESHOLD = 5
-    RATE_LIMIT_PATTERN = re.compile(r"Rate limit exceeded\. Please try after (\d+) seconds\.")
-
-    def __init__(self, github_token: str, username: str, db: Database):
+    CLAIM_LEASE_SECONDS = 300  # Longer than any single issue takes to process
+    CALLS_PER_ISSUE = 6  # get_repo, get_issue, up to 2 assignee edits, comments (x2)
+
+    def __init__(
+        self,
+        github_token: str,
+        username: str,
+        db: Database,
+        tracer: Tracer | None = None,
+        accounts: list[TraycerAccount] | None = None,
+        tokens: list[str] | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
         """Initialize queue processor.
 
         Args:
             github_token: GitHub personal access token
             username: GitHub username to assign issues to
             db: Database instance
+            tracer: Optional tracer (defaults to the database's tracer)
+            accounts: Traycer accounts to spread work across, main account first
+                (defaults to the single username/token account)
+            tokens: Extra GitHub tokens for the API token pool, which also holds
+                every account's token (each account's assignments are signed
+                with its own)
+            retry_policy: When to retry failed issues (defaults to the
+                CODEFRAME_RETRY_* environment configuration)
         """
-        auth = Auth.Token(github_token)
-        self.github = Github(auth=auth)
+        accounts = accounts or [TraycerAccount(username, github_token)]
         self.username = username
         self.db = db
-        self.slot_calculator = SlotCalculator(db)
-        self.consecutive_errors = 0
+        self.tracer = tracer or db.tracer
+        self.pool = TokenPool(
+            db, "processor", [github_token, *(tokens or []), *(a.token for a in accounts)]
+        )
+        self.mirror = GitHubMirror(db, self.pool, IssueScanner.TRAYCER_BOT_LOGIN, self.tracer)
+        self.breaker = CircuitBreaker(db)
+        self.buckets = make_buckets(db, accounts)
+        self.allocator = FairShareAllocator(db)
+        self.retry_policy = retry_policy or retry_policy_from_env()
 
     def process_queue(self) -> dict[str, int]:
         """Process all issues ready for processing.
@@ -53,46 +138,174 @@ class QueueProcessor:
             "rate_limited": 0,
             "failed": 0,
             "skipped_no_slots": 0,
+            "skipped_circuit_open": 0,
         }
 
-        # Check circuit breaker
-        self._check_circuit_breaker()
+        # Check circuit breakers that halt all processing
+        blocked = self.breaker.blocked_by(self.breaker.systemic_domains)
+        if blocked:
+            raise CircuitBreakerError(f"Circuit open for {blocked}")
 
-        # Calculate available slots
-        available_slots = self.slot_calculator.get_processing_window_size()
+        # Nothing ready: exit before slot detection (a `gh` search) or any client use
+        if self.db.count_ready_issues() == 0:
+            print("No issues ready for processing")
+            return stats
+
+        # Calculate available slots in every account's bucket
+        free = {}
+        next_slot_times = []
+        for bucket in self.buckets:
+            slot_status = bucket.slot_calculator.calculate_available_slots()
+            free[bucket.username] = slot_status.available_slots
+            if slot_status.next_slot_available_at:
+                next_slot_times.append(slot_status.next_slot_available_at)
+        available_slots = sum(free.values())
         print(f"Available processing slots: {available_slots}")
+        if len(self.buckets) > 1:
+            print("  " + ", ".join(f"{name}: {slots}" for name, slots in free.items()))
 
         if available_slots == 0:
-            slot_status = self.slot_calculator.calculate_available_slots()
-            print(f"No slots available. Next slot at: {slot_status.next_slot_available_at}")
+            next_slot = min(next_slot_times) if next_slot_times else None
+            print(f"No slots available. Next slot at: {next_slot}")
             return stats
 
-        # Get issues ready for processing
-        issues = self.db.get_issues_ready_for_processing(limit=available_slots)
+        # Don't spend slots re-toggling issues attempted within the recharge window
+        deferred = self.db.defer_recent_attempts(
+            minutes=SlotCalculator.SLOT_RECHARGE_MINUTES,
+            buffer_minutes=IssueScanner.RETRY_BUFFER_MINUTES,
+        )
+        if deferred:
+            print(f"Deferred {deferred} issue(s) attempted in the last 30 minutes")
+
+        # Split the window's slots across repos with closed breakers, then take
+        # each repo's best issues
+        open_domains = set(self.breaker.open_domains())
+        ready_counts = {
+            repo: count
+            for repo, count in self.db.get_ready_counts_by_repo().items()
+            if repo_domain(repo) not in open_domains
+        }
+        allocation = self.allocator.allocate(available_slots, ready_counts)
+        issues = []
+        for repo_name, slots in allocation.slots.items():
+            issues.extend(self.db.get_issues_ready_for_processing(limit=slots, repo_name=repo_name))
 
         if not issues:
             print("No issues ready for processing")
             return stats
 
-        print(f"Processing {len(issues)} issue(s)...")
+        # Defer the batch rather than run into 403s halfway through it
+        wait = self.pool.check("core", cost=len(issues) * self.CALLS_PER_ISSUE)
+        if wait > 0:
+            print(f"GitHub API budget too low for {len(issues)} issue(s); retry in {wait:.0f}s")
+            return stats
 
+        print(f"Processing {len(issues)} issue(s) across {len(allocation.slots)} repo(s)...")
+
+        triggered: dict[str, int] = {}
+        try:
+            self._process_batch(self._route(issues, free), stats, triggered)
+        finally:
+            # Charge fair-share credit only for the slots that were spent
+            self.allocator.commit(allocation, used=triggered)
+            self.pool.flush()
+
+        return stats
+
+    def _route(
+        self, issues: list[dict[str, Any]], free: dict[str, int]
+    ) -> list[tuple[dict[str, Any], SlotBucket]]:
+        """Assign each issue to the account bucket with the most free slots left.
+
+        Every bucket with a free slot can trigger Traycer now, so picking the one
+        with the most headroom spreads the window evenly across accounts and
+        keeps their recharge times staggered.
+
+        Args:
+            issues: Issues selected for this window
+            free: Free slots per account username
+
+        Returns:
+            (issue, bucket) pairs, in issue order
+        """
+        buckets = {bucket.username: bucket for bucket in self.buckets}
+        heap = [(-slots, index, name) for index, (name, slots) in enumerate(free.items()) if slots]
+        heapq.heapify(heap)
+
+        routed = []
         for issue_data in issues:
+            if not heap:
+                break
+            slots, index, name = heapq.heappop(heap)
+            routed.append((issue_data, buckets[name]))
+            if slots + 1 < 0:
+                heapq.heappush(heap, (slots + 1, index, name))
+        return routed
+
+    def _process_batch(
+        self,
+        batch: list[tuple[dict[str, Any], SlotBucket]],
+        stats: dict[str, int],
+        triggered: dict[str, int],
+    ) -> None:
+        """Process a batch of issues, updating stats and trigger counts in place.
+
+        Args:
+            batch: Issue records from the database with the bucket to use for each
+            stats: Processing statistics to update
+            triggered: Traycer triggers per repository, updated as toggles land
+
+        Raises:
+            CircuitBreakerError: If errors trip a systemic circuit breaker mid-batch
+        """
+        systemic = self.breaker.systemic_domains
+        for issue_data, bucket in batch:
+            repo_name = issue_data["repo_name"]
+            domains = systemic + [repo_domain(repo_name)]
+
+            blocked = self.breaker.blocked_by(domains)
+            if blocked in systemic:
+                raise CircuitBreakerError(f"Circuit open for {blocked}")
+            if blocked:
+                stats["skipped_circuit_open"] += 1
+                print(f"Skipping {repo_name}#{issue_data['issue_number']} (circuit open)")
+                continue
+
+            # Another processor run already has this issue in flight
+            if not self.db.claim_issue(
+                issue_data["repo_name"], issue_data["issue_number"], self.CLAIM_LEASE_SECONDS
+            ):
+                print(
+                    f"Skipping {issue_data['repo_name']}#{issue_data['issue_number']} (in flight)"
+                )
+                continue
+
             try:
-                result = self._process_issue(issue_data)
+                result = self._process_issue(issue_data, bucket, triggered)
                 stats["processed"] += 1
 
                 if result == "success":
                     stats["succeeded"] += 1
-                    self.consecutive_errors = 0  # Reset on success
+                    self.breaker.record_success(domains)
                 elif result == "rate_limited":
                     stats["rate_limited"] += 1
-                    self.consecutive_errors = 0  # Rate limits are expected, not errors
+                    self.breaker.record_success(domains)  # Rate limits are expected, not errors
                 else:
                     stats["failed"] += 1
 
+            except RateBudgetExceededError as e:
+                # Quota is gone until reset; leave the rest of the batch queued
+                self.db.log_error(error_type="rate_budget", error_message=str(e))
+                print(f"Deferring remaining issues: {e}")
+                break
+
+            except CircuitBreakerError:
+                stats["failed"] += 1
+                print("Circuit breaker tripped. Stopping processing.")
+                raise
+
             except Exception as e:
                 stats["failed"] += 1
-                self.consecutive_errors += 1
                 self.db.log_error(
                     error_type="processing_error",
                     error_message=str(e),
@@ -100,100 +313,131 @@ class QueueProcessor:
                     issue_number=issue_data["issue_number"],
                 )
                 print(f"Error processing issue: {e}")
+                self._reschedule(issue_data, classify_failure(e) or PERMANENT, str(e))
+                self._record_failure(repo_name, e)
 
-                # Check circuit breaker after each error
-                try:
-                    self._check_circuit_breaker()
-                except CircuitBreakerError:
-                    print("Circuit breaker tripped. Stopping processing.")
-                    raise
+            finally:
+                # No-op if the issue was removed from the queue
+                self.db.release_issue(issue_data["repo_name"], issue_data["issue_number"])
 
-        return stats
-
-    def _process_issue(self, issue_data: dict[str, Any]) -> str:
+    def _process_issue(
+        self, issue_data: dict[str, Any], bucket: SlotBucket, triggered: dict[str, int]
+    ) -> str:
         """Process a single issue by toggling assignment.
 
         Args:
             issue_data: Issue data from database
+            bucket: Account whose assignment (and Traycer quota) to use
+            triggered: Traycer triggers per repository, incremented once the toggle lands
 
         Returns:
             Result status: 'success', 'rate_limited', or 'failed'
         """
+        from github import GithubException
+
         repo_name = issue_data["repo_name"]
         issue_number = issue_data["issue_number"]
         retry_count = issue_data["retry_count"]
 
-        print(f"Processing {repo_name}#{issue_number} (retry {retry_count}/{self.MAX_RETRIES})")
-
-        # Check if max retries exceeded
-        if retry_count >= self.MAX_RETRIES:
-            print(f"  Max retries exceeded. Removing from queue.")
-            self.db.remove_issue(repo_name, issue_number)
-            self.db.log_error(
-                error_type="max_retries",
-                error_message=f"Max retries ({self.MAX_RETRIES}) exceeded",
-                repo_name=repo_name,
-                issue_number=issue_number,
-            )
-            return "failed"
+        print(f"Processing {repo_name}#{issue_number} (retry {retry_count})")
 
+        attempt_id = None
         try:
-            # Get the issue
-            repo = self.github.get_repo(repo_name)
-            issue = repo.get_issue(issue_number)
+            # Get the issue and toggle assignment to trigger re-analysis, both as
+            # the bucket's account so the assignment is made with its own token
+            with self.pool.using(bucket.account.token):
+                github = self.pool.github
+                repo = self.pool.call("github.get_repo", lambda span: github.get_repo(repo_name))
+                issue = self.pool.call(
+                    "github.get_issue", lambda span: repo.get_issue(issue_number)
+                )
+                with self.tracer.span("processor.toggle_assignment", account=bucket.username):
+                    self._toggle_assignment(issue, bucket.username)
 
-            # Toggle assignment to trigger re-analysis
-            self._toggle_assignment(issue)
+            # The assignment landed and spent a slot, however the attempt ends
+            attempt_id = self.db.record_trigger(repo_name, issue_number, account=bucket.username)
+            triggered[repo_name] = triggered.get(repo_name, 0) + 1
 
             # Wait a moment for Traycer to process
-            time.sleep(2)
+            with self.tracer.span("sleep.traycer_wait"):
+                time.sleep(2)
 
-            # Check if rate limit was resolved
-            result = self._check_processing_result(issue)
+            # Check if rate limit was resolved (one comment fetch, one parse)
+            parsed = self._parse_latest_traycer_comment(repo_name, issue)
+            result = self._check_processing_result(parsed)
 
             if result == "success":
-                # Remove from queue
-                self.db.remove_issue(repo_name, issue_number)
-                self.db.log_processing(repo_name, issue_number, success=True)
-                print(f"  ✓ Successfully re-analyzed")
+                # Remove from queue, recording the wait since the rate-limit comment
+                latency = self.db.complete_issue(repo_name, issue_number)
+                self.db.update_trigger(attempt_id, "success")
+                print("  ✓ Successfully re-analyzed")
+                if latency is not None:
+                    print(f"    Waited {format_seconds(latency)} since the rate-limit comment")
                 return "success"
 
             elif result == "rate_limited":
-                # Still rate limited, update retry info
-                rate_limit_info = IssueScanner.RATE_LIMIT_PATTERN.search(
-                    self._get_latest_traycer_comment(issue)
-                )
-                if rate_limit_info:
-                    seconds = int(rate_limit_info.group(1))
-                    # Calculate new retry time from NOW + rate limit seconds + buffer
-                    from datetime import datetime, timedelta
-                    from .scanner import IssueScanner as Scanner
-
-                    next_retry = datetime.now() + timedelta(
-                        seconds=seconds, minutes=Scanner.RETRY_BUFFER_MINUTES
-                    )
-
-                    self.db.log_processing(
-                        repo_name, issue_number, success=False, rate_limit_seconds=seconds
-                    )
-                    self.db.increment_retry_count(
-                        repo_name, issue_number, "Still rate limited", next_retry_at=next_retry
-                    )
-                    print(f"  ⚠ Still rate limited ({seconds}s), retry at {next_retry.isoformat()}")
-                    return "rate_limited"
+                # Still rate limited; the policy schedules the retry past Traycer's wait
+                seconds = parsed.wait_seconds
+                self.db.update_trigger(attempt_id, "rate_limited", rate_limit_seconds=seconds)
+                print(f"  ⚠ Still rate limited ({seconds}s)")
+                self._reschedule(issue_data, RATE_LIMITED, "Still rate limited", seconds)
+                return "rate_limited"
 
             else:
                 # Unknown result
-                self.db.increment_retry_count(repo_name, issue_number, "Unknown result")
+                self.db.update_trigger(attempt_id, "unknown")
+                self._reschedule(issue_data, UNKNOWN, "Unknown result")
                 return "failed"
 
         except GithubException as e:
+            if attempt_id is not None:
+                self.db.update_trigger(attempt_id, "error")
             error_msg = f"GitHub API error: {e.status} - {e.data.get('message', str(e))}"
-            self.db.increment_retry_count(repo_name, issue_number, error_msg)
             print(f"  ✗ {error_msg}")
+            self._reschedule(issue_data, classify_failure(e) or PERMANENT, error_msg)
+            self._record_failure(repo_name, e)
             return "failed"
 
-    def _toggle_assignment(self, issue: Issue) -> None:
+        except Exception:
+            if attempt_id is not None:
+                self.db.update_trigger(attempt_id, "error")
+            raise
+
+    def _reschedule(
+        self,
+        issue_data: dict[str, Any],
+        error_class: str,
+        error: str,
+        wait_seconds: int | None = None,
+    ) -> None:
+        """Schedule a failed issue's next attempt, or dead-letter it when out of retries.
+
+        Args:
+            issue_data: Issue record from the database
+            error_class: Retry policy error class of the failure
+            error: Error message to store on the issue
+            wait_seconds: Wait advertised by Traycer, if any
+        """
+        repo_name = issue_data["repo_name"]
+        issue_number = issue_data["issue_number"]
+        attempt = (issue_data["retry_count"] or 0) + 1
+
+        next_retry = self.retry_policy.next_retry_at(error_class, attempt, wait_seconds)
+        if next_retry is None:
+            self.db.dead_letter_issue(repo_name, issue_number, error, error_class)
+            self.db.log_error(
+                error_type="max_retries",
+                error_message=f"Gave up after {attempt} attempt(s) ({error_class}): {error}",
+                repo_name=repo_name,
+                issue_number=issue_number,
+            )
+            print(f"  Gave up after {attempt} attempt(s); moved to dead-letter queue")
+            return
+
+        self.db.increment_retry_count(repo_name, issue_number, error, next_retry_at=next_retry)
+        print(f"  Retry {attempt} at {next_retry.isoformat()}")
+
+    def _toggle_assignment(self, issue: Issue, username: str) -> None:
         """Toggle issue assignment to trigger Traycer re-analysis.
 
         Strategy:
@@ -202,6 +446,7 @@ class QueueProcessor:
 
         Args:
             issue: GitHub issue object
+            username: Account to assign
         """
         # Current implementation: Check state and toggle accordingly (Option 2)
         # This minimizes events and keeps cleaner history compared to always
@@ -210,85 +455,109 @@ class QueueProcessor:
 
         assignees = [assignee.login for assignee in issue.assignees]
 
-        if self.username in assignees:
+        if username in assignees:
             # User is assigned, unassign then reassign
-            issue.remove_from_assignees(self.username)
-            time.sleep(0.5)  # Brief pause
-            issue.add_to_assignees(self.username)
+            self.pool.call(
+                "github.remove_from_assignees", lambda span: issue.remove_from_assignees(username)
+            )
+            with self.tracer.span("sleep.toggle_pause"):
+                time.sleep(0.5)  # Brief pause
+            self.pool.call("github.add_to_assignees", lambda span: issue.add_to_assignees(username))
         else:
             # User not assigned, just assign
-            issue.add_to_assignees(self.username)
+            self.pool.call("github.add_to_assignees", lambda span: issue.add_to_assignees(username))
 
-    def _check_processing_result(self, issue: Issue) -> str:
+    def _check_processing_result(self, parsed: ParsedComment | None) -> str:
         """Check if issue was successfully re-analyzed or still rate limited.
 
         Args:
-            issue: GitHub issue object
+            parsed: Latest Traycer comment, classified, or None if there is none
 
         Returns:
             'success', 'rate_limited', or 'unknown'
         """
-        latest_comment = self._get_latest_traycer_comment(issue)
-
-        if not latest_comment:
+        if parsed is None:
             return "unknown"
 
-        # Check for rate limit message
-        if self.RATE_LIMIT_PATTERN.search(latest_comment):
+        if parsed.kind == RATE_LIMITED:
             return "rate_limited"
 
-        # If we have a Traycer comment without rate limit, assume success
+        # If we have a Traycer analysis without rate limit, assume success
         # (Traycer posted analysis instead of rate limit error)
-        return "success"
+        if parsed.kind == ANALYSIS:
+            return "success"
+
+        return "unknown"
+
+    def _parse_latest_traycer_comment(self, repo_name: str, issue: Issue) -> ParsedComment | None:
+        """Fetch new comments into the mirror and classify Traycer's most recent one.
 
-    def _get_latest_traycer_comment(self, issue: Issue) -> str:
-        """Get the most recent comment from Traycer bot.
+        Only comments updated since the newest mirrored one are fetched, so a
+        long comment thread is not listed again on every check.
 
         Args:
+            repo_name: Repository full name
             issue: GitHub issue object
 
         Returns:
-            Comment body or empty string if not found
+            ParsedComment, or None if Traycer has not commented
         """
-        comments = list(issue.get_comments())
-        comments.reverse()  # Most recent first
+        return self.mirror.refresh_issue(repo_name, issue)
 
-        for comment in comments:
-            if comment.user.login == IssueScanner.TRAYCER_BOT_LOGIN:
-                return comment.body
+    def _record_failure(self, repo_name: str, error: Exception) -> None:
+        """Count a failure against its circuit breakers.
 
-        return ""
-
-    def _check_circuit_breaker(self) -> None:
-        """Check if circuit breaker should trip due to consecutive errors.
+        Args:
+            repo_name: Repository the failing issue belongs to
+            error: Exception raised
 
         Raises:
-            CircuitBreakerError: If consecutive errors exceed threshold
+            CircuitBreakerError: If the failure opened a systemic breaker
         """
-        recent_errors = self.db.get_consecutive_errors(limit=self.CIRCUIT_BREAKER_THRESHOLD)
-
-        if len(recent_errors) >= self.CIRCUIT_BREAKER_THRESHOLD:
-            # Check if all errors are recent (within last 5 minutes)
-            now = datetime.now()
-            all_recent = all(
-                (now - datetime.fromisoformat(err["timestamp"])).total_seconds() < 300
-                for err in recent_errors
+        opened = self.breaker.record_failure(repo_name, error)
+        for domain in opened:
+            self.db.log_error(
+                error_type="circuit_breaker",
+                error_message=f"Circuit open for {domain}: {error}",
+                repo_name=repo_name,
             )
 
-            if all_recent:
-                error_msg = (
-                    f"Circuit breaker tripped: {len(recent_errors)} consecutive errors "
-                    f"in last 5 minutes"
-                )
-                self.db.log_error(error_type="circuit_breaker", error_message=error_msg)
-                raise CircuitBreakerError(error_msg)
+        systemic = [domain for domain in opened if domain in self.breaker.systemic_domains]
+        if systemic:
+            raise CircuitBreakerError(f"Circuit open for {', '.join(systemic)}")
+        if opened:
+            print(f"  Circuit open for {repo_name}; skipping its issues until cooldown ends")
 
 
 def main() -> None:
     """Main entry point for processor script."""
+    import argparse
     import os
     import sys
 
+    parser = argparse.ArgumentParser(description="Process queued Traycer issues")
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Append JSON-lines timing trace for this run to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Capture a cProfile of this run to FILE (pstats format)",
+    )
+    parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="Exit immediately when local state shows nothing can run (no API calls)",
+    )
+    parser.add_argument(
+        "--wake-file",
+        metavar="FILE",
+        help="With --gate, write the next wake-up time (Unix seconds) to FILE",
+    )
+    args = parser.parse_args()
+
     # Get GitHub token and username from environment
     github_token = os.getenv("GITHUB_TOKEN")
     github_username = os.getenv("GITHUB_USERNAME")
@@ -301,15 +570,45 @@ def main() -> None:
         print("Error: GITHUB_USERNAME environment variable not set", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        accounts = accounts_from_env(github_username, github_token)
+    except ValueError as e:
+        print(f"Error: CODEFRAME_TRAYCER_ACCOUNTS: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        tokens = tokens_from_env(github_token)
+    except ValueError as e:
+        print(f"Error: CODEFRAME_GITHUB_TOKENS: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    tracer = Tracer("processor", JsonLinesSink(args.trace) if args.trace else None)
+
     # Initialize database and processor
-    db = Database()
-    processor = QueueProcessor(github_token, github_username, db)
+    db = Database(tracer=tracer)
+    log_buffer = int(os.getenv("CODEFRAME_LOG_BUFFER", "0"))
+    if log_buffer:
+        db.buffer_logs(log_buffer)
+
+    if args.gate:
+        preflight = check_preflight(db, len(accounts))
+        if args.wake_file:
+            wake_at = preflight.next_wake_at
+            with open(args.wake_file, "w") as f:
+                f.write(f"{int(wake_at.timestamp())}\n" if wake_at else "")
+        if not preflight.can_run:
+            wake = preflight.next_wake_at.isoformat() if preflight.next_wake_at else "on new work"
+            print(f"Nothing to do ({preflight.reason}). Next wake: {wake}")
+            tracer.close(gated=1)
+            return
+    processor = QueueProcessor(github_token, github_username, db, accounts=accounts, tokens=tokens)
 
     # Process queue
     print("Processing queued issues...")
+    stats = {}
     try:
-        stats = processor.process_queue()
-        print(f"\nProcessing complete:")
+        with profiled(args.profile):
+            stats = processor.process_queue()
+        print("\nProcessing complete:")
         print(f"  Processed: {stats['processed']}")
         print(f"  Succeeded: {stats['succeeded']}")
         print(f"  Rate limited: {stats['rate_limited']}")
@@ -317,6 +616,8 @@ def main() -> None:
     except CircuitBreakerError as e:
         print(f"\nCircuit breaker tripped: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        tracer.close(**stats)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+"""Shared GitHub API rate-limit budget across scanner, processor and slot calculator."""
+
+import math
+import time
+from collections import defaultdict
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from .database import Database
+
+
+class RateBudgetExceededError(Exception):
+    """Raised when a call would dip into quota that should be deferred until reset."""
+
+    pass
+
+
+class BudgetSnapshot(NamedTuple):
+    """Last known quota for one GitHub rate-limit resource."""
+
+    resource: str
+    remaining: int
+    limit: int
+    reset_at: int  # Unix epoch seconds
+
+
+class RateBudget:
+    """Tracks GitHub quota from X-RateLimit-* headers and gates calls against it.
+
+    Every component reads and writes the same `rate_limit_budget` rows, so a scan
+    running in one cron job sees what the processor has already spent in another.
+    Non-priority components stop short of a reserve kept for the processor, so a
+    big scan cannot starve issue processing right when slots open.
+    """
+
+    # Components allowed to spend the reserved headroom
+    PRIORITY_COMPONENTS = frozenset({"processor", "slot_calculator"})
+
+    # Calls per resource kept back for priority components
+    PROCESSOR_RESERVE = {"core": 300, "search": 5, "graphql": 200}
+
+    # Waits up to this long are slept through; longer ones raise RateBudgetExceededError
+    MAX_THROTTLE_SECONDS = 60
+
+    # Minimum seconds between writes of the budget snapshot to the database
+    PERSIST_INTERVAL_SECONDS = 5
+
+    def __init__(self, db: Database, component: str, token_id: str = ""):
+        """Initialize rate budget for one component.
+
+        Args:
+            db: Database instance shared with other components
+            component: Calling component name (e.g. 'scanner', 'processor')
+            token_id: Token whose quota this is (see token_pool.token_id); empty
+                for calls made with an unknown token, such as the `gh` CLI's
+        """
+        self.db = db
+        self.component = component
+        self.token_id = token_id
+        self.tracer = db.tracer
+        self.call_counts: dict[str, int] = defaultdict(int)
+        self._snapshots: dict[str, BudgetSnapshot] = {}
+        self._last_persist: dict[str, float] = {}
+        self._last_load: dict[str, float] = {}
+
+    @property
+    def reserve(self) -> dict[str, int]:
+        """Headroom this component must leave untouched, per resource."""
+        if self.component in self.PRIORITY_COMPONENTS:
+            return defaultdict(int)
+        return defaultdict(int, self.PROCESSOR_RESERVE)
+
+    def snapshot(self, resource: str = "core") -> BudgetSnapshot | None:
+        """Get the freshest known budget for a resource.
+
+        Reads the shared database row at most once per persist interval so other
+        processes' spending is picked up without a query per call.
+
+        Args:
+            resource: Rate-limit resource ('core', 'search', 'graphql')
+
+        Returns:
+            BudgetSnapshot, or None if no response has been seen yet
+        """
+        now = time.monotonic()
+        if now - self._last_load.get(resource, float("-inf")) >= self.PERSIST_INTERVAL_SECONDS:
+            self._last_load[resource] = now
+            row = self.db.get_rate_budget(resource, self.token_id)
+            local = self._snapshots.get(resource)
+            if row and (
+                local is None
+                or row["reset_at"] > local.reset_at
+                or (row["reset_at"] == local.reset_at and row["remaining"] < local.remaining)
+            ):
+                self._snapshots[resource] = BudgetSnapshot(
+                    resource, row["remaining"], row["rate_limit"], row["reset_at"]
+                )
+        return self._snapshots.get(resource)
+
+    def check(self, resource: str = "core", cost: int = 1) -> float:
+        """Seconds to wait before `cost` calls can be spent on a resource.
+
+        Args:
+            resource: Rate-limit resource
+            cost: Number of calls about to be made
+
+        Returns:
+            0 if the calls fit in the budget, otherwise seconds until the quota resets
+        """
+        snap = self.snapshot(resource)
+        if snap is None:
+            return 0
+
+        now = time.time()
+        if snap.reset_at <= now:
+            return 0  # Window already reset; next response refreshes the snapshot
+
+        if snap.remaining - cost >= self.reserve[resource]:
+            return 0
+
+        return snap.reset_at - now
+
+    def acquire(self, resource: str = "core", cost: int = 1) -> None:
+        """Block briefly or defer if the budget cannot cover `cost` calls.
+
+        Args:
+            resource: Rate-limit resource
+            cost: Number of calls about to be made
+
+        Raises:
+            RateBudgetExceededError: If the quota will not reset within MAX_THROTTLE_SECONDS
+        """
+        wait = self.check(resource, cost)
+        if wait <= 0:
+            return
+
+        if wait > self.MAX_THROTTLE_SECONDS:
+            reset_at = datetime.fromtimestamp(time.time() + wait, UTC)
+            raise RateBudgetExceededError(
+                f"GitHub {resource} budget exhausted for {self.component}; "
+                f"resets at {reset_at.isoformat()}"
+            )
+
+        with self.tracer.span("sleep.rate_budget", resource=resource):
+            time.sleep(wait)
+
+    def observe(self, github: Any, resource: str = "core") -> None:
+        """Record the quota reported by the last response of a PyGithub client.
+
+        PyGithub keeps the X-RateLimit-Remaining/Limit/Reset headers of the most
+        recent response on the client, so this costs no extra request.
+
+        Args:
+            github: github.Github client that just made a request
+            resource: Rate-limit resource the request counted against
+        """
+        # Read the requester directly: Github.rate_limiting issues a /rate_limit
+        # request of its own when no response has been seen yet
+        source = getattr(github, "requester", github)
+        remaining, limit = source.rate_limiting
+        if limit < 0:
+            return
+        self._update(BudgetSnapshot(resource, remaining, limit, source.rate_limiting_resettime))
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Record the quota from raw response headers.
+
+        Args:
+            headers: HTTP response headers containing X-RateLimit-* fields
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        if "x-ratelimit-remaining" not in lowered or "x-ratelimit-limit" not in lowered:
+            return
+        self._update(
+            BudgetSnapshot(
+                resource=lowered.get("x-ratelimit-resource", "core"),
+                remaining=int(float(lowered["x-ratelimit-remaining"])),
+                limit=int(float(lowered["x-ratelimit-limit"])),
+                reset_at=int(float(lowered.get("x-ratelimit-reset", 0))),
+            )
+        )
+
+    def spend(self, resource: str = "core", calls: int = 1) -> None:
+        """Account for calls whose response headers are not visible (e.g. `gh` subprocess).
+
+        Args:
+            resource: Rate-limit resource
+            calls: Number of calls made
+        """
+        self.call_counts[resource] += calls
+        snap = self._snapshots.get(resource)
+        if snap is not None:
+            self._update(snap._replace(remaining=max(0, snap.remaining - calls)))
+
+    def defer(self, resource: str, seconds: float) -> None:
+        """Treat a resource as exhausted for a while (e.g. after a 403 with Retry-After).
+
+        Args:
+            resource: Rate-limit resource
+            seconds: How long GitHub asked us to wait
+        """
+        snap = self.snapshot(resource)
+        limit = snap.limit if snap else 0
+        self._update(BudgetSnapshot(resource, 0, limit, math.ceil(time.time() + seconds)))
+
+    @contextmanager
+    def track(
+        self, name: str, github: Any | None = None, resource: str = "core"
+    ) -> Generator[dict[str, Any], None, None]:
+        """Gate, time and account a GitHub call.
+
+        Args:
+            name: Span name for tracing (e.g. 'github.get_issue')
+            github: PyGithub client making the call, or None if headers are not visible
+            resource: Rate-limit resource the call counts against
+
+        Yields:
+            Mutable span attribute dict
+
+        Raises:
+            RateBudgetExceededError: If the call must be deferred until the quota resets
+        """
+        self.acquire(resource)
+        try:
+            with self.tracer.span(name) as span:
+                yield span
+        finally:
+            if github is None:
+                self.spend(resource)
+            else:
+                self.call_counts[resource] += 1
+                self.observe(github, resource)
+
+    def flush(self) -> None:
+        """Persist call counts and the latest snapshots to the database."""
+        for resource, calls in self.call_counts.items():
+            if calls:
+                self.db.add_api_calls(self.component, resource, calls)
+        self.call_counts.clear()
+
+        for snap in self._snapshots.values():
+            self._persist(snap)
+
+    def _update(self, snap: BudgetSnapshot) -> None:
+        """Store a snapshot locally and persist it if due."""
+        self._snapshots[snap.resource] = snap
+        last = self._last_persist.get(snap.resource, float("-inf"))
+        low = snap.remaining < 2 * self.PROCESSOR_RESERVE.get(snap.resource, 0)
+        if low or time.monotonic() - last >= self.PERSIST_INTERVAL_SECONDS:
+            self._persist(snap)
+
+    def _persist(self, snap: BudgetSnapshot) -> None:
+        """Write a snapshot to the shared budget table."""
+        self._last_persist[snap.resource] = time.monotonic()
+        self.db.save_rate_budget(
+            snap.resource, snap.remaining, snap.limit, snap.reset_at, self.token_id
+        )
@@ -0,0 +1,191 @@
+"""Pluggable retry/backoff policies for queued issues.
+
+After a failed attempt the processor asks the deployment's policy when to try
+the issue again. Each error class has its own schedule: Traycer rate limits wait
+out the advertised seconds, transient errors back off exponentially, permanent
+errors give up at once. Every delay is jittered so issues that failed together
+do not come due together. When a class runs out of attempts the issue moves to
+the dead-letter table instead of being deleted.
+"""
+
+import os
+import random
+from datetime import UTC, datetime, timedelta
+
+from .comment_parser import RATE_LIMITED  # Traycer answered with another rate-limit comment
+from .priority import parse_weights
+
+# Further error classes, as passed to RetryPolicy.next_retry_at
+UNKNOWN = "unknown"  # No Traycer reply to read after the toggle
+PERMANENT = "permanent"  # Errors confined to one issue (404, 410, 422, ...)
+TRANSIENT_CLASSES = ("server", "network", "abuse", "auth", "other")  # classify_failure
+
+
+class Backoff:
+    """Base schedule: exponential backoff with multiplicative jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_seconds: float = 300,
+        factor: float = 2.0,
+        max_seconds: float = 6 * 3600,
+        jitter: float = 0.25,
+    ):
+        """Initialize schedule.
+
+        Args:
+            max_attempts: Failed attempts after which the issue is dead-lettered
+            base_seconds: Delay after the first failure
+            factor: Growth of the delay per further failure
+            max_seconds: Upper bound on the delay before jitter
+            jitter: Delays are spread uniformly over +/- this fraction
+        """
+        self.max_attempts = max_attempts
+        self.base_seconds = base_seconds
+        self.factor = factor
+        self.max_seconds = max_seconds
+        self.jitter = jitter
+
+    def delay(self, attempt: int, wait_seconds: int | None, rng: random.Random) -> float:
+        """Seconds to wait before the next attempt.
+
+        Args:
+            attempt: Failed attempts so far, including this one (1-based)
+            wait_seconds: Wait advertised by Traycer, if any
+            rng: Random source for jitter
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_seconds, self.base_seconds * self.factor ** (attempt - 1))
+        return delay * rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class RateLimitSchedule(Backoff):
+    """Waits out Traycer's advertised seconds plus a buffer and a positive jitter.
+
+    Traycer's wait is a floor, so jitter only ever adds to it; issues limited in
+    the same window then reach the processor spread over `jitter_seconds`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        buffer_seconds: float = 120,
+        jitter_seconds: float = 120,
+        fallback_seconds: float = 1800,
+    ):
+        """Initialize schedule.
+
+        Args:
+            max_attempts: Failed attempts after which the issue is dead-lettered
+            buffer_seconds: Added to the advertised wait
+            jitter_seconds: Upper bound on the random extra delay
+            fallback_seconds: Wait used when Traycer gave no duration
+        """
+        super().__init__(max_attempts=max_attempts)
+        self.buffer_seconds = buffer_seconds
+        self.jitter_seconds = jitter_seconds
+        self.fallback_seconds = fallback_seconds
+
+    def delay(self, attempt: int, wait_seconds: int | None, rng: random.Random) -> float:
+        wait = self.fallback_seconds if wait_seconds is None else wait_seconds
+        return wait + self.buffer_seconds + rng.uniform(0, self.jitter_seconds)
+
+
+class RetryPolicy:
+    """Maps error classes to schedules and decides each failed issue's next retry."""
+
+    def __init__(
+        self,
+        schedules: dict[str, Backoff],
+        default: Backoff | None = None,
+        rng: random.Random | None = None,
+    ):
+        """Initialize policy.
+
+        Args:
+            schedules: Schedule per error class
+            default: Schedule for classes without one
+            rng: Random source for jitter (seed it for reproducible schedules)
+        """
+        self.schedules = schedules
+        self.default = default or Backoff()
+        self.rng = rng or random.Random()
+
+    def schedule(self, error_class: str) -> Backoff:
+        """Schedule for an error class."""
+        return self.schedules.get(error_class, self.default)
+
+    def next_retry_at(
+        self,
+        error_class: str,
+        attempt: int,
+        wait_seconds: int | None = None,
+        now: datetime | None = None,
+    ) -> datetime | None:
+        """Decide when a failed issue is tried again.
+
+        Args:
+            error_class: RATE_LIMITED, UNKNOWN, PERMANENT or a classify_failure class
+            attempt: Failed attempts so far, including this one (1-based)
+            wait_seconds: Wait advertised by Traycer, if any
+            now: Current time (defaults to now, in UTC)
+
+        Returns:
+            Retry time, or None if the issue should be dead-lettered
+        """
+        schedule = self.schedule(error_class)
+        if attempt >= schedule.max_attempts:
+            return None
+        delay = schedule.delay(attempt, wait_seconds, self.rng)
+        return (now or datetime.now(UTC)) + timedelta(seconds=delay)
+
+
+def _class_settings(name: str) -> dict[str, int]:
+    """Parse a 'class=value,...' setting; 'transient' covers every transient class."""
+    settings = parse_weights(os.getenv(name))
+    if "transient" in settings:
+        value = settings.pop("transient")
+        for error_class in TRANSIENT_CLASSES:
+            settings.setdefault(error_class, value)
+    return settings
+
+
+def retry_policy_from_env() -> RetryPolicy:
+    """Build the deployment's retry policy from environment variables.
+
+    Reads:
+        CODEFRAME_RETRY_MAX_ATTEMPTS: Attempts per error class before dead-lettering,
+            e.g. "rate_limited=5,unknown=3,transient=4,permanent=1"
+        CODEFRAME_RETRY_BASE_SECONDS: First backoff delay per error class,
+            e.g. "unknown=600,transient=60"
+        CODEFRAME_RETRY_JITTER: Jitter fraction for backoff delays (default: 0.25)
+
+    Returns:
+        Policy with Traycer-wait-aware rate limits, backoff for unknown results
+        and transient errors, and immediate dead-lettering of permanent errors
+    """
+    attempts = _class_settings("CODEFRAME_RETRY_MAX_ATTEMPTS")
+    base = _class_settings("CODEFRAME_RETRY_BASE_SECONDS")
+    jitter = float(os.getenv("CODEFRAME_RETRY_JITTER", "0.25"))
+
+    def backoff(error_class: str, max_attempts: int, base_seconds: float) -> Backoff:
+        return Backoff(
+            max_attempts=attempts.get(error_class, max_attempts),
+            base_seconds=base.get(error_class, base_seconds),
+            jitter=jitter,
+        )
+
+    schedules = {
+        RATE_LIMITED: RateLimitSchedule(max_attempts=attempts.get(RATE_LIMITED, 3)),
+        # Traycer may just be slow to reply; give it a few minutes, then longer
+        UNKNOWN: backoff(UNKNOWN, 3, 600),
+        PERMANENT: backoff(PERMANENT, 1, 3600),
+        # An auth failure needs an operator; don't retry before they could act
+        "auth": backoff("auth", 3, 1800),
+    }
+    for error_class in ("server", "network", "abuse", "other"):
+        schedules[error_class] = backoff(error_class, 4, 120)
+    return RetryPolicy(schedules)
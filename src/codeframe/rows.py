@@ -0,0 +1,224 @@
+"""Compact typed rows for large query results, and timestamp storage.
+
+`Database` methods return plain dicts by default. Hot paths that scan many rows
+(slot calculation, dashboard) can ask for typed records instead: NamedTuples
+with no per-row dict. Records also support `record["column"]` and
+`dict(record)`, so they can stand in for the dict rows existing callers expect.
+
+Timestamps are stored as integer Unix seconds in columns declared `EPOCH`, so
+SQL compares integers on its indexes. Conversion happens only on connections
+opened by `Database` (`EpochConnection`), never through sqlite3's process-wide
+adapter and converter registries: datetime parameters become epoch seconds
+(naive values are local time, as in `datetime.timestamp`), and the row
+factories turn EPOCH, BOOLEAN and DATE columns back into aware UTC datetimes,
+bools and dates. Columns are recognized by name, so each of these names is
+used with a single declared type across the schema.
+"""
+
+import sqlite3
+from collections.abc import Callable, Iterable, Mapping
+from datetime import UTC, date, datetime
+from typing import Any, NamedTuple, TypeVar
+
+
+def _convert_epoch(value: Any) -> datetime:
+    """Read an EPOCH column (integer Unix seconds) as an aware UTC datetime."""
+    return datetime.fromtimestamp(int(value), UTC)
+
+
+def _convert_boolean(value: Any) -> bool:
+    """Read a BOOLEAN column stored as 0/1."""
+    return bool(value)
+
+
+def _convert_date(value: Any) -> date:
+    """Read a DATE column ('2026-01-01')."""
+    return date.fromisoformat(value)
+
+
+# Converters by column name (or alias of a plain column reference)
+EPOCH_COLUMNS = frozenset(
+    {
+        "added_at",
+        "claimed_until",
+        "commented_at",
+        "created_at",
+        "dead_at",
+        "issue_created_at",
+        "last_served_at",
+        "next_retry_at",
+        "opened_at",
+        "probe_until",
+        "processed_at",
+        "rate_limited_at",
+        "synced_at",
+        "timestamp",
+        "updated_at",
+        "window_started_at",
+    }
+)
+CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    **dict.fromkeys(EPOCH_COLUMNS, _convert_epoch),
+    "success": _convert_boolean,
+    "day": _convert_date,
+}
+
+
+def _adapt_value(value: Any) -> Any:
+    """Store a datetime parameter as integer Unix seconds."""
+    return int(value.timestamp()) if isinstance(value, datetime) else value
+
+
+def _adapt(parameters: Any) -> Any:
+    """Replace datetime query parameters with integer Unix seconds."""
+    if isinstance(parameters, Mapping):
+        return {key: _adapt_value(value) for key, value in parameters.items()}
+    return [_adapt_value(value) for value in parameters]
+
+
+class EpochCursor(sqlite3.Cursor):
+    """Cursor that stores datetime parameters as epoch seconds."""
+
+    _described: Any = None
+    _converters: list[tuple[int, Callable[[Any], Any]]] = []
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "EpochCursor":
+        return super().execute(sql, _adapt(parameters))
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> "EpochCursor":
+        return super().executemany(sql, (_adapt(parameters) for parameters in seq_of_parameters))
+
+    def converters(self) -> list[tuple[int, Callable[[Any], Any]]]:
+        """(index, converter) pairs for the current result's typed columns."""
+        description = self.description
+        if description is not self._described:
+            self._described = description
+            self._converters = [
+                (index, CONVERTERS[column[0]])
+                for index, column in enumerate(description or ())
+                if column[0] in CONVERTERS
+            ]
+        return self._converters
+
+
+class EpochConnection(sqlite3.Connection):
+    """Connection whose cursors are EpochCursors (pass as sqlite3.connect's factory)."""
+
+    def cursor(self, factory: type[sqlite3.Cursor] = EpochCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _convert(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Apply column converters to a raw result row."""
+    converters = cursor.converters() if isinstance(cursor, EpochCursor) else ()
+    if not converters:
+        return row
+    values = list(row)
+    for index, convert in converters:
+        if values[index] is not None:
+            values[index] = convert(values[index])
+    return tuple(values)
+
+
+def dict_row(cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> sqlite3.Row:
+    """sqlite3 row factory building converted `sqlite3.Row`s (the default for Database)."""
+    return sqlite3.Row(cursor, _convert(cursor, row))
+
+
+RecordT = TypeVar("RecordT", bound=tuple)
+
+
+def _getitem(self: tuple, key: Any) -> Any:
+    if isinstance(key, str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    return tuple.__getitem__(self, key)
+
+
+def _get(self: tuple, key: str, default: Any = None) -> Any:
+    return getattr(self, key, default) if key in self._fields else default
+
+
+def _keys(self: tuple) -> tuple[str, ...]:
+    return self._fields
+
+
+def record(cls: type[RecordT]) -> type[RecordT]:
+    """Make a NamedTuple row type readable like a dict row (row['column'], dict(row))."""
+    cls.__getitem__ = _getitem
+    cls.get = _get
+    cls.keys = _keys
+    return cls
+
+
+def columns(cls: type[tuple]) -> str:
+    """Column list for a SELECT whose rows build this record type."""
+    return ", ".join(cls._fields)
+
+
+def row_factory(cls: type[RecordT]) -> Callable[[sqlite3.Cursor, tuple[Any, ...]], RecordT]:
+    """sqlite3 row factory building records from `SELECT {columns(cls)}` rows."""
+    make = cls._make
+    return lambda cursor, row: make(_convert(cursor, row))
+
+
+@record
+class ProcessingRecord(NamedTuple):
+    """Row of `processing_history`; processed_at is aware UTC."""
+
+    id: int
+    repo_name: str
+    issue_number: int
+    processed_at: datetime
+    success: bool
+    rate_limit_message: str | None
+    rate_limit_seconds: int | None
+    account: str | None
+    outcome: str | None  # None for attempts logged before outcomes were tracked
+
+
+@record
+class ErrorRecord(NamedTuple):
+    """Row of `error_log`; timestamp is aware UTC."""
+
+    id: int
+    timestamp: datetime
+    error_type: str
+    error_message: str
+    repo_name: str | None
+    issue_number: int | None
+
+
+@record
+class MirroredIssue(NamedTuple):
+    """Row of `mirror_issues`, an open issue; timestamps are aware UTC."""
+
+    repo_name: str
+    issue_number: int
+    title: str
+    assignees: str  # Comma-separated logins
+    labels: str  # Comma-separated names
+    created_at: datetime
+    updated_at: datetime
+
+
+@record
+class MirroredComment(NamedTuple):
+    """Row of `mirror_comments`; timestamps are aware UTC."""
+
+    comment_id: int
+    repo_name: str
+    issue_number: int
+    author: str
+    created_at: datetime
+    updated_at: datetime
+    kind: str | None  # Classification of Traycer comments, None for others
+    wait_seconds: int | None
@@ -1,15 +1,26 @@
 """Repository scanner to find rate-limited Traycer AI issues."""
 
-import re
-from datetime import datetime, timedelta
-from typing import NamedTuple
+from __future__ import annotations
 
-from github import Auth, Github
-from github.Issue import Issue
-from github.IssueComment import IssueComment
-from github.Repository import Repository
+import json
+from datetime import UTC, datetime, timedelta
+from fnmatch import fnmatch
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
 
+from .comment_parser import RATE_LIMITED
 from .database import Database
+from .mirror import GitHubMirror
+from .rate_budget import RateBudgetExceededError
+from .token_pool import TokenPool, tokens_from_env
+from .tracing import JsonLinesSink, Tracer, profiled
+
+if TYPE_CHECKING:
+    # PyGithub takes ~0.25s to import; load it only once a client is needed
+    from github import Github
+    from github.AuthenticatedUser import AuthenticatedUser
+    from github.Issue import Issue
+    from github.Repository import Repository
 
 
 class RateLimitInfo(NamedTuple):
@@ -20,51 +31,188 @@ class RateLimitInfo(NamedTuple):
     message: str
 
 
+class RepoScope(NamedTuple):
+    """Which repositories a scan covers."""
+
+    repos: tuple[str, ...] = ()  # Explicit owner/repo names; skips enumeration entirely
+    include: tuple[str, ...] = ()  # Glob patterns a repo name must match (any)
+    exclude: tuple[str, ...] = ()  # Glob patterns that drop a repo name
+    traycer_active_only: bool = True  # Only repos with open issues Traycer commented on
+    refresh_active: bool = False  # Ignore the cached Traycer-active set
+
+    def matches(self, repo_name: str) -> bool:
+        """Check a repo name against the include/exclude globs.
+
+        Args:
+            repo_name: Repository full name (owner/repo)
+
+        Returns:
+            True if the repo is in scope
+        """
+        if self.include and not any(fnmatch(repo_name, pattern) for pattern in self.include):
+            return False
+        return not any(fnmatch(repo_name, pattern) for pattern in self.exclude)
+
+
 class IssueScanner:
     """Scans GitHub repositories for Traycer AI rate-limited issues."""
 
     TRAYCER_BOT_LOGIN = "traycerai[bot]"
-    # Updated pattern to handle blockquote format: "> [!WARNING]\n> Rate limit exceeded..."
-    RATE_LIMIT_PATTERN = re.compile(
-        r"Rate limit exceeded\.\s+Please try after (\d+) seconds\.", re.MULTILINE | re.DOTALL
-    )
     RETRY_BUFFER_MINUTES = 2  # Add 2 minutes buffer to 30-minute intervals
-
-    def __init__(self, github_token: str, db: Database):
+    ACTIVE_REPOS_CACHE_KEY = "traycer_active_open_repos"  # Open issues only
+    ACTIVE_REPOS_TTL_HOURS = 24
+    SEARCH_RESULT_CAP = 1000  # GitHub search never returns more than this
+
+    def __init__(
+        self,
+        github_token: str,
+        db: Database,
+        tracer: Tracer | None = None,
+        tokens: list[str] | None = None,
+    ):
         """Initialize scanner with GitHub token and database.
 
         Args:
             github_token: GitHub personal access token
             db: Database instance
+            tracer: Optional tracer (defaults to the database's tracer)
+            tokens: Token pool to rotate through, main token first (defaults to
+                github_token alone)
         """
-        auth = Auth.Token(github_token)
-        self.github = Github(auth=auth)
         self.db = db
-        self.user = self.github.get_user()
+        self.tracer = tracer or db.tracer
+        # 100 per page (the API maximum) cuts paginated listing calls by ~3x
+        self.pool = TokenPool(db, "scanner", tokens or [github_token], per_page=100)
+        self.mirror = GitHubMirror(db, self.pool, self.TRAYCER_BOT_LOGIN, self.tracer)
+
+    @cached_property
+    def github(self) -> Github:
+        """GitHub client of the token pool, created on first use."""
+        return self.pool.github
+
+    @cached_property
+    def user(self) -> AuthenticatedUser:
+        """Authenticated user, fetched on first use."""
+        return self.pool.call("github.get_user", lambda span: self.github.get_user())
+
+    def scan_all_repos(self, scope: RepoScope | None = None) -> tuple[int, int]:
+        """Scan owned repositories for rate-limited issues.
 
-    def scan_all_repos(self) -> tuple[int, int]:
-        """Scan all owned repositories for rate-limited issues.
+        By default only repos with open issues Traycer has commented on are
+        scanned (see get_traycer_active_repos), so scan cost follows Traycer
+        usage rather than the total number of repos. Stops early, leaving remaining repos for the
+        next scan, if the shared API budget runs out before the quota resets.
+
+        Args:
+            scope: Repository filter (defaults to all Traycer-active owned repos)
 
         Returns:
             Tuple of (repos_scanned, issues_queued)
         """
+        scope = scope or RepoScope()
         repos_scanned = 0
         issues_queued = 0
 
-        for repo in self.user.get_repos():
-            # Skip forks - only scan owned repos
-            if repo.fork:
-                continue
+        try:
+            repos = self._list_repos(scope)
 
-            # Skip repos without issues enabled
-            if not repo.has_issues:
-                continue
+            for repo in repos:
+                # Skip forks - only scan owned repos
+                if repo.fork:
+                    continue
+
+                # Skip repos without issues enabled
+                if not repo.has_issues:
+                    continue
 
-            repos_scanned += 1
-            issues_queued += self._scan_repo(repo)
+                repos_scanned += 1
+                with self.tracer.span("scanner.scan_repo", repo=repo.full_name):
+                    issues_queued += self._scan_repo(repo)
+
+        except RateBudgetExceededError as e:
+            self.db.log_error(error_type="rate_budget", error_message=str(e))
+            print(f"Stopping scan early: {e}")
+
+        finally:
+            self.pool.flush()
 
         return repos_scanned, issues_queued
 
+    def _list_repos(self, scope: RepoScope) -> list[Repository]:
+        """Resolve a scope to repository objects.
+
+        Args:
+            scope: Repository filter
+
+        Returns:
+            Repositories to scan
+        """
+        if scope.repos:
+            return [
+                self.pool.call("github.get_repo", lambda span: self.github.get_repo(name))
+                for name in scope.repos
+            ]
+
+        if scope.traycer_active_only:
+            active = self.get_traycer_active_repos(scope.refresh_active)
+            if active is not None:
+                print(f"Traycer-active repositories: {len(active)}")
+                # Fetch just those, so calls scale with Traycer-using repos
+                return [
+                    self.pool.call("github.get_repo", lambda span: self.github.get_repo(name))
+                    for name in sorted(active)
+                    if scope.matches(name)
+                ]
+
+        repos: list[Repository] = self.pool.fetch_all("github.get_repos", self.user.get_repos())
+        return [repo for repo in repos if scope.matches(repo.full_name)]
+
+    def get_traycer_active_repos(self, refresh: bool = False) -> set[str] | None:
+        """Find the user's repos with open issues Traycer commented on, with one search.
+
+        Closed issues are left out: they are never scanned, and counting them
+        would push active users past the search result cap, which disables the
+        filter.
+
+        The result is cached in the database for ACTIVE_REPOS_TTL_HOURS.
+
+        Args:
+            refresh: Ignore the cached set
+
+        Returns:
+            Set of repo full names, or None if the search was truncated at the
+            result cap (the set would be incomplete, so nothing should be filtered)
+        """
+        if not refresh:
+            cached = self.db.get_cached(
+                self.ACTIVE_REPOS_CACHE_KEY, max_age_seconds=self.ACTIVE_REPOS_TTL_HOURS * 3600
+            )
+            if cached is not None:
+                self.tracer.count("cache_hits")
+                repos = json.loads(cached)
+                return None if repos is None else set(repos)
+
+        query = f"commenter:{self.TRAYCER_BOT_LOGIN} user:{self.user.login} is:issue is:open"
+
+        results = self.github.search_issues(query)
+        repos: set[str] | None = set()
+        seen = 0
+        for page in self.pool.pages("github.search_issues", results, resource="search"):
+            if results.totalCount > self.SEARCH_RESULT_CAP:
+                repos = None
+                break
+            for issue in page:
+                # repository_url is part of the search result; .repository would fetch
+                repos.add(issue.repository_url.split("/repos/", 1)[1])
+            seen += len(page)
+            if seen >= results.totalCount:
+                break
+
+        self.db.set_cached(
+            self.ACTIVE_REPOS_CACHE_KEY, json.dumps(None if repos is None else sorted(repos))
+        )
+        return repos
+
     def _scan_repo(self, repo: Repository) -> int:
         """Scan a single repository for rate-limited issues.
 
@@ -78,16 +226,29 @@ class IssueScanner:
 
         try:
             # Get all open issues
-            for issue in repo.get_issues(state="open"):
+            issues: list[Issue] = self.pool.fetch_all(
+                "github.get_issues", repo.get_issues(state="open")
+            )
+
+            for issue in issues:
                 # Skip pull requests
                 if issue.pull_request:
                     continue
 
-                rate_limit_info = self._check_for_rate_limit(issue)
+                rate_limit_info = self._check_for_rate_limit(repo.full_name, issue)
                 if rate_limit_info:
-                    self._queue_issue(repo, issue, rate_limit_info)
+                    self._queue_issue(
+                        repo.full_name,
+                        issue.number,
+                        rate_limit_info,
+                        [label.name for label in issue.labels],
+                        issue.created_at,
+                    )
                     issues_queued += 1
 
+        except RateBudgetExceededError:
+            raise
+
         except Exception as e:
             self.db.log_error(
                 error_type="scan_error",
@@ -97,49 +258,74 @@ class IssueScanner:
 
         return issues_queued
 
-    def _check_for_rate_limit(self, issue: Issue) -> RateLimitInfo | None:
-        """Check if an issue has a Traycer rate limit comment.
+    def _check_for_rate_limit(self, repo_name: str, issue: Issue) -> RateLimitInfo | None:
+        """Check if an issue's latest Traycer comment is a rate limit message.
+
+        Comments are read through the mirror, so only comments updated since the
+        previous check are fetched and classified (and added to the search index).
 
         Args:
+            repo_name: Repository full name (owner/repo)
             issue: GitHub issue object
 
         Returns:
             RateLimitInfo if rate limit found, None otherwise
         """
         try:
-            # Get all comments, most recent first
-            comments = list(issue.get_comments())
-            comments.reverse()
-
-            for comment in comments:
-                if comment.user.login == self.TRAYCER_BOT_LOGIN:
-                    match = self.RATE_LIMIT_PATTERN.search(comment.body)
-                    if match:
-                        seconds = int(match.group(1))
-                        return RateLimitInfo(
-                            seconds=seconds,
-                            comment_created_at=comment.created_at,
-                            message=comment.body,
-                        )
+            # Only the latest Traycer comment counts: an analysis posted after a
+            # rate-limit comment means the issue was handled
+            latest = self.mirror.refresh_latest_comment(repo_name, issue)
+            if latest is not None and latest.kind == RATE_LIMITED:
+                return RateLimitInfo(
+                    seconds=latest.wait_seconds,
+                    comment_created_at=latest.created_at,
+                    message="",  # The mirror keeps no comment bodies
+                )
+
+        except RateBudgetExceededError:
+            raise
 
         except Exception as e:
             self.db.log_error(
                 error_type="comment_check_error",
                 error_message=f"Error checking comments on issue #{issue.number}: {str(e)}",
-                repo_name=issue.repository.full_name,
+                repo_name=repo_name,
                 issue_number=issue.number,
             )
 
         return None
 
-    def _queue_issue(self, repo: Repository, issue: Issue, rate_limit_info: RateLimitInfo) -> None:
+    def _queue_issue(
+        self,
+        repo_name: str,
+        issue_number: int,
+        rate_limit_info: RateLimitInfo,
+        labels: list[str],
+        created_at: datetime | None,
+    ) -> None:
         """Add an issue to the queue with calculated retry time.
 
         Args:
-            repo: Repository object
-            issue: Issue object
+            repo_name: Repository full name (owner/repo)
+            issue_number: Issue number
             rate_limit_info: Parsed rate limit information
+            labels: Issue label names
+            created_at: When the issue was opened
         """
+        # Already re-analyzed after this rate-limit comment; re-queueing would waste a slot
+        if self.db.was_processed_since(
+            repo_name, issue_number, rate_limit_info.comment_created_at
+        ):
+            print(f"Skipping {repo_name}#{issue_number} (already re-analyzed)")
+            return
+
+        # Given up on since this rate-limit comment; `cf issues requeue` brings it back
+        if self.db.was_dead_lettered_since(
+            repo_name, issue_number, rate_limit_info.comment_created_at
+        ):
+            print(f"Skipping {repo_name}#{issue_number} (dead-lettered)")
+            return
+
         # Calculate next retry time
         # Use comment timestamp + rate limit seconds + buffer
         retry_time = rate_limit_info.comment_created_at + timedelta(
@@ -149,37 +335,311 @@ class IssueScanner:
 
         # Add to queue
         added = self.db.add_issue(
-            repo_name=repo.full_name, issue_number=issue.number, next_retry_at=retry_time
+            repo_name=repo_name,
+            issue_number=issue_number,
+            next_retry_at=retry_time,
+            labels=labels,
+            created_at=created_at,
+            rate_limited_at=rate_limit_info.comment_created_at,
         )
 
         # Log the finding
         action = "Added" if added else "Updated"
         print(
-            f"{action} {repo.full_name}#{issue.number} to queue "
+            f"{action} {repo_name}#{issue_number} to queue "
             f"(retry at {retry_time.isoformat()})"
         )
 
 
+class SearchScanner(IssueScanner):
+    """Fast-path scanner driven by GitHub issue search instead of walking every repo.
+
+    One search finds open issues in the user's repos where Traycer commented and
+    that were updated since the last search scan; only those candidates' comments
+    are inspected. Search results stop at 1000 items, so an over-full date range is
+    split in half until every piece fits. If a range cannot be split further, the
+    scan falls back to the full repository walk.
+    """
+
+    LAST_SCAN_CACHE_KEY = "search_scan_last_run"
+    DEFAULT_LOOKBACK_DAYS = 30
+    OVERLAP_MINUTES = 60  # Re-cover the end of the previous window to absorb index lag
+    MIN_SPLIT_MINUTES = 10  # Smallest date range worth splitting further
+
+    def scan_all_repos(self, scope: RepoScope | None = None) -> tuple[int, int]:
+        """Scan recently updated Traycer issues found via search.
+
+        Args:
+            scope: Repository filter (explicit repos use the full walk)
+
+        Returns:
+            Tuple of (repos_scanned, issues_queued)
+        """
+        scope = scope or RepoScope()
+        if scope.repos:
+            return super().scan_all_repos(scope)
+
+        until = datetime.now(UTC)
+        since = self._scan_start(until)
+
+        try:
+            candidates = self._search_candidates(since, until)
+        except RateBudgetExceededError as e:
+            self.db.log_error(error_type="rate_budget", error_message=str(e))
+            print(f"Stopping scan early: {e}")
+            self.pool.flush()
+            return 0, 0
+
+        if candidates is None:
+            print("Search results truncated at the 1000-item cap; falling back to full scan")
+            return super().scan_all_repos(scope)
+
+        print(f"Search candidates since {since.isoformat()}: {len(candidates)}")
+
+        repos_seen: set[str] = set()
+        issues_queued = 0
+        try:
+            for issue in candidates:
+                repo_name = issue.repository_url.split("/repos/", 1)[1]
+                if not scope.matches(repo_name):
+                    continue
+                repos_seen.add(repo_name)
+
+                rate_limit_info = self._check_for_rate_limit(repo_name, issue)
+                if rate_limit_info:
+                    self._queue_issue(
+                        repo_name,
+                        issue.number,
+                        rate_limit_info,
+                        [label.name for label in issue.labels],
+                        issue.created_at,
+                    )
+                    issues_queued += 1
+
+            self.db.set_cached(self.LAST_SCAN_CACHE_KEY, until.isoformat())
+
+        except RateBudgetExceededError as e:
+            self.db.log_error(error_type="rate_budget", error_message=str(e))
+            print(f"Stopping scan early: {e}")
+
+        finally:
+            self.pool.flush()
+
+        return len(repos_seen), issues_queued
+
+    def _scan_start(self, until: datetime) -> datetime:
+        """Start of the search window: the previous search scan, minus overlap."""
+        last_run = self.db.get_cached(
+            self.LAST_SCAN_CACHE_KEY, max_age_seconds=self.DEFAULT_LOOKBACK_DAYS * 86400
+        )
+        if last_run is None:
+            return until - timedelta(days=self.DEFAULT_LOOKBACK_DAYS)
+        return datetime.fromisoformat(last_run) - timedelta(minutes=self.OVERLAP_MINUTES)
+
+    def _search_candidates(self, since: datetime, until: datetime) -> list[Issue] | None:
+        """Search open Traycer-commented issues updated in a date range.
+
+        Args:
+            since: Range start (UTC)
+            until: Range end (UTC)
+
+        Returns:
+            Candidate issues (deduplicated), or None if the range holds more than
+            the search cap and cannot be split further
+        """
+        date_format = "%Y-%m-%dT%H:%M:%SZ"
+        query = (
+            f"commenter:{self.TRAYCER_BOT_LOGIN} user:{self.user.login} is:issue is:open "
+            f"updated:{since.strftime(date_format)}..{until.strftime(date_format)}"
+        )
+
+        results = self.github.search_issues(query, sort="updated", order="asc")
+        candidates: list[Issue] | None = []
+        for page in self.pool.pages("github.search_issues", results, resource="search"):
+            # The first page tells whether the range fits under the cap
+            if results.totalCount > self.SEARCH_RESULT_CAP:
+                candidates = None
+                break
+            candidates += page
+            if len(candidates) >= results.totalCount:
+                break
+        if candidates is not None:
+            return candidates
+
+        if until - since <= timedelta(minutes=self.MIN_SPLIT_MINUTES):
+            return None
+
+        middle = since + (until - since) / 2
+        older = self._search_candidates(since, middle)
+        newer = self._search_candidates(middle, until) if older is not None else None
+        if newer is None:
+            return None
+
+        # Range bounds are inclusive, so an issue can appear in both halves
+        seen = set()
+        merged = []
+        for issue in older + newer:
+            key = (issue.repository_url, issue.number)
+            if key not in seen:
+                seen.add(key)
+                merged.append(issue)
+        return merged
+
+
+class MirrorScanner(IssueScanner):
+    """Scanner that reads issues and comments from the local mirror (see mirror.py).
+
+    Each repo is synced incrementally, fetching only issues and comments that
+    changed since its previous scan, and rate-limited issues are then found with
+    a local query over the mirrored Traycer comments.
+    """
+
+    def _scan_repo(self, repo: Repository) -> int:
+        """Sync a repository into the mirror and queue its rate-limited issues.
+
+        Args:
+            repo: GitHub repository object
+
+        Returns:
+            Number of issues queued from this repo
+        """
+        try:
+            changed = self.mirror.sync_repo(repo)
+            self.tracer.count("mirror_changed_issues", changed)
+
+        except RateBudgetExceededError:
+            raise
+
+        except Exception as e:
+            self.db.log_error(
+                error_type="scan_error",
+                error_message=f"Error syncing repo {repo.full_name}: {str(e)}",
+                repo_name=repo.full_name,
+            )
+            return 0
+
+        issues_queued = 0
+        for row in self.db.get_latest_mirror_comments(repo.full_name, self.TRAYCER_BOT_LOGIN):
+            # Only the latest Traycer comment counts, as in _check_for_rate_limit
+            if row["kind"] != RATE_LIMITED:
+                continue
+            rate_limit_info = RateLimitInfo(
+                seconds=row["wait_seconds"],
+                comment_created_at=row["commented_at"],
+                message="",  # The mirror keeps no comment bodies
+            )
+            self._queue_issue(
+                repo.full_name,
+                row["issue_number"],
+                rate_limit_info,
+                [label for label in row["labels"].split(",") if label],
+                row["issue_created_at"],
+            )
+            issues_queued += 1
+
+        return issues_queued
+
+
 def main() -> None:
     """Main entry point for scanner script."""
+    import argparse
     import os
     import sys
 
+    parser = argparse.ArgumentParser(description="Scan repositories for rate-limited issues")
+    parser.add_argument(
+        "--repo",
+        action="append",
+        default=[],
+        metavar="REPO",
+        help="Scan only this repo (owner/repo); repeatable",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only scan repos matching GLOB (e.g. 'frankbria/*'); repeatable",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip repos matching GLOB; repeatable",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["walk", "search", "mirror"],
+        default="walk",
+        help="'walk' lists every repo and issue; 'search' inspects only recently "
+        "updated issues Traycer commented on; 'mirror' syncs changes into the local "
+        "mirror and scans it (default: walk)",
+    )
+    parser.add_argument(
+        "--all-repos",
+        action="store_true",
+        help="Scan every owned repo, not just those with open issues Traycer commented on",
+    )
+    parser.add_argument(
+        "--refresh-active",
+        action="store_true",
+        help="Rebuild the cached set of Traycer-active repos",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Append JSON-lines timing trace for this run to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Capture a cProfile of this run to FILE (pstats format)",
+    )
+    args = parser.parse_args()
+
     # Get GitHub token from environment
     github_token = os.getenv("GITHUB_TOKEN")
     if not github_token:
         print("Error: GITHUB_TOKEN environment variable not set", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        tokens = tokens_from_env(github_token)
+    except ValueError as e:
+        print(f"Error: CODEFRAME_GITHUB_TOKENS: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    scope = RepoScope(
+        repos=tuple(args.repo),
+        include=tuple(args.include),
+        exclude=tuple(args.exclude),
+        traycer_active_only=not args.all_repos,
+        refresh_active=args.refresh_active,
+    )
+    tracer = Tracer("scanner", JsonLinesSink(args.trace) if args.trace else None)
+
     # Initialize database and scanner
-    db = Database()
-    scanner = IssueScanner(github_token, db)
+    db = Database(tracer=tracer)
+    log_buffer = int(os.getenv("CODEFRAME_LOG_BUFFER", "0"))
+    if log_buffer:
+        db.buffer_logs(log_buffer)
 
-    # Scan all repos
+    # Scan repos in scope
     print("Scanning repositories for rate-limited Traycer issues...")
-    repos_scanned, issues_queued = scanner.scan_all_repos()
+    stats = {}
+    try:
+        with profiled(args.profile):
+            scanner_class = {"search": SearchScanner, "mirror": MirrorScanner}.get(
+                args.backend, IssueScanner
+            )
+            scanner = scanner_class(github_token, db, tokens=tokens)
+            repos_scanned, issues_queued = scanner.scan_all_repos(scope)
+        stats = {"repos_scanned": repos_scanned, "issues_queued": issues_queued}
+    finally:
+        tracer.close(**stats)
 
-    print(f"\nScan complete:")
+    print("\nScan complete:")
     print(f"  Repositories scanned: {repos_scanned}")
     print(f"  Issues queued: {issues_queued}")
 
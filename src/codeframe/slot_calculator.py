@@ -2,10 +2,13 @@
 
 import json
 import subprocess
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from typing import NamedTuple
 
 from .database import Database
+from .rate_budget import RateBudget, RateBudgetExceededError
+from .rows import ProcessingRecord
+from .tracing import traced
 
 
 class SlotStatus(NamedTuple):
@@ -23,13 +26,30 @@ class SlotCalculator:
     TOTAL_SLOTS = 15
     SLOT_RECHARGE_MINUTES = 30
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, account: str | None = None, primary: bool = True):
         """Initialize slot calculator.
 
         Args:
             db: Database instance
+            account: Traycer account whose slot bucket to model (None counts every
+                attempt against a single bucket)
+            primary: Whether this is the main account; it also owns attempts
+                logged without an account and absorbs detected external activity
         """
         self.db = db
+        self.account = account
+        self.primary = primary
+        self.tracer = db.tracer
+        self.budget = RateBudget(db, "slot_calculator")
+
+    def _get_history(self) -> list[ProcessingRecord]:
+        """Attempts from the last recharge window that used this bucket's slots."""
+        return self.db.get_recent_processing_history(
+            minutes=self.SLOT_RECHARGE_MINUTES,
+            typed=True,
+            account=self.account,
+            include_unattributed=self.primary,
+        )
 
     def _detect_external_traycer_activity(self) -> int:
         """Detect Traycer activity from external sources (not our processor).
@@ -42,38 +62,44 @@ class SlotCalculator:
         """
         try:
             # Calculate timestamp for 30 minutes ago in GitHub's date format
-            cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=self.SLOT_RECHARGE_MINUTES)
+            cutoff_time = datetime.now(UTC) - timedelta(minutes=self.SLOT_RECHARGE_MINUTES)
             # GitHub search uses format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ
             timestamp_filter = cutoff_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
             # Use gh search issues with commenter and updated filters
             # This searches across all accessible repositories
-            result = subprocess.run(
-                [
-                    "gh",
-                    "search",
-                    "issues",
-                    "--commenter",
-                    "traycerai[bot]",
-                    "--updated",
-                    f">={timestamp_filter}",
-                    "--json",
-                    "number",
-                    "--limit",
-                    "1000",  # GitHub max limit
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10,
-            )
+            with self.budget.track("gh.search_issues", resource="search") as span:
+                result = subprocess.run(
+                    [
+                        "gh",
+                        "search",
+                        "issues",
+                        "--commenter",
+                        "traycerai[bot]",
+                        "--updated",
+                        f">={timestamp_filter}",
+                        "--json",
+                        "number",
+                        "--limit",
+                        "1000",  # GitHub max limit
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=10,
+                )
+                span["bytes"] = len(result.stdout)
+                self.tracer.count("bytes", len(result.stdout))
+            self.budget.flush()
 
             # Parse search results
             search_results = json.loads(result.stdout)
             total_traycer_activity = len(search_results)
 
             # Get our own processing attempts from history
-            history = self.db.get_recent_processing_history(minutes=self.SLOT_RECHARGE_MINUTES)
+            history = self.db.get_recent_processing_history(
+                minutes=self.SLOT_RECHARGE_MINUTES, typed=True
+            )
             our_processing_attempts = len(history)
 
             # External activity = total activity - our attempts
@@ -81,6 +107,9 @@ class SlotCalculator:
 
             return external_activity
 
+        except RateBudgetExceededError:
+            # Search quota exhausted, assume no external activity (safe default)
+            return 0
         except subprocess.TimeoutExpired:
             # If API call times out, assume no external activity (safe default)
             return 0
@@ -91,6 +120,7 @@ class SlotCalculator:
             # If parsing fails, assume no external activity (safe default)
             return 0
 
+    @traced("slots.calculate_available_slots")
     def calculate_available_slots(self) -> SlotStatus:
         """Calculate how many processing slots are currently available.
 
@@ -105,16 +135,18 @@ class SlotCalculator:
             SlotStatus with current availability
         """
         # Get recent processing history (our attempts)
-        history = self.db.get_recent_processing_history(minutes=self.SLOT_RECHARGE_MINUTES)
+        history = self._get_history()
 
         # Calculate slots consumed by our processing attempts
         consumed_slots = self._calculate_consumed_slots(history)
 
-        # Detect external Traycer activity (other users triggering analyses)
-        external_activity = self._detect_external_traycer_activity()
+        # Detect external Traycer activity (other users triggering analyses);
+        # with several accounts it is charged to the primary bucket only
+        external_activity = self._detect_external_traycer_activity() if self.primary else 0
 
         # Total consumed = our attempts + external activity
-        # Note: external_activity is already net of our attempts (see _detect_external_traycer_activity)
+        # Note: external_activity is already net of our attempts
+        # (see _detect_external_traycer_activity)
         total_consumed = consumed_slots + external_activity
 
         # Available slots = total - consumed (can't go negative)
@@ -130,7 +162,7 @@ class SlotCalculator:
             next_slot_available_at=next_available,
         )
 
-    def _calculate_consumed_slots(self, history: list[dict]) -> int:
+    def _calculate_consumed_slots(self, history: list[ProcessingRecord]) -> int:
         """Calculate how many slots are currently consumed.
 
         This is the core business logic that determines our processing capacity.
@@ -148,23 +180,22 @@ class SlotCalculator:
         # - Handle clock skew between local time and GitHub API time
         # - Deduplicate multiple attempts on same issue within 30min window
 
-        # Use UTC to match SQLite CURRENT_TIMESTAMP
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        now = datetime.now(UTC)
         consumed = 0
 
         # Count all processing attempts in last 30 minutes
         for record in history:
-            # Parse timestamp (from SQLite, stored as UTC)
-            processed_at = datetime.fromisoformat(record["processed_at"])
+            # Stored as epoch seconds, read back as aware UTC
+            processed_at = record.processed_at
 
             # Check if within recharge window
             time_diff = now - processed_at
-            if time_diff >= timedelta(0) and time_diff <= timedelta(minutes=self.SLOT_RECHARGE_MINUTES):
+            if timedelta(0) <= time_diff <= timedelta(minutes=self.SLOT_RECHARGE_MINUTES):
                 consumed += 1
 
         return min(consumed, self.TOTAL_SLOTS)  # Cap at total slots
 
-    def _calculate_next_slot_time(self, history: list[dict]) -> datetime | None:
+    def _calculate_next_slot_time(self, history: list[ProcessingRecord]) -> datetime | None:
         """Calculate when the next slot will become available.
 
         Args:
@@ -179,17 +210,16 @@ class SlotCalculator:
         if not history:
             return None
 
-        # Use UTC to match database timestamps
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        now = datetime.now(UTC)
 
         # Find oldest processing attempt within the recharge window
         oldest_time = None
         for record in history:
-            processed_at = datetime.fromisoformat(record["processed_at"])
+            processed_at = record.processed_at
             time_diff = now - processed_at
 
             # Only consider attempts within recharge window
-            if time_diff >= timedelta(0) and time_diff <= timedelta(minutes=self.SLOT_RECHARGE_MINUTES):
+            if timedelta(0) <= time_diff <= timedelta(minutes=self.SLOT_RECHARGE_MINUTES):
                 if oldest_time is None or processed_at < oldest_time:
                     oldest_time = processed_at
 
@@ -198,6 +228,28 @@ class SlotCalculator:
 
         return None
 
+    def recharge_times(self, consumed_slots: int, now: datetime | None = None) -> list[datetime]:
+        """When each of the bucket's slots is next free.
+
+        Our attempts free their slot SLOT_RECHARGE_MINUTES after they were made.
+        Consumed slots they do not explain (external activity) are assumed used
+        just now; the remaining slots are free at `now`.
+
+        Args:
+            consumed_slots: Consumed slots reported by calculate_available_slots
+            now: Current time (defaults to now, in UTC)
+
+        Returns:
+            TOTAL_SLOTS times, earliest first
+        """
+        now = now or datetime.now(UTC)
+        window = timedelta(minutes=self.SLOT_RECHARGE_MINUTES)
+        ours = [r.processed_at + window for r in self._get_history()]
+        ours = [at for at in ours if at > now]
+        external = max(0, consumed_slots - len(ours))
+        free = max(0, self.TOTAL_SLOTS - len(ours) - external)
+        return sorted([now] * free + ours + [now + window] * external)[: self.TOTAL_SLOTS]
+
     def get_processing_window_size(self) -> int:
         """Determine how many issues can be processed in the current batch.
 
@@ -0,0 +1,340 @@
+"""Pool of GitHub tokens, rotated as their quotas run out.
+
+GitHub meters the REST API per user, so one token's hourly core limit caps how
+much a scan can cover. A pool spreads calls over several tokens (for extra
+quota they must belong to different users, e.g. bot or collaborator accounts
+with access to the same repositories). Each call goes out under the token with
+the most quota left; a 403/429 rate-limit response parks that token until its
+`Retry-After` or reset time and the call is retried under the next one.
+Calls that must act as a particular user (e.g. assigning an issue so the
+assignment is attributed to that account) pin its token with `using`.
+
+Per-token quota is kept by one `RateBudget` per token, persisted in
+`rate_limit_budget` under a hash of the token, so every cron job sees which
+tokens are spent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .database import Database
+from .rate_budget import BudgetSnapshot, RateBudget, RateBudgetExceededError
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.PaginatedList import PaginatedList
+
+T = TypeVar("T")
+
+
+def token_id(token: str) -> str:
+    """Stable, non-secret identifier for a token (stored instead of the token)."""
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+def tokens_from_env(token: str) -> list[str]:
+    """Build the token list from environment variables.
+
+    Reads CODEFRAME_GITHUB_TOKENS, e.g. "GITHUB_TOKEN_BOT,GITHUB_TOKEN_CI": the
+    names of environment variables holding extra tokens. The main token
+    (GITHUB_TOKEN) always comes first.
+
+    Args:
+        token: Main token
+
+    Returns:
+        Tokens, main token first, without duplicates
+
+    Raises:
+        ValueError: If a listed variable is not set
+    """
+    tokens = [token]
+    for name in os.getenv("CODEFRAME_GITHUB_TOKENS", "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        value = os.getenv(name)
+        if not value:
+            raise ValueError(f"{name} is not set")
+        tokens.append(value)
+    return list(dict.fromkeys(tokens))
+
+
+def rate_limit_wait(error: Exception) -> float | None:
+    """Seconds GitHub asked us to back off for, if `error` is a rate-limit rejection.
+
+    Args:
+        error: Exception raised by a GitHub call
+
+    Returns:
+        Seconds from `Retry-After`, else until `X-RateLimit-Reset` for an exhausted
+        primary limit, else SECONDARY_LIMIT_SECONDS; None for other errors
+    """
+    # Only reached after a request failed, so PyGithub is already loaded
+    from github import GithubException, RateLimitExceededException
+
+    if not isinstance(error, GithubException):
+        return None
+    if error.status != 429 and not isinstance(error, RateLimitExceededException):
+        return None
+
+    headers = {key.lower(): value for key, value in (error.headers or {}).items()}
+    if "retry-after" in headers:
+        return float(headers["retry-after"])
+    if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+        return max(0.0, float(headers["x-ratelimit-reset"]) - time.time())
+    return TokenPool.SECONDARY_LIMIT_SECONDS
+
+
+class TokenPool:
+    """GitHub tokens for one component, each call spent from the one with most quota.
+
+    Exposes the `RateBudget` interface (`track`, `check`, `flush`) so components
+    can use a pool wherever they used a single budget.
+    """
+
+    # GitHub asks for at least a minute's pause after a secondary rate limit
+    SECONDARY_LIMIT_SECONDS = 60
+    API_URL = "https://api.github.com"
+    SERVER_ERROR_RETRIES = 10  # As PyGithub's default retry
+
+    def __init__(self, db: Database, component: str, tokens: list[str], per_page: int = 30):
+        """Initialize token pool.
+
+        Args:
+            db: Database instance shared with other components
+            component: Calling component name (e.g. 'scanner', 'processor')
+            tokens: GitHub tokens, main token first
+            per_page: Page size for paginated listings
+
+        Raises:
+            ValueError: If no token is given
+        """
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self.db = db
+        self.component = component
+        self.tracer = db.tracer
+        self.tokens = list(dict.fromkeys(tokens))
+        self.budgets = [RateBudget(db, component, token_id(token)) for token in self.tokens]
+        self.per_page = per_page
+        self.current = 0
+        self.pinned: int | None = None  # Token index fixed by using(), if any
+
+    @cached_property
+    def github(self) -> Github:
+        """GitHub client signing requests with the current token, created on first use."""
+        from github import Auth, Github
+        from urllib3.util.retry import Retry
+
+        pool = self
+
+        class PoolAuth(Auth.Auth):
+            # Read per request: objects fetched through this client (repos,
+            # issues, paginated lists) follow the pool when it rotates
+            token_type = "token"
+
+            @property
+            def token(self) -> str:
+                return pool.tokens[pool.current]
+
+        # PyGithub's default GithubRetry sleeps through 403/429 rate limits inside
+        # the request (up to an hour, until X-RateLimit-Reset). Those responses
+        # must reach call() instead, to park the token and rotate to the next;
+        # only server errors are retried in place.
+        retry = Retry(
+            total=self.SERVER_ERROR_RETRIES,
+            status_forcelist=list(range(500, 600)),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"GET", "POST"},
+            respect_retry_after_header=False,
+        )
+        return Github(base_url=self.API_URL, auth=PoolAuth(), per_page=self.per_page, retry=retry)
+
+    @property
+    def budget(self) -> RateBudget:
+        """Budget of the current token."""
+        return self.budgets[self.current]
+
+    def _rank(self, budget: RateBudget, resource: str, cost: int) -> tuple[float, float]:
+        """Sort key: tokens that can spend now first, then most quota left."""
+        snap: BudgetSnapshot | None = budget.snapshot(resource)
+        fresh = snap is None or snap.reset_at <= time.time()
+        remaining = float("inf") if fresh else snap.remaining
+        return budget.check(resource, cost), -remaining
+
+    def select(self, resource: str = "core", cost: int = 1) -> RateBudget:
+        """Make the token with the most usable quota current.
+
+        Args:
+            resource: Rate-limit resource
+            cost: Number of calls about to be made
+
+        Returns:
+            Budget of the selected token
+        """
+        if self.pinned is not None:
+            self.current = self.pinned
+            return self.budget
+        ranks = [self._rank(budget, resource, cost) for budget in self.budgets]
+        best = min(range(len(self.budgets)), key=ranks.__getitem__)
+        if best != self.current:
+            self.tracer.count("token_rotations")
+            self.current = best
+        return self.budget
+
+    def check(self, resource: str = "core", cost: int = 1) -> float:
+        """Seconds until some token can spend `cost` calls on a resource.
+
+        Args:
+            resource: Rate-limit resource
+            cost: Number of calls about to be made
+
+        Returns:
+            0 if a token can cover the calls now, otherwise the shortest wait
+        """
+        return min(budget.check(resource, cost) for budget in self.budgets)
+
+    @contextmanager
+    def using(self, token: str) -> Generator[RateBudget, None, None]:
+        """Sign every call made inside the block with one token, without rotating.
+
+        Objects fetched inside the block keep following the pool afterwards, so
+        calls that must be made as this token's user belong inside it.
+
+        Args:
+            token: Token to pin; added to the pool if it is not part of it yet
+
+        Yields:
+            Budget of the pinned token
+        """
+        if token not in self.tokens:
+            self.tokens.append(token)
+            self.budgets.append(RateBudget(self.db, self.component, token_id(token)))
+        previous = self.pinned
+        self.pinned = self.tokens.index(token)
+        self.current = self.pinned
+        try:
+            yield self.budget
+        finally:
+            self.pinned = previous
+
+    @contextmanager
+    def track(
+        self, name: str, github: Any | None = None, resource: str = "core"
+    ) -> Generator[dict[str, Any], None, None]:
+        """Gate, time and account one GitHub call under the best token.
+
+        A rate-limit rejection parks the token it came from before propagating.
+
+        Args:
+            name: Span name for tracing (e.g. 'github.get_issue')
+            github: The pool's client (or None if headers are not visible)
+            resource: Rate-limit resource the call counts against
+
+        Yields:
+            Mutable span attribute dict
+
+        Raises:
+            RateBudgetExceededError: If every token is spent until a reset more than
+                MAX_THROTTLE_SECONDS away
+        """
+        budget = self.select(resource)
+        try:
+            with budget.track(name, github, resource) as span:
+                yield span
+        except Exception as e:
+            wait = rate_limit_wait(e)
+            if wait is None:
+                raise
+            budget.defer(resource, wait)
+            raise
+
+    def call(self, name: str, fn: Callable[[dict[str, Any]], T], resource: str = "core") -> T:
+        """Run a GitHub call, retrying under another token if it is rate limited.
+
+        Args:
+            name: Span name for tracing
+            fn: Makes the call through `self.github`; receives the span attribute dict
+            resource: Rate-limit resource the call counts against
+
+        Returns:
+            Whatever `fn` returns
+
+        Raises:
+            RateBudgetExceededError: If every token is spent until a reset more than
+                MAX_THROTTLE_SECONDS away, or is still rejected after its wait
+        """
+        # One retry per token: rotation tries each of them, and the last retry
+        # waits out a short Retry-After when every token is parked (a pinned
+        # token gets only that wait)
+        retries = len(self.tokens) if self.pinned is None else 1
+        while True:
+            try:
+                with self.track(name, self.github, resource) as span:
+                    return fn(span)
+            except Exception as e:
+                if rate_limit_wait(e) is None:
+                    raise
+                if not retries:
+                    raise RateBudgetExceededError(
+                        f"GitHub keeps rate limiting {name} for {self.component} on every token"
+                    ) from e
+                retries -= 1
+                self.tracer.count("rate_limit_retries")
+
+    def pages(
+        self, name: str, listing: PaginatedList[T], resource: str = "core"
+    ) -> Iterator[list[T]]:
+        """Fetch a paginated listing one page per call.
+
+        Each page is gated, counted and retried on its own, so a listing of N
+        pages spends N calls of budget, and a rate limit on page k retries page
+        k (under the next token) rather than the whole listing.
+
+        Args:
+            name: Span name for tracing (e.g. 'github.get_issues')
+            listing: Lazy PyGithub listing made through `self.github`
+            resource: Rate-limit resource each page counts against
+
+        Yields:
+            Pages in order, until a short page ends the listing
+        """
+        page = 0
+        while True:
+
+            def get_page(span: dict[str, Any]) -> list[T]:
+                items = listing.get_page(page)
+                span["page"] = page
+                span["items"] = len(items)
+                return items
+
+            items = self.call(name, get_page, resource)
+            yield items
+            if len(items) < self.per_page:
+                return
+            page += 1
+
+    def fetch_all(self, name: str, listing: PaginatedList[T], resource: str = "core") -> list[T]:
+        """Fetch every item of a paginated listing, one call per page (see `pages`).
+
+        Args:
+            name: Span name for tracing
+            listing: Lazy PyGithub listing made through `self.github`
+            resource: Rate-limit resource each page counts against
+
+        Returns:
+            All items, in listing order
+        """
+        return [item for items in self.pages(name, listing, resource) for item in items]
+
+    def flush(self) -> None:
+        """Persist call counts and quota snapshots of every token."""
+        for budget in self.budgets:
+            budget.flush()
@@ -0,0 +1,225 @@
+"""Span/timer instrumentation and JSON-lines trace output for scanner and processor runs."""
+
+import cProfile
+import functools
+import json
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+class JsonLinesSink:
+    """Appends trace events to a JSON-lines file, one event per line."""
+
+    def __init__(self, path: str | Path):
+        """Initialize sink.
+
+        Args:
+            path: File to append trace events to
+        """
+        self.path = Path(path)
+
+    def write(self, events: Iterable[dict[str, Any]]) -> None:
+        """Write a batch of events.
+
+        Args:
+            events: Trace events to append
+        """
+        with self.path.open("a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + "\n")
+
+
+class Tracer:
+    """Collects timing spans and counters for a single run.
+
+    Spans and counters are kept in memory and handed to the sink on close(), so
+    instrumentation never adds I/O inside the hot loops. A tracer without a sink
+    only aggregates, which keeps the disabled path close to free.
+    """
+
+    def __init__(self, component: str = "codeframe", sink: JsonLinesSink | None = None):
+        """Initialize tracer.
+
+        Args:
+            component: Name of the component owning this run (e.g. 'processor')
+            sink: Destination for trace events, or None to disable output
+        """
+        self.component = component
+        self.sink = sink
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(UTC)
+        self.spans: list[dict[str, Any]] = []
+        self.counters: dict[str, int] = defaultdict(int)
+        self._start = time.perf_counter()
+        self._closed = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded for output."""
+        return self.sink is not None
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Generator[dict[str, Any], None, None]:
+        """Time a block of code.
+
+        The yielded dict can be updated inside the block to attach attributes
+        (e.g. bytes transferred) to the span.
+
+        Args:
+            name: Span name, dotted by layer (e.g. 'github.get_issue', 'db.add_issue')
+            **attrs: Initial span attributes
+
+        Yields:
+            Mutable attribute dict for the span
+        """
+        self.counters[f"calls.{name}"] += 1
+        if name.startswith("github.") or name.startswith("gh."):
+            self.counters["api_calls"] += 1
+
+        if not self.enabled:
+            yield attrs
+            return
+
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attrs
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            event = {
+                "type": "span",
+                "run_id": self.run_id,
+                "name": name,
+                "offset_ms": round((start - self._start) * 1000, 3),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            }
+            if attrs:
+                event["attrs"] = attrs
+            if error:
+                event["error"] = error
+            self.spans.append(event)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a run counter (e.g. 'bytes', 'cache_hits').
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        self.counters[name] += value
+
+    def close(self, **summary: Any) -> None:
+        """Flush spans and the run summary to the sink.
+
+        Args:
+            **summary: Extra fields for the run summary record (e.g. processing stats)
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if not self.enabled:
+            return
+
+        run_event = {
+            "type": "run",
+            "run_id": self.run_id,
+            "component": self.component,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "counters": dict(self.counters),
+        }
+        if summary:
+            run_event["summary"] = summary
+        self.sink.write([*self.spans, run_event])
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping a method in a span using the instance's `tracer` attribute.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Method decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(name):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profiled(output_path: str | Path | None) -> Generator[None, None, None]:
+    """Optionally capture a cProfile of the enclosed block.
+
+    Args:
+        output_path: Where to dump pstats data, or None to skip profiling
+    """
+    if output_path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(output_path))
+
+
+def summarize_trace(path: str | Path) -> dict[str, Any]:
+    """Aggregate a JSON-lines trace file.
+
+    Args:
+        path: Trace file written by JsonLinesSink
+
+    Returns:
+        Dictionary with 'runs' (run summary records) and 'spans' (per-name stats:
+        count, total_ms, mean_ms, p95_ms, max_ms), sorted by total time descending
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    runs: list[dict[str, Any]] = []
+
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            event = json.loads(line)
+            if event.get("type") == "span":
+                durations[event["name"]].append(event["duration_ms"])
+            elif event.get("type") == "run":
+                runs.append(event)
+
+    spans = {}
+    for name, values in durations.items():
+        values.sort()
+        total = sum(values)
+        spans[name] = {
+            "count": len(values),
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / len(values), 3),
+            "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max_ms": values[-1],
+        }
+
+    return {
+        "runs": runs,
+        "spans": dict(sorted(spans.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+    }
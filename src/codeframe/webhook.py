@@ -0,0 +1,371 @@
+"""Webhook receiver that queues Traycer rate-limited issues as comments arrive."""
+
+import hashlib
+import hmac
+import json
+import queue
+import threading
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple
+
+from .comment_parser import OTHER, RATE_LIMITED, parse_comment
+from .database import Database
+from .scanner import IssueScanner
+
+
+class WebhookAction(NamedTuple):
+    """Queue change derived from one issue_comment event."""
+
+    kind: str  # 'queue' or 'remove'
+    repo_name: str
+    issue_number: int
+    next_retry_at: datetime | None = None
+    labels: tuple[str, ...] = ()
+    created_at: datetime | None = None
+    commented_at: datetime | None = None  # When Traycer's comment was posted
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check a GitHub X-Hub-Signature-256 header.
+
+    Args:
+        secret: Webhook secret configured on GitHub
+        body: Raw request body
+        signature: Header value ('sha256=<hexdigest>')
+
+    Returns:
+        True if the signature matches
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256=") :])
+
+
+def _parse_github_time(value: str | None) -> datetime | None:
+    """Parse a GitHub ISO-8601 timestamp ('2026-01-01T10:00:00Z')."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def parse_issue_comment(payload: dict[str, Any]) -> WebhookAction | None:
+    """Turn an issue_comment payload into a queue change.
+
+    A Traycer rate-limit comment queues the issue for comment time + wait +
+    buffer, like the scanner does. Any other Traycer comment is an analysis, so
+    the issue no longer needs re-analysis and is dropped from the queue. Other
+    Traycer notices (alerts that are not rate limits) leave the queue untouched.
+
+    Args:
+        payload: Decoded issue_comment webhook payload
+
+    Returns:
+        WebhookAction, or None if the event is not relevant
+    """
+    if payload.get("action") not in ("created", "edited"):
+        return None
+
+    comment = payload.get("comment") or {}
+    issue = payload.get("issue") or {}
+    repository = payload.get("repository") or {}
+
+    if (comment.get("user") or {}).get("login") != IssueScanner.TRAYCER_BOT_LOGIN:
+        return None
+    if issue.get("pull_request") or "number" not in issue or "full_name" not in repository:
+        return None
+
+    repo_name = repository["full_name"]
+    issue_number = issue["number"]
+
+    parsed = parse_comment(comment.get("body"))
+    if parsed.kind == OTHER:
+        return None
+    commented_at = _parse_github_time(comment.get("created_at"))
+    if parsed.kind != RATE_LIMITED:
+        return WebhookAction("remove", repo_name, issue_number, commented_at=commented_at)
+
+    if commented_at is None:
+        return None
+
+    return WebhookAction(
+        kind="queue",
+        repo_name=repo_name,
+        issue_number=issue_number,
+        next_retry_at=commented_at
+        + timedelta(seconds=parsed.wait_seconds, minutes=IssueScanner.RETRY_BUFFER_MINUTES),
+        labels=tuple(label["name"] for label in issue.get("labels") or []),
+        created_at=_parse_github_time(issue.get("created_at")),
+        commented_at=commented_at,
+    )
+
+
+class WebhookReceiver:
+    """Verifies, parses and buffers webhook deliveries, writing them to the queue in batches.
+
+    Request threads only verify and parse, then hand actions to a bounded
+    in-memory queue; a single writer thread drains it into grouped database
+    transactions. When the buffer is full, deliveries are refused with 503 so
+    GitHub records them as failed and they can be redelivered. Deliveries that
+    were accepted have already been answered, so a batch that fails to write
+    (e.g. the database is locked by the processor) is kept and retried on the
+    next flush rather than dropped.
+    """
+
+    MAX_PENDING = 1000
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL_SECONDS = 1.0
+    MAX_BODY_BYTES = 25 * 1024 * 1024  # GitHub caps webhook payloads at 25 MB
+
+    def __init__(self, db: Database, secret: str, max_pending: int | None = None):
+        """Initialize receiver.
+
+        Args:
+            db: Database instance
+            secret: Webhook secret used to verify deliveries
+            max_pending: Bound on buffered actions (defaults to MAX_PENDING)
+        """
+        self.db = db
+        self.secret = secret
+        self.pending: queue.Queue[WebhookAction] = queue.Queue(max_pending or self.MAX_PENDING)
+        self.stats = {"received": 0, "queued": 0, "removed": 0, "ignored": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()  # Request threads and the writer both count
+        self._unwritten: list[WebhookAction] = []  # Last batch that failed to write
+        self._stop = threading.Event()
+        self._writer: threading.Thread | None = None
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a delivery counter from any thread.
+
+        Args:
+            name: Key in stats
+            value: Amount to add
+        """
+        with self._stats_lock:
+            self.stats[name] += value
+
+    def handle(self, event: str | None, signature: str | None, body: bytes) -> int:
+        """Handle one delivery.
+
+        Args:
+            event: X-GitHub-Event header
+            signature: X-Hub-Signature-256 header
+            body: Raw request body
+
+        Returns:
+            HTTP status code for the response
+        """
+        self.count("received")
+
+        if not verify_signature(self.secret, body, signature):
+            self.count("rejected")
+            return 401
+
+        if event == "ping":
+            return 200
+        if event != "issue_comment":
+            self.count("ignored")
+            return 204
+
+        try:
+            action = parse_issue_comment(json.loads(body))
+        except (ValueError, KeyError, TypeError):
+            self.count("rejected")
+            return 400
+
+        if action is None:
+            self.count("ignored")
+            return 204
+
+        try:
+            self.pending.put_nowait(action)
+        except queue.Full:
+            self.count("rejected")
+            return 503
+
+        return 202
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        self._stop.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="webhook-writer", daemon=True)
+        self._writer.start()
+
+    def stop(self) -> None:
+        """Stop the writer after flushing everything still buffered."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        if self._unwritten or not self.pending.empty():
+            lost = len(self._unwritten) + self.pending.qsize()
+            self.db.log_error(
+                error_type="webhook_error",
+                error_message=f"Stopped with {lost} webhook action(s) not written to the queue",
+            )
+
+    def flush(self) -> int:
+        """Write all buffered actions now.
+
+        Stops at the first batch that fails to write; it stays buffered.
+
+        Returns:
+            Number of actions written
+        """
+        written = 0
+        while True:
+            batch = self._drain(block=False)
+            if not batch or not self._write(batch):
+                return written
+            written += len(batch)
+
+    def _write_loop(self) -> None:
+        """Writer thread: drain the buffer in batches until stopped."""
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch and not self._write(batch):
+                # Back off before retrying, e.g. while another writer holds the lock
+                self._stop.wait(self.FLUSH_INTERVAL_SECONDS)
+
+    def _drain(self, block: bool) -> list[WebhookAction]:
+        """Take up to BATCH_SIZE buffered actions, starting with any unwritten batch.
+
+        Args:
+            block: Wait up to FLUSH_INTERVAL_SECONDS for the first action
+
+        Returns:
+            Actions taken from the buffer, oldest first
+        """
+        batch, self._unwritten = self._unwritten, []
+        try:
+            if block and not batch:
+                batch.append(self.pending.get(timeout=self.FLUSH_INTERVAL_SECONDS))
+            while len(batch) < self.BATCH_SIZE:
+                batch.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: list[WebhookAction]) -> bool:
+        """Apply a batch, keeping only the latest action per issue.
+
+        Args:
+            batch: Actions in arrival order
+
+        Returns:
+            True if written; False if the write failed and the batch was kept for retry
+        """
+        latest: dict[tuple[str, int], WebhookAction] = {}
+        for action in batch:
+            latest[(action.repo_name, action.issue_number)] = action
+
+        adds = [
+            {
+                "repo_name": a.repo_name,
+                "issue_number": a.issue_number,
+                "next_retry_at": a.next_retry_at,
+                "labels": list(a.labels),
+                "created_at": a.created_at,
+                "rate_limited_at": a.commented_at,
+            }
+            for a in latest.values()
+            if a.kind == "queue"
+        ]
+        # Traycer's analysis landed: the issue leaves the queue re-analyzed
+        completions = [
+            (a.repo_name, a.issue_number, a.commented_at or datetime.now(UTC))
+            for a in latest.values()
+            if a.kind == "remove"
+        ]
+
+        try:
+            if adds:
+                self.db.add_issues(adds)
+            if completions:
+                self.db.complete_issues(completions)
+        except Exception as e:
+            self.db.log_error(error_type="webhook_error", error_message=str(e))
+            self._unwritten = batch
+            return False
+
+        self.count("queued", len(adds))
+        self.count("removed", len(completions))
+        for action in adds:
+            print(f"Queued {action['repo_name']}#{action['issue_number']} from webhook")
+        return True
+
+    def make_server(self, host: str = "127.0.0.1", port: int = 8787) -> ThreadingHTTPServer:
+        """Create an HTTP server that feeds this receiver.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+
+        Returns:
+            Server ready for serve_forever()
+        """
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= receiver.MAX_BODY_BYTES:
+                    # Refuse before reading (and before the HMAC check can run)
+                    receiver.count("received")
+                    receiver.count("rejected")
+                    status = 413 if length > 0 else 400
+                    self.close_connection = True
+                else:
+                    status = receiver.handle(
+                        self.headers.get("X-GitHub-Event"),
+                        self.headers.get("X-Hub-Signature-256"),
+                        self.rfile.read(length),
+                    )
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Deliveries are summarized via stats instead
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> None:
+    """Main entry point for webhook server."""
+    import argparse
+    import os
+    import sys
+
+    parser = argparse.ArgumentParser(description="Receive Traycer issue_comment webhooks")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8787, help="Port to bind (default: 8787)")
+    args = parser.parse_args()
+
+    secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        print("Error: GITHUB_WEBHOOK_SECRET environment variable not set", file=sys.stderr)
+        sys.exit(1)
+
+    receiver = WebhookReceiver(Database(), secret)
+    server = receiver.make_server(args.host, args.port)
+    receiver.start()
+
+    print(f"Listening for webhooks on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        receiver.stop()
+        print(f"\nWebhook receiver stopped: {receiver.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Tests for multi-account slot buckets."""
+
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.accounts import TraycerAccount, accounts_from_env, make_buckets
+from codeframe.dashboard import QueueDashboard
+from codeframe.database import Database
+from codeframe.processor import QueueProcessor, check_preflight
+from codeframe.slot_calculator import SlotCalculator
+
+ACCOUNTS = [TraycerAccount("main", "t0"), TraycerAccount("alice", "t1")]
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Database(Path(tmpdir) / "test.db")
+
+
+def test_accounts_from_env(monkeypatch):
+    """Extra accounts follow the main one, with tokens read from the named variables."""
+    monkeypatch.setenv("CODEFRAME_TRAYCER_ACCOUNTS", "alice=TOKEN_A, main=TOKEN_M ,bob=TOKEN_B")
+    monkeypatch.setenv("TOKEN_A", "ta")
+    monkeypatch.setenv("TOKEN_B", "tb")
+
+    assert accounts_from_env("main", "tm") == [
+        TraycerAccount("main", "tm"),
+        TraycerAccount("alice", "ta"),
+        TraycerAccount("bob", "tb"),
+    ]
+
+
+@pytest.mark.parametrize("value", ["alice", "alice=TOKEN_UNSET"])
+def test_accounts_from_env_rejects_bad_entries(monkeypatch, value):
+    monkeypatch.setenv("CODEFRAME_TRAYCER_ACCOUNTS", value)
+    monkeypatch.delenv("TOKEN_UNSET", raising=False)
+    with pytest.raises(ValueError):
+        accounts_from_env("main", "tm")
+
+
+def test_buckets_count_their_own_attempts(db):
+    """Each bucket sees its own attempts; the primary also owns unattributed ones."""
+    db.log_processing("owner/app", 1, success=True, account="main")
+    db.log_processing("owner/app", 2, success=True, account="alice")
+    db.log_processing("owner/app", 3, success=True, account="alice")
+    db.log_processing("owner/app", 4, success=True)  # Logged before accounts existed
+
+    main, alice = make_buckets(db, ACCOUNTS)
+    assert sorted(r.issue_number for r in main.slot_calculator._get_history()) == [1, 4]
+    assert sorted(r.issue_number for r in alice.slot_calculator._get_history()) == [2, 3]
+
+    # A single bucket counts everything, as before accounts existed
+    (only,) = make_buckets(db, ACCOUNTS[:1])
+    assert len(only.slot_calculator._get_history()) == 4
+
+
+def test_dashboard_shows_each_bucket(db, monkeypatch):
+    """The dashboard counts slots per account, as `cf issues status` does."""
+    monkeypatch.setattr(SlotCalculator, "_detect_external_traycer_activity", lambda self: 0)
+    db.log_processing("owner/app", 1, success=True, account="main")
+    for n in range(2, 5):
+        db.log_processing("owner/app", n, success=True, account="alice")
+
+    statuses = QueueDashboard(db, ACCOUNTS).slot_statuses()
+    assert {name: status.available_slots for name, status in statuses.items()} == {
+        "main": SlotCalculator.TOTAL_SLOTS - 1,
+        "alice": SlotCalculator.TOTAL_SLOTS - 3,
+    }
+    (only,) = QueueDashboard(db).slot_statuses().values()
+    assert only.available_slots == SlotCalculator.TOTAL_SLOTS - 4
+
+
+def test_route_spreads_issues_by_free_slots(db):
+    """Issues go to whichever bucket has the most free slots left."""
+    processor = QueueProcessor("t0", "main", db, accounts=ACCOUNTS + [TraycerAccount("bob", "t2")])
+    issues = [{"id": n} for n in range(6)]
+
+    routed = processor._route(issues, {"main": 1, "alice": 4, "bob": 0})
+
+    assert [bucket.username for _, bucket in routed] == ["alice"] * 3 + ["main", "alice"]
+    assert [issue["id"] for issue, _ in routed] == [0, 1, 2, 3, 4]
+
+
+def test_preflight_scales_slots_with_accounts(db):
+    """A full main bucket does not block the gate when other accounts have room."""
+    db.add_issue("owner/app", 1, datetime.now() - timedelta(minutes=1))
+    for n in range(SlotCalculator.TOTAL_SLOTS):
+        db.log_processing("owner/app", 100 + n, success=True, account="main")
+
+    assert check_preflight(db).reason == "no slots"
+    assert check_preflight(db, account_count=2).can_run
+
+
+class SigningIssue:
+    """Issue that records which pooled token signed each assignment."""
+
+    assignees = []
+
+    def __init__(self, pool, signed, number):
+        self.pool = pool
+        self.signed = signed
+        self.number = number
+
+    def add_to_assignees(self, login):
+        self.signed.append((login, self.pool.tokens[self.pool.current]))
+
+    def get_comments(self, since=None):
+        return self  # Stands in for the listing too: every page is empty
+
+    def get_page(self, page):
+        return []
+
+
+class SigningGithub:
+    rate_limiting = (-1, -1)
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.signed = []
+
+    def get_repo(self, name):
+        return self
+
+    def get_issue(self, number):
+        return SigningIssue(self.pool, self.signed, number)
+
+
+def test_toggle_is_signed_with_bucket_token(db, monkeypatch):
+    """Each bucket assigns with its own account's token, not whichever has most quota."""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    processor = QueueProcessor("t0", "main", db, accounts=ACCOUNTS, tokens=["spare"])
+    github = processor.pool.github = SigningGithub(processor.pool)
+    monkeypatch.setattr(processor.pool, "select", lambda *args: processor.pool.budgets[2])
+    main, alice = processor.buckets
+
+    for number, bucket in enumerate([alice, main, alice]):
+        processor._process_issue(
+            {"repo_name": "owner/app", "issue_number": number, "retry_count": 0}, bucket, {}
+        )
+
+    assert github.signed == [("alice", "t1"), ("main", "t0"), ("alice", "t1")]
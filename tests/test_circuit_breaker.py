@@ -0,0 +1,99 @@
+"""Tests for persisted per-domain circuit breakers."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from github import GithubException
+
+from codeframe.circuit_breaker import (
+    CLOSED,
+    GLOBAL,
+    HALF_OPEN,
+    OPEN,
+    BreakerPolicy,
+    CircuitBreaker,
+    classify_failure,
+    error_domain,
+    repo_domain,
+)
+from codeframe.database import Database
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Database(Path(tmpdir) / "test.db")
+
+
+def state(db, domain):
+    row = db.get_circuit_breakers([domain]).get(domain)
+    return row["state"] if row else CLOSED
+
+
+def test_classify_failure():
+    """Repo-specific errors stay in the repo domain; the rest are systemic."""
+    assert classify_failure(GithubException(404, {"message": "Not Found"})) is None
+    assert classify_failure(GithubException(401, {"message": "Bad credentials"})) == "auth"
+    secondary = GithubException(403, {"message": "You have exceeded a secondary rate limit"})
+    assert classify_failure(secondary) == "abuse"
+    assert classify_failure(GithubException(502, {"message": "Bad Gateway"})) == "server"
+    assert classify_failure(ConnectionError("reset")) == "network"
+    assert classify_failure(ValueError("bug")) == "other"
+
+
+def test_broken_repo_does_not_block_healthy_repos(db):
+    """Repo failures open only that repo's breaker."""
+    breaker = CircuitBreaker(db)
+    not_found = GithubException(404, {"message": "Not Found"})
+
+    for _ in range(CircuitBreaker.REPO_POLICY.threshold):
+        opened = breaker.record_failure("owner/broken", not_found)
+
+    assert opened == [repo_domain("owner/broken")]
+    assert breaker.blocked_by([repo_domain("owner/broken")]) == repo_domain("owner/broken")
+    assert breaker.blocked_by(breaker.systemic_domains + [repo_domain("owner/healthy")]) is None
+    assert breaker.open_domains() == [repo_domain("owner/broken")]
+
+
+def test_failures_outside_window_do_not_accumulate(db):
+    """Only failures within the window count towards the threshold."""
+    now = 1_000_000
+    for offset in (0, 400, 800):
+        db.record_breaker_failure("global", now + offset, threshold=2, window_seconds=300)
+    assert state(db, GLOBAL) == CLOSED
+
+    db.record_breaker_failure("global", now + 900, threshold=2, window_seconds=300)
+    assert state(db, GLOBAL) == OPEN
+
+
+def test_half_open_allows_a_single_probe(db):
+    """After the cooldown one process probes; the others stay blocked until it reports."""
+    first, second = CircuitBreaker(db), CircuitBreaker(db)
+    for breaker in (first, second):
+        breaker.ERROR_POLICIES = {"abuse": BreakerPolicy(threshold=1, cooldown_seconds=0)}
+
+    abuse = GithubException(429, {"message": "Too Many Requests"})
+    assert error_domain("abuse") in first.record_failure("owner/app", abuse)
+
+    assert first.blocked_by([error_domain("abuse")]) is None  # Probe granted
+    assert state(db, error_domain("abuse")) == HALF_OPEN
+    assert second.blocked_by([error_domain("abuse")]) == error_domain("abuse")
+
+    first.record_success([error_domain("abuse"), GLOBAL, repo_domain("owner/app")])
+    assert state(db, error_domain("abuse")) == CLOSED
+    assert second.blocked_by([error_domain("abuse")]) is None
+
+
+def test_failed_probe_reopens(db):
+    """A failure while half-open re-opens the breaker for another cooldown."""
+    breaker = CircuitBreaker(db)
+    breaker.REPO_POLICY = BreakerPolicy(threshold=1, cooldown_seconds=0)
+    not_found = GithubException(404, {"message": "Not Found"})
+
+    breaker.record_failure("owner/app", not_found)
+    assert breaker.blocked_by([repo_domain("owner/app")]) is None
+    assert state(db, repo_domain("owner/app")) == HALF_OPEN
+
+    assert breaker.record_failure("owner/app", not_found) == [repo_domain("owner/app")]
+    assert state(db, repo_domain("owner/app")) == OPEN
@@ -0,0 +1,112 @@
+"""Tests for Traycer comment classification."""
+
+import random
+import time
+
+import pytest
+
+from codeframe.comment_parser import (
+    ANALYSIS,
+    OTHER,
+    RATE_LIMITED,
+    ParsedComment,
+    parse_comment,
+    parse_wait_seconds,
+)
+
+CORPUS = [
+    # Plain notice
+    ("Rate limit exceeded. Please try after 1800 seconds.", ParsedComment(RATE_LIMITED, 1800)),
+    # Alert blockquote on one line
+    (
+        "> [!WARNING]\n> Rate limit exceeded. Please try after 903 seconds.",
+        ParsedComment(RATE_LIMITED, 903),
+    ),
+    # Alert blockquote wrapped across lines
+    (
+        "> [!WARNING]\n> Rate limit exceeded.\n> Please try after 60 seconds.\n",
+        ParsedComment(RATE_LIMITED, 60),
+    ),
+    # CRLF line endings and extra spacing
+    (
+        "> [!WARNING]\r\n>   Rate limit exceeded.\r\n>\r\n>   Please try after  1 second.",
+        ParsedComment(RATE_LIMITED, 1),
+    ),
+    # Notice after a header
+    (
+        "Traycer could not analyze this issue.\n\nRate limit exceeded. Please try after 5 seconds.",
+        ParsedComment(RATE_LIMITED, 5),
+    ),
+    # Regular analysis
+    ("## Implementation Plan\n\n1. Add a CSV writer.", ParsedComment(ANALYSIS)),
+    # Analysis mentioning the phrase without a wait time
+    ("Rate limit exceeded. Retry logic lives in client.py.", ParsedComment(ANALYSIS)),
+    # Other alert notices
+    ("> [!CAUTION]\n> Traycer failed to load the repository.", ParsedComment(OTHER)),
+    ("[!IMPORTANT] Subscription expired.", ParsedComment(OTHER)),
+    # Empty bodies
+    ("", ParsedComment(OTHER)),
+    ("  \n ", ParsedComment(OTHER)),
+    (None, ParsedComment(OTHER)),
+]
+
+
+@pytest.mark.parametrize("body,expected", CORPUS)
+def test_corpus(body, expected):
+    """Known comment formats classify as expected."""
+    assert parse_comment(body) == expected
+
+
+def test_missing_unit_or_digits_is_not_a_notice():
+    """Partial notices do not yield a wait time."""
+    assert parse_wait_seconds("Rate limit exceeded. Please try after seconds.") is None
+    assert parse_wait_seconds("Rate limit exceeded. Please try after 30") is None
+    assert parse_wait_seconds("Rate limit exceeded. Please try after 30 minutes.") is None
+
+
+def test_later_notice_found_after_false_anchor():
+    """A notice still parses when an earlier anchor has no wait time."""
+    body = "Rate limit exceeded.\n\nRate limit exceeded. Please try after 42 seconds."
+    assert parse_wait_seconds(body) == 42
+
+
+def test_fuzzed_separators_and_noise():
+    """Random separators between the phrases and noise around the notice parse correctly."""
+    rng = random.Random(1234)
+    noise_chars = "abcdefghijklmnopqrstuvwxyz .,#*-_`\n"
+    for _ in range(500):
+        seconds = rng.randint(0, 10**6)
+
+        def sep() -> str:
+            parts = [" ", "\n", "\r\n", "> ", "\t"]
+            return "".join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+
+        def noise() -> str:
+            return "".join(rng.choice(noise_chars) for _ in range(rng.randint(0, 200)))
+
+        notice = f"Rate limit exceeded.{sep()}Please try after{sep()}{seconds}{sep()}seconds."
+        body = f"{noise()}\n{notice}\n{noise()}"
+        assert parse_comment(body) == ParsedComment(RATE_LIMITED, seconds)
+
+        # Without the notice, noise never parses as rate limited
+        assert parse_comment(noise() + "x").kind != RATE_LIMITED
+
+
+def test_throughput():
+    """Parsing stays linear on large bodies, including adversarial near-misses."""
+    near_miss = "Rate limit exceeded. Please try after " + "9" * 50 + " minutes.\n"
+    bodies = [
+        "lorem ipsum dolor sit amet " * 40_000,  # ~1 MB of analysis text
+        near_miss * 10_000,  # ~1 MB of anchors that never complete
+        "Rate limit exceeded." + " >" * 500_000,  # ~1 MB of separators
+    ]
+    total_mb = sum(len(body) for body in bodies) / 1_000_000
+
+    start = time.perf_counter()
+    for body in bodies:
+        assert parse_comment(body).kind != RATE_LIMITED
+    elapsed = time.perf_counter() - start
+
+    # Generous floor so slow CI machines pass; a backtracking parser misses it by far
+    assert total_mb / elapsed > 2
+
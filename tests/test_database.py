@@ -1,7 +1,8 @@
 """Tests for database functionality."""
 
+import sqlite3
 import tempfile
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
@@ -89,3 +90,291 @@ def test_increment_retry_count(db):
 
     assert issues[0]["retry_count"] == 1
     assert issues[0]["last_error"] == "API error"
+
+
+def test_ready_issues_interleave_repos(db):
+    """Test that one busy repo cannot monopolize the front of the ready queue."""
+    ready = datetime.now() - timedelta(minutes=1)
+    for number in range(1, 6):
+        db.add_issue("owner/busy", number, ready)
+    db.add_issue("owner/quiet", 1, ready)
+
+    issues = db.get_issues_ready_for_processing(limit=2)
+
+    assert {issue["repo_name"] for issue in issues} == {"owner/busy", "owner/quiet"}
+
+
+def test_set_priority_moves_issue_forward(db):
+    """Test that explicit priority outranks retry-time order within a repo."""
+    db.add_issue("owner/repo", 1, datetime.now() - timedelta(minutes=10))
+    db.add_issue("owner/repo", 2, datetime.now() - timedelta(minutes=1))
+
+    assert db.set_priority("owner/repo", 2, 5) is True
+    assert db.set_priority("owner/repo", 999, 5) is False
+
+    issues = db.get_issues_ready_for_processing(limit=1)
+
+    assert issues[0]["issue_number"] == 2
+
+
+def test_dequeue_scores_age_without_rescoring(db):
+    """Test that issue age is scored at dequeue, not frozen into the stored score."""
+    ready = datetime.now() - timedelta(minutes=1)
+    db.add_issue("owner/repo", 1, ready, created_at=datetime.now(UTC))
+    db.add_issue("owner/repo", 2, ready, created_at=datetime.now(UTC) - timedelta(days=20))
+
+    issues = db.get_issues_ready_for_processing()
+    assert [issue["issue_number"] for issue in issues] == [2, 1]
+    assert [(issue["score"], issue["current_score"]) for issue in issues] == [(0, 20), (0, 0)]
+    assert db.get_issues_ready_for_processing(repo_name="owner/repo")[0]["issue_number"] == 2
+    assert db.rescore_queue() == 0
+
+
+def test_rescore_queue_refreshes_stale_scores(db):
+    """Test that rescoring catches up rows whose stored score went stale."""
+    ready = datetime.now() - timedelta(minutes=1)
+    db.add_issue("owner/repo", 1, ready)
+    db.add_issue("owner/repo", 2, ready)
+    db.set_priority("owner/repo", 2, 1)
+    with db._get_connection() as conn:
+        conn.execute("UPDATE queued_issues SET score = 0")  # As left by a migration
+
+    assert db.get_issues_ready_for_processing(limit=1)[0]["issue_number"] == 1
+    assert db.rescore_queue() == 1
+    assert db.rescore_queue() == 0
+    assert db.get_issues_ready_for_processing(limit=1)[0]["issue_number"] == 2
+
+
+def test_add_issue_keeps_later_retry_time(db):
+    """Test that re-queueing cannot pull an issue's retry time forward."""
+    later = datetime.now() + timedelta(hours=1)
+    db.add_issue("owner/repo", 1, later)
+    db.add_issue("owner/repo", 1, datetime.now() - timedelta(minutes=5))
+
+    assert db.get_issues_ready_for_processing() == []
+
+
+def test_claim_issue_blocks_second_claim(db):
+    """Test that an in-flight claim is exclusive until released."""
+    db.add_issue("owner/repo", 1)
+
+    assert db.claim_issue("owner/repo", 1) is True
+    assert db.claim_issue("owner/repo", 1) is False
+
+    db.release_issue("owner/repo", 1)
+    assert db.claim_issue("owner/repo", 1) is True
+
+
+def test_defer_recent_attempts(db):
+    """Test that issues attempted within the recharge window are pushed back."""
+    db.add_issue("owner/repo", 1, datetime.now() - timedelta(minutes=1))
+    db.add_issue("owner/repo", 2, datetime.now() - timedelta(minutes=1))
+    db.log_processing("owner/repo", 1, success=False, rate_limit_seconds=60)
+
+    assert db.defer_recent_attempts(minutes=30) == 1
+
+    ready = db.get_issues_ready_for_processing()
+    assert [issue["issue_number"] for issue in ready] == [2]
+
+
+def test_was_processed_since(db):
+    """Test detection of a successful re-analysis after a rate-limit comment."""
+    db.log_processing("owner/repo", 1, success=True)
+
+    assert db.was_processed_since("owner/repo", 1, datetime.now(UTC) - timedelta(hours=1))
+    assert not db.was_processed_since("owner/repo", 1, datetime.now(UTC) + timedelta(hours=1))
+    assert not db.was_processed_since("owner/repo", 2, datetime.now(UTC) - timedelta(hours=1))
+
+
+def test_scan_cache_respects_max_age(db):
+    """Test cached scan values expire after max_age_seconds."""
+    db.set_cached("traycer_active_repos", '["owner/repo"]')
+
+    assert db.get_cached("traycer_active_repos", max_age_seconds=3600) == '["owner/repo"]'
+    assert db.get_cached("traycer_active_repos", max_age_seconds=-1) is None
+    assert db.get_cached("missing", max_age_seconds=3600) is None
+
+
+def test_iter_queued_issues_pages_in_retry_order(db):
+    """Keyset iteration yields every row once, in (next_retry_at, id) order."""
+    now = datetime.now()
+    issues = []
+    for n in range(250):
+        # Duplicate retry times exercise the id tie-breaker across page boundaries
+        retry_at = now + timedelta(minutes=(n % 7) - 3)
+        issues.append({"repo_name": "owner/app", "issue_number": n, "next_retry_at": retry_at})
+    db.add_issues(issues)
+    with db._get_connection() as conn:
+        conn.execute("UPDATE queued_issues SET next_retry_at = NULL WHERE issue_number < 5")
+
+    rows = list(db.iter_queued_issues(page_size=16))
+    assert len(rows) == 250
+    assert [r["next_retry_at"] for r in rows[:5]] == [None] * 5
+    keys = [(r["next_retry_at"], r["id"]) for r in rows[5:]]
+    assert keys == sorted(keys)
+
+    ready = list(db.iter_queued_issues(ready_only=True, page_size=16))
+    assert len(ready) == db.count_ready_issues()
+    assert 5 < len(ready) < 250
+    assert db.count_queued_issues() == 250
+    assert db.count_queued_issues(repo_name="owner/other") == 0
+
+
+def test_typed_history_rows(db):
+    """Typed rows carry converted timestamps and still read like dict rows."""
+    db.log_processing("owner/repo", 1, success=True)
+    db.log_processing("owner/repo", 2, success=False, rate_limit_seconds=1800)
+
+    plain = db.get_recent_processing_history(minutes=30)
+    typed = db.get_recent_processing_history(minutes=30, typed=True)
+
+    assert len(typed) == 2
+    for record, row in zip(typed, plain):
+        assert isinstance(record.processed_at, datetime)
+        assert record.processed_at == row["processed_at"]
+        assert record.processed_at.tzinfo is UTC
+        assert record["success"] is bool(row["success"])
+        assert dict(record).keys() == row.keys()
+        assert not hasattr(record, "__dict__")
+
+    db.log_error("processing_error", "boom")
+    (error,) = db.get_consecutive_errors(limit=1, typed=True)
+    assert isinstance(error.timestamp, datetime)
+    assert error["error_message"] == "boom"
+
+
+def test_dead_letter_and_requeue(db):
+    """Dead-lettering moves the row aside; requeueing restores it with no retries."""
+    db.add_issue("owner/app", 7, labels=["bug"])
+    db.increment_retry_count("owner/app", 7, "Unknown result")
+    db.dead_letter_issue("owner/app", 7, "Unknown result", "unknown")
+
+    assert db.count_queued_issues() == 0
+    (dead,) = db.get_dead_letters()
+    assert (dead["retry_count"], dead["labels"], dead["last_error"]) == (2, "bug", "Unknown result")
+    assert db.was_dead_lettered_since("owner/app", 7, datetime.now(UTC) - timedelta(1))
+    assert not db.was_dead_lettered_since("owner/app", 7, datetime.now(UTC) + timedelta(1))
+
+    assert db.requeue_dead_letter("owner/app", 7)
+    assert not db.requeue_dead_letter("owner/app", 7)
+    assert db.get_dead_letters() == []
+    (queued,) = db.iter_queued_issues()
+    assert (queued["retry_count"], queued["labels"]) == (0, "bug")
+
+
+def test_legacy_text_timestamps_migrate_to_epoch():
+    """Mixed-format TIMESTAMP text from older databases becomes UTC epoch seconds."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+    local_retry = datetime(2026, 1, 1, 10, 0)
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE queued_issues (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                repo_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                next_retry_at TIMESTAMP,
+                retry_count INTEGER DEFAULT 0,
+                last_error TEXT,
+                UNIQUE(repo_name, issue_number)
+            );
+            CREATE INDEX idx_queued_issues_retry ON queued_issues(next_retry_at);
+            CREATE TABLE processing_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                repo_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                success BOOLEAN NOT NULL,
+                rate_limit_message TEXT,
+                rate_limit_seconds INTEGER
+            );
+        """)
+        conn.executemany(
+            "INSERT INTO queued_issues (repo_name, issue_number, added_at, next_retry_at) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                # Naive local time from datetime.now()
+                ("owner/app", 1, "2026-01-01 08:00:00", local_retry.isoformat(" ")),
+                # GitHub timestamp with offset
+                ("owner/app", 2, "2026-01-01 08:00:00", "2026-01-01 09:32:00+00:00"),
+                ("owner/app", 3, "2026-01-01 08:00:00", None),
+            ],
+        )
+        conn.execute(
+            "INSERT INTO processing_history (repo_name, issue_number, processed_at, success) "
+            "VALUES ('owner/app', 1, '2026-01-01 09:00:00', 1)"
+        )
+    conn.close()
+
+    db = Database(db_path)
+    rows = {row["issue_number"]: row for row in db.iter_queued_issues()}
+    assert rows[1]["next_retry_at"] == local_retry.astimezone(UTC)
+    assert rows[2]["next_retry_at"] == datetime(2026, 1, 1, 9, 32, tzinfo=UTC)
+    assert rows[3]["next_retry_at"] is None
+    assert rows[1]["added_at"] == datetime(2026, 1, 1, 8, 0, tzinfo=UTC)
+    assert db.count_ready_issues() == 3
+    assert db.was_processed_since("owner/app", 1, datetime(2026, 1, 1, 8, 59, tzinfo=UTC))
+
+    with db._get_connection() as conn:
+        (stored,) = conn.execute("SELECT typeof(next_retry_at) FROM queued_issues WHERE id = 2")
+        assert tuple(stored) == ("integer",)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert "idx_queued_issues_retry" in tables
+    assert not any(name.endswith("_legacy") for name in tables)
+
+    # Reopening finds nothing left to migrate
+    Database(db_path)
+    db_path.unlink()
+
+
+def test_real_breaker_times_migrate_to_epoch():
+    """Circuit breaker times stored as REAL seconds become integer epoch seconds."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE circuit_breakers (
+                domain TEXT PRIMARY KEY,
+                state TEXT NOT NULL DEFAULT 'closed',
+                failures INTEGER NOT NULL DEFAULT 0,
+                window_started_at REAL,
+                opened_at REAL,
+                probe_until REAL,
+                last_error TEXT
+            );
+            INSERT INTO circuit_breakers VALUES
+                ('global', 'open', 3, 1767258000.75, 1767258300.5, NULL, 'boom');
+        """)
+    conn.close()
+
+    db = Database(db_path)
+    row = db.get_circuit_breakers(["global"])["global"]
+    assert row["opened_at"] == datetime(2026, 1, 1, 9, 5, tzinfo=UTC)
+    assert (row["state"], row["probe_until"]) == ("open", None)
+    with db._get_connection() as conn:
+        (stored,) = conn.execute("SELECT typeof(opened_at) FROM circuit_breakers")
+        assert tuple(stored) == ("integer",)
+    db_path.unlink()
+
+
+def test_ready_check_compares_instants_across_offsets(db):
+    """Retry times given in different time zones order by instant, not by text."""
+    now = datetime.now(UTC)
+    east = timezone(timedelta(hours=9))
+    db.add_issue("owner/app", 1, (now - timedelta(minutes=5)).astimezone(east))
+    db.add_issue("owner/app", 2, now + timedelta(minutes=5))
+    db.add_issue("owner/app", 3, datetime.now() - timedelta(minutes=5))
+
+    ready = db.get_issues_ready_for_processing()
+    assert sorted(issue["issue_number"] for issue in ready) == [1, 3]
+
+
+def test_timestamp_conversion_stays_inside_database(db):
+    """Test that Database converts timestamps without touching sqlite3's global registries."""
+    at = datetime(2026, 1, 1, 9, 0, tzinfo=UTC)
+    db.add_issue("owner/repo", 1, at)
+
+    assert db.get_issues_ready_for_processing()[0]["next_retry_at"] == at
+    registered = [*sqlite3.adapters.values(), *sqlite3.converters.values()]
+    assert not [func for func in registered if func.__module__.startswith("codeframe")]
@@ -0,0 +1,106 @@
+"""Tests for fair-share slot allocation, including a skewed-load simulation."""
+
+import math
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.fair_share import FairShareAllocator
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+def _run_window(db, allocator, slots):
+    """Allocate one window and dequeue the granted issues, like process_queue does."""
+    allocation = allocator.allocate(slots, db.get_ready_counts_by_repo())
+    allocator.commit(allocation)
+
+    served = []
+    for repo_name, count in allocation.slots.items():
+        for issue in db.get_issues_ready_for_processing(limit=count, repo_name=repo_name):
+            db.remove_issue(repo_name, issue["issue_number"])
+            served.append((repo_name, issue["issue_number"]))
+    return served
+
+
+def test_allocation_never_exceeds_slots_or_ready_work(db):
+    """Test that grants are capped by available slots and each repo's ready count."""
+    allocator = FairShareAllocator(db, weights={})
+
+    allocation = allocator.allocate(15, {"owner/a": 2, "owner/b": 100})
+
+    assert allocation.slots == {"owner/a": 2, "owner/b": 13}
+
+
+def test_weights_split_saturated_repos(db):
+    """Test that two always-busy repos share slots in proportion to their weights."""
+    past = datetime.now() - timedelta(minutes=1)
+    for number in range(200):
+        db.add_issue("owner/big", number, past)
+        db.add_issue("owner/small", number, past)
+    allocator = FairShareAllocator(db, weights={"owner/big": 3, "owner/small": 1})
+
+    served = []
+    for _ in range(16):
+        served.extend(_run_window(db, allocator, slots=4))
+
+    big = sum(1 for repo, _ in served if repo == "owner/big")
+    small = sum(1 for repo, _ in served if repo == "owner/small")
+
+    assert (big, small) == (48, 16)
+
+
+def test_skewed_load_has_bounded_wait_per_repo(db):
+    """Simulate one repo with a huge backlog against many small repos.
+
+    With FIFO dequeue the backlog would take every slot for dozens of windows.
+    With fair share, each small repo's issue must be served within the number
+    of windows it takes to earn one slot of credit (active repos / slots),
+    plus one window of slack.
+    """
+    slots_per_window = 15
+    small_repos = [f"owner/small-{i}" for i in range(30)]
+    past = datetime.now() - timedelta(minutes=1)
+
+    for number in range(500):
+        db.add_issue("owner/hot", number, past)
+
+    allocator = FairShareAllocator(db, weights={})
+    queued_at: dict[tuple[str, int], int] = {}
+    waits: dict[str, list[int]] = {repo: [] for repo in small_repos}
+    total_served = 0
+
+    for window in range(40):
+        # Each small repo gets a new rate-limited issue every third window
+        if window % 3 == 0:
+            for repo in small_repos:
+                db.add_issue(repo, window, past)
+                queued_at[(repo, window)] = window
+
+        served = _run_window(db, allocator, slots_per_window)
+        total_served += len(served)
+        for repo, number in served:
+            if repo in waits:
+                waits[repo].append(window - queued_at.pop((repo, number)))
+
+    bound = math.ceil((len(small_repos) + 1) / slots_per_window) + 1
+
+    assert not queued_at or max(40 - w for w in queued_at.values()) <= bound
+    assert all(waits[repo] for repo in small_repos)
+    assert max(max(w) for w in waits.values()) <= bound
+    # Work-conserving: the hot repo soaks up every slot the small repos leave idle
+    assert total_served == 40 * slots_per_window
@@ -0,0 +1,87 @@
+"""Tests for end-to-end latency histograms."""
+
+import tempfile
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.latency import bucket_of, bucket_upper_seconds, percentile, summarize
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+@pytest.mark.parametrize("seconds", [0, 0.5, 1, 59, 60, 1800, 3600 * 5, 86400 * 30])
+def test_bucket_bounds_latency_within_a_fifth(seconds):
+    """Each latency lands in a bucket whose upper bound overstates it by under 20%."""
+    upper = bucket_upper_seconds(bucket_of(seconds))
+
+    assert seconds < upper
+    assert upper <= max(1.0, seconds * 1.19)
+
+
+def test_percentiles_come_from_bucket_counts():
+    """p50 and p95 pick the buckets holding the 50th and 95th ranks."""
+    fast, slow = bucket_of(60), bucket_of(3600)
+    counts = {fast: 90, slow: 10}
+
+    assert percentile(counts, 0.50) == bucket_upper_seconds(fast)
+    assert percentile(counts, 0.95) == bucket_upper_seconds(slow)
+    assert percentile({}, 0.95) == 0.0
+
+
+def test_complete_issue_measures_from_first_rate_limit_comment(db):
+    """Later rate-limit comments do not restart the clock."""
+    now = datetime.now(UTC).replace(microsecond=0)
+    db.add_issue("owner/app", 1, now, rate_limited_at=now - timedelta(hours=2))
+    db.add_issue("owner/app", 1, now, rate_limited_at=now - timedelta(minutes=10))
+
+    assert db.complete_issue("owner/app", 1, completed_at=now) == 7200
+    assert db.count_queued_issues() == 0
+
+
+def test_unknown_rate_limit_time_is_not_measured(db):
+    """Issues queued without a rate-limit time leave the queue unmeasured."""
+    db.add_issue("owner/app", 1)
+
+    assert db.complete_issue("owner/app", 1) is None
+    assert db.complete_issue("owner/app", 2) is None
+    assert db.get_latency_histograms() == []
+
+
+def test_histograms_summarize_per_repo(db):
+    """Completions accumulate as bucket counts, summarized per repository."""
+    now = datetime.now(UTC).replace(microsecond=0)
+    completions = []
+    for number in range(20):
+        wait = timedelta(minutes=5) if number < 19 else timedelta(hours=6)
+        db.add_issue("owner/app", number, now, rate_limited_at=now - wait)
+        completions.append(("owner/app", number, now))
+    db.add_issue("owner/lib", 1, now, rate_limited_at=now - timedelta(minutes=30))
+    completions.append(("owner/lib", 1, now))
+    db.complete_issues(completions)
+
+    rows = db.get_latency_histograms(days=1)
+    assert sum(row["count"] for row in rows) == 21
+    assert len(rows) == 3  # One row per repo and bucket, not per issue
+
+    app, lib = summarize(rows, key=lambda row: row["repo_name"])
+    assert (app.key, app.count) == ("owner/app", 20)
+    assert app.p50 == bucket_upper_seconds(bucket_of(300))
+    assert app.max == bucket_upper_seconds(bucket_of(6 * 3600))
+    assert (lib.key, lib.count) == ("owner/lib", 1)
+    assert [row["repo_name"] for row in db.get_latency_histograms(repo_name="owner/lib")] == [
+        "owner/lib"
+    ]
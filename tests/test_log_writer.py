@@ -0,0 +1,189 @@
+"""Tests for the buffered log writer."""
+
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.log_writer import LogWriter
+
+
+class SlowDiskDatabase(Database):
+    """Database whose every transaction takes COMMIT_SECONDS, like a slow or contended disk."""
+
+    COMMIT_SECONDS = 0.005
+
+    def __init__(self, *args, **kwargs):
+        self.transactions = Counter()  # Per thread ident, counted after schema setup
+        super().__init__(*args, **kwargs)
+        self.transactions.clear()
+
+    @contextmanager
+    def _get_connection(self, record=None):
+        with super()._get_connection(record) as conn:
+            yield conn
+            time.sleep(self.COMMIT_SECONDS)
+        self.transactions[threading.get_ident()] += 1
+
+
+@pytest.fixture
+def db_path():
+    """Path of a temporary database file."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        path = Path(f.name)
+    yield path
+    path.unlink()
+
+
+def _count(db_path, table):
+    """Rows committed to a table, read through a separate connection."""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_reads_see_buffered_rows(db_path):
+    """Log readers flush first, so buffered rows are never missed."""
+    db = Database(db_path)
+    db.buffer_logs()
+
+    attempt = db.record_trigger("owner/app", 1)
+    db.update_trigger(attempt, "rate_limited", rate_limit_seconds=60)
+    db.log_processing("owner/app", 2, success=True)
+    db.log_error("processing_error", "boom", "owner/app", 1)
+
+    history = db.get_recent_processing_history(minutes=30)
+    assert sorted((row["issue_number"], row["outcome"]) for row in history) == [
+        (1, "rate_limited"),
+        (2, None),
+    ]
+    assert [error["error_message"] for error in db.get_consecutive_errors()] == ["boom"]
+    assert db.was_processed_since("owner/app", 2, datetime.now(UTC) - timedelta(1))
+    db.unbuffer_logs()
+
+
+def test_breaker_errors_are_durable_on_return(db_path):
+    """A circuit_breaker error commits itself and everything logged before it."""
+    db = SlowDiskDatabase(db_path)
+    db.buffer_logs()
+
+    for n in range(20):
+        db.log_error("processing_error", f"boom {n}", "owner/app", n)
+    db.log_error("circuit_breaker", "Circuit open for repo:owner/app", "owner/app")
+
+    assert _count(db_path, "error_log") == 21
+    db.unbuffer_logs()
+
+
+def test_stop_flushes_and_restores_direct_writes(db_path):
+    """Stopping the writer commits the buffer; later logs are written directly."""
+    db = Database(db_path)
+    writer = db.buffer_logs(max_pending=5)
+    for n in range(50):
+        db.log_error("processing_error", f"boom {n}", "owner/app", n)
+    db.unbuffer_logs()
+
+    assert _count(db_path, "error_log") == 50
+    assert writer.stats["written"] == 50
+    assert writer.stats["batches"] < 50
+
+    db.log_error("processing_error", "direct")
+    assert db.log_writer is None
+    assert _count(db_path, "error_log") == 51
+
+
+def _run_loop(db, iterations=100):
+    """A processing loop's database writes; returns the loop's iterations per second."""
+    start = time.perf_counter()
+    for n in range(iterations):
+        attempt = db.record_trigger("owner/app", n)
+        db.update_trigger(attempt, "unknown")
+        db.log_error("processing_error", "No Traycer reply", "owner/app", n)
+    elapsed = time.perf_counter() - start
+    db.flush_logs()
+    return iterations / elapsed
+
+
+def test_loop_waits_on_fewer_commits_with_buffer(db_path):
+    """Buffering moves two of the loop's three commits per issue to the writer thread."""
+    direct = SlowDiskDatabase(db_path)
+    _run_loop(direct)
+
+    db = SlowDiskDatabase(db_path)
+    writer = db.buffer_logs()
+    _run_loop(db)
+    db.unbuffer_logs()
+
+    assert _count(db_path, "error_log") == 200
+    # record_trigger stays synchronous: the attempt row must exist before the toggle
+    assert direct.transactions[threading.get_ident()] == 300
+    assert db.transactions[threading.get_ident()] == 100
+    assert writer.stats["written"] == 200
+
+
+@pytest.mark.benchmark
+def test_loop_throughput_with_and_without_buffer(db_path, capsys):
+    """Benchmark (opt-in: pytest -m benchmark): loop throughput when every commit is slow."""
+    direct = _run_loop(SlowDiskDatabase(db_path))
+
+    db = SlowDiskDatabase(db_path)
+    db.buffer_logs()
+    buffered = _run_loop(db)
+    db.unbuffer_logs()
+
+    with capsys.disabled():
+        print(f"\nloop throughput: {direct:.0f}/s direct, {buffered:.0f}/s buffered")
+    assert _count(db_path, "error_log") == 200
+
+
+class LockedDatabase(Database):
+    """Database whose log writes fail while `locked_writes` is positive."""
+
+    locked_writes = 0
+
+    def write_logs(self, rows):
+        if self.locked_writes:
+            self.locked_writes -= 1
+            raise sqlite3.OperationalError("database is locked")
+        super().write_logs(rows)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(LogWriter, "RETRY_BACKOFF_SECONDS", 0.001)
+
+
+def test_failed_batch_is_kept_and_retried(db_path, no_backoff):
+    """A batch that hits a locked database is retried, not dropped."""
+    db = LockedDatabase(db_path)
+    writer = db.buffer_logs()
+    db.locked_writes = 2
+    for n in range(10):
+        db.log_error("processing_error", f"boom {n}", "owner/app", n)
+    db.flush_logs()
+
+    assert _count(db_path, "error_log") == 10
+    assert (writer.stats["failed_writes"], writer.stats["dropped"]) == (2, 0)
+    assert db.tracer.counters["log_write_failures"] == 2
+    db.unbuffer_logs()
+
+
+def test_batch_dropped_after_max_attempts_is_counted(db_path, no_backoff):
+    """A batch that never commits is dropped after MAX_WRITE_ATTEMPTS, visibly."""
+    db = LockedDatabase(db_path)
+    writer = db.buffer_logs()
+    db.locked_writes = LogWriter.MAX_WRITE_ATTEMPTS
+    db.log_processing("owner/app", 1, success=True)
+    db.flush_logs()
+    db.log_processing("owner/app", 2, success=True)
+    db.unbuffer_logs()
+
+    assert _count(db_path, "processing_history") == 1
+    assert writer.stats["dropped"] == 1
+    assert db.tracer.counters["log_rows_dropped"] == 1
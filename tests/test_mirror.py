@@ -0,0 +1,210 @@
+"""Tests for the local GitHub mirror and the mirror scan backend."""
+
+import tempfile
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe import mirror
+from codeframe.comment_parser import ANALYSIS, RATE_LIMITED, parse_comment
+from codeframe.database import Database
+from codeframe.scanner import IssueScanner, MirrorScanner
+
+BOT = IssueScanner.TRAYCER_BOT_LOGIN
+RATE_LIMIT_BODY = "Rate limit exceeded. Please try after 1800 seconds."
+START = datetime.now(UTC).replace(microsecond=0)
+
+
+class FakeUser:
+    def __init__(self, login):
+        self.login = login
+
+
+class FakeLabel:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeComment:
+    def __init__(self, comment_id, author, body, at):
+        self.id = comment_id
+        self.user = FakeUser(author)
+        self.body = body
+        self.created_at = self.updated_at = at
+
+
+class FakePages(list):
+    """Listing with PaginatedList's get_page, at the scanner's page size."""
+
+    def get_page(self, page, per_page=100):
+        return self[page * per_page : (page + 1) * per_page]
+
+
+class FakeIssue:
+    """Issue with PyGithub's shape: `comments` is the count, get_comments the listing."""
+
+    def __init__(self, number, at, labels=()):
+        self.number = number
+        self.title = f"Issue {number}"
+        self.state = "open"
+        self.pull_request = None
+        self.assignees = []
+        self.labels = [FakeLabel(name) for name in labels]
+        self.created_at = self.updated_at = at
+        self.thread = []
+        self.comment_queries = []
+
+    @property
+    def comments(self):
+        return len(self.thread)
+
+    def comment(self, comment_id, author, body, at):
+        self.thread.append(FakeComment(comment_id, author, body, at))
+        self.updated_at = at
+
+    def get_comments(self, since=None):
+        self.comment_queries.append(since)
+        return FakePages(c for c in self.thread if since is None or c.updated_at >= since)
+
+
+class FakeRepo:
+    """Repository serving get_issues like GitHub: open only, or everything updated since."""
+
+    def __init__(self, full_name, issues):
+        self.full_name = full_name
+        self.fork = False
+        self.has_issues = True
+        self.issues = issues
+        self.issue_queries = []
+
+    def get_issues(self, state="open", since=None):
+        self.issue_queries.append((state, since))
+        return FakePages(
+            issue
+            for issue in self.issues
+            if (state == "all" or issue.state == state)
+            and (since is None or issue.updated_at >= since)
+        )
+
+
+class FakeGithub:
+    rate_limiting = (-1, -1)
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+@pytest.fixture
+def scanner(db):
+    """MirrorScanner talking to fake GitHub objects."""
+    scanner = MirrorScanner("unused-token", db)
+    scanner.pool.github = FakeGithub()
+    return scanner
+
+
+def _past(minutes):
+    return START - timedelta(minutes=minutes)
+
+
+def test_first_sync_mirrors_open_issues_and_queues_rate_limited(db, scanner):
+    """The latest Traycer comment decides, read from the mirror."""
+    limited = FakeIssue(1, _past(120), labels=("bug",))
+    limited.comment(10, BOT, "## Analysis", _past(100))
+    limited.comment(11, "someone", "please re-run", _past(90))
+    limited.comment(12, BOT, RATE_LIMIT_BODY, _past(80))
+    handled = FakeIssue(2, _past(120))
+    handled.comment(20, BOT, RATE_LIMIT_BODY, _past(100))
+    handled.comment(21, BOT, "## Analysis", _past(50))
+    repo = FakeRepo("owner/app", [limited, handled, FakeIssue(3, _past(10))])
+
+    assert scanner._scan_repo(repo) == 1
+
+    (queued,) = db.get_issues_ready_for_processing()
+    assert (queued["issue_number"], queued["labels"]) == (1, "bug")
+    assert queued["rate_limited_at"] == _past(80)
+    assert repo.issue_queries == [("open", None)]
+    comment = db.get_latest_mirror_comment("owner/app", 2, BOT)
+    assert (comment.comment_id, comment.kind) == (21, ANALYSIS)
+
+
+def test_later_syncs_fetch_only_changes(db, scanner):
+    """A re-sync lists issues updated since the last sync and drops closed ones."""
+    quiet = FakeIssue(1, _past(120))
+    quiet.comment(10, BOT, RATE_LIMIT_BODY, _past(100))
+    busy = FakeIssue(2, _past(120))
+    repo = FakeRepo("owner/app", [quiet, busy])
+    scanner.mirror.sync_repo(repo)
+    synced_at = db.get_mirror_synced_at("owner/app")
+
+    quiet.state = "closed"
+    quiet.updated_at = datetime.now(UTC)
+    busy.comment(20, BOT, RATE_LIMIT_BODY, datetime.now(UTC))
+    assert scanner.mirror.sync_repo(repo) == 2
+
+    assert repo.issue_queries[-1] == ("all", synced_at)
+    assert busy.comment_queries == [synced_at]  # Never listed before it had comments
+    assert db.get_latest_mirror_comment("owner/app", 1, BOT) is None
+    rows = db.get_latest_mirror_comments("owner/app", BOT)
+    assert [(row["issue_number"], row["kind"]) for row in rows] == [(2, RATE_LIMITED)]
+
+
+def test_refresh_issue_fetches_from_newest_mirrored_comment(db, scanner):
+    """A result check only asks for comments newer than the mirror has."""
+    issue = FakeIssue(1, _past(120))
+    issue.comment(10, BOT, RATE_LIMIT_BODY, _past(60))
+    assert scanner.mirror.refresh_issue("owner/app", issue).kind == RATE_LIMITED
+
+    issue.comment(11, BOT, "## Analysis", _past(1))
+    parsed = scanner.mirror.refresh_issue("owner/app", issue)
+
+    assert parsed.kind == ANALYSIS
+    assert issue.comment_queries == [None, _past(60)]
+
+
+def test_walk_check_parses_each_comment_version_once(db, scanner, monkeypatch):
+    """The walk scanner's comment check reuses classifications stored in the mirror."""
+    parsed = []
+    monkeypatch.setattr(
+        mirror, "parse_comment", lambda body: parsed.append(body) or parse_comment(body)
+    )
+    issue = FakeIssue(1, _past(120))
+    issue.comment(10, BOT, "## Analysis", _past(100))
+    issue.comment(11, BOT, RATE_LIMIT_BODY, _past(60))
+
+    first = scanner._check_for_rate_limit("owner/app", issue)
+    second = scanner._check_for_rate_limit("owner/app", issue)
+    assert first == second
+    assert (first.seconds, first.comment_created_at) == (1800, _past(60))
+    assert len(parsed) == 2
+
+    # An edited comment is a new version and is classified again
+    issue.thread[-1].body = "## Analysis"
+    issue.thread[-1].updated_at = _past(1)
+    assert scanner._check_for_rate_limit("owner/app", issue) is None
+    assert len(parsed) == 3
+
+
+def test_summary_reads_repo_status_locally(db, scanner):
+    """Repo status combines mirror counts with the queue."""
+    commented = FakeIssue(1, _past(120))
+    commented.assignees = [FakeUser("owner")]
+    commented.comment(10, BOT, RATE_LIMIT_BODY, _past(100))
+    scanner._scan_repo(FakeRepo("owner/app", [commented, FakeIssue(2, _past(30))]))
+    scanner._scan_repo(FakeRepo("owner/empty", []))
+
+    app, empty = db.get_mirror_summary(BOT)
+
+    assert (app["repo_name"], app["open_issues"], app["unassigned"]) == ("owner/app", 2, 1)
+    assert (app["commented"], app["queued"], app["dead_letters"]) == (1, 1, 0)
+    assert (empty["repo_name"], empty["open_issues"], empty["commented"]) == ("owner/empty", 0, 0)
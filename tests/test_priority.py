@@ -0,0 +1,59 @@
+"""Tests for queue priority policies."""
+
+import sqlite3
+import time
+
+import pytest
+
+from codeframe.priority import (
+    CompositePriority,
+    ExplicitPriority,
+    IssueAgePriority,
+    IssueContext,
+    LabelPriority,
+    RetryCountPriority,
+    parse_weights,
+)
+
+
+def test_label_priority_is_case_insensitive():
+    """Test that label weights match regardless of case and add up."""
+    policy = LabelPriority({"Bug": 10, "urgent": 50})
+    issue = IssueContext("owner/repo", 1, labels=("bug", "URGENT", "docs"))
+
+    assert policy.score(issue) == 60
+
+
+def test_age_priority_is_capped():
+    """Test that issue age contributes at most max_points, computed in SQL."""
+    now = int(time.time())
+    expression, params = CompositePriority(
+        [ExplicitPriority(), IssueAgePriority(points_per_day=2, max_points=10)]
+    ).sql_score(now)
+    conn = sqlite3.connect(":memory:")
+
+    def age_points(created_at):
+        query = f"SELECT {expression} FROM (SELECT ? AS issue_created_at)"
+        return conn.execute(query, (*params, created_at)).fetchone()[0]
+
+    assert age_points(now - 90 * 86400) == 10
+    assert age_points(now - 2 * 86400 - 60) == 4
+    assert age_points(None) == 0
+
+
+def test_composite_priority_sums_policies():
+    """Test that composite scoring combines explicit, label and retry scores."""
+    policy = CompositePriority(
+        [ExplicitPriority(weight=100), LabelPriority({"bug": 20}), RetryCountPriority(5)]
+    )
+    issue = IssueContext("owner/app", 1, labels=("bug",), retry_count=2, priority=1)
+
+    assert policy.score(issue) == 100 + 20 - 10
+
+
+def test_parse_weights():
+    """Test parsing of name=points configuration strings."""
+    assert parse_weights("bug=10, owner/app=-5") == {"bug": 10, "owner/app": -5}
+    assert parse_weights(None) == {}
+    with pytest.raises(ValueError):
+        parse_weights("bug")
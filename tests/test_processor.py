@@ -0,0 +1,215 @@
+"""Tests for the processor's pre-flight gate and slot accounting."""
+
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from github import GithubException
+
+from codeframe.database import Database
+from codeframe.processor import QueueProcessor, check_preflight
+from codeframe.slot_calculator import SlotCalculator
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Database(Path(tmpdir) / "test.db")
+
+
+def test_preflight_empty_queue(db):
+    """An empty queue has nothing to wake up for."""
+    preflight = check_preflight(db)
+    assert not preflight.can_run
+    assert preflight.reason == "queue empty"
+    assert preflight.next_wake_at is None
+
+
+def test_preflight_wakes_at_earliest_retry(db):
+    """With nothing ready yet, the next wake is the earliest retry time."""
+    # Timestamps are stored in whole seconds
+    retry_at = datetime.now().replace(microsecond=0) + timedelta(minutes=20)
+    db.add_issue("owner/app", 1, retry_at)
+    db.add_issue("owner/app", 2, retry_at + timedelta(minutes=10))
+
+    preflight = check_preflight(db)
+    assert not preflight.can_run
+    assert preflight.reason == "no issues ready"
+    assert preflight.next_wake_at == retry_at.astimezone(UTC)
+
+
+def test_preflight_waits_for_slot_recharge(db):
+    """With every slot used by our own attempts, wake when the oldest recharges."""
+    db.add_issue("owner/app", 1, datetime.now() - timedelta(minutes=1))
+    for n in range(SlotCalculator.TOTAL_SLOTS):
+        db.log_processing("owner/app", 100 + n, success=True)
+
+    preflight = check_preflight(db)
+    assert not preflight.can_run
+    assert preflight.reason == "no slots"
+    wait = preflight.next_wake_at - datetime.now(UTC)
+    assert timedelta(minutes=29) < wait <= timedelta(minutes=30)
+
+
+def test_preflight_waits_for_open_breaker(db):
+    """An open systemic breaker blocks until its cooldown ends."""
+    db.add_issue("owner/app", 1, datetime.now() - timedelta(minutes=1))
+    now = time.time()
+    db.record_breaker_failure("error:auth", now, threshold=1, window_seconds=300)
+
+    preflight = check_preflight(db)
+    assert not preflight.can_run
+    assert preflight.reason == "circuit open"
+    assert preflight.next_wake_at.timestamp() == pytest.approx(now + 1800)
+
+
+def test_preflight_allows_run_when_work_is_possible(db):
+    """Ready issues, free slots and closed breakers let the full run go ahead."""
+    db.add_issue("owner/app", 1, datetime.now() - timedelta(minutes=1))
+    db.log_processing("owner/app", 100, success=True)
+
+    assert check_preflight(db).can_run
+
+
+class FakeTraycer:
+    """Traycer's quota for one user: each assignment spends a slot or earns a rate limit."""
+
+    def __init__(self, slots, slow=(), broken=()):
+        self.slots = slots
+        self.slow = set(slow)  # Issues whose reply is not posted yet when checked
+        self.broken = set(broken)  # Issues whose comment fetch fails with a 502
+        self.triggers = 0
+        self.wasted = 0  # Assignments made with no slot left
+
+
+class FakeComment:
+    def __init__(self, comment_id, body):
+        self.id = comment_id
+        self.body = body
+        self.user = type("User", (), {"login": "traycerai[bot]"})()
+        self.created_at = self.updated_at = datetime.now(UTC)
+
+
+class FakeIssue:
+    def __init__(self, traycer, number):
+        self.traycer = traycer
+        self.number = number
+        self.assignees = []
+        self.comments = []
+
+    def add_to_assignees(self, login):
+        self.traycer.triggers += 1
+        if self.traycer.slots:
+            self.traycer.slots -= 1
+            body = "## Analysis"
+        else:
+            self.traycer.wasted += 1
+            body = "Rate limit exceeded. Please try after 1800 seconds."
+        if self.number not in self.traycer.slow:
+            self.comments.append(FakeComment(self.number * 1000 + len(self.comments), body))
+
+    def get_comments(self, since=None):
+        return FakeComments(self, since)
+
+
+class FakeComments:
+    """Lazy comment listing: the request, and any failure, happens per page."""
+
+    def __init__(self, issue, since):
+        self.issue = issue
+        self.since = since
+
+    def get_page(self, page):
+        if self.issue.number in self.issue.traycer.broken:
+            raise GithubException(502, {"message": "Bad Gateway"}, {})
+        if page:
+            return []
+        return [c for c in self.issue.comments if self.since is None or c.updated_at >= self.since]
+
+
+class FakeRepo:
+    def __init__(self, traycer):
+        self.traycer = traycer
+
+    def get_issue(self, number):
+        return FakeIssue(self.traycer, number)
+
+
+class FakeGithub:
+    rate_limiting = (-1, -1)
+
+    def __init__(self, traycer):
+        self.traycer = traycer
+
+    def get_repo(self, name):
+        return FakeRepo(self.traycer)
+
+
+def test_replay_counts_every_trigger_attempt(db, monkeypatch):
+    """Attempts without a clear reply still hold slots, so the next window sends nothing.
+
+    Window 1 spends all 15 of Traycer's slots, but 5 replies are not posted in
+    time and 2 comment fetches fail. Counting only confirmed outcomes left 7
+    phantom free slots, and window 2 sent 7 assignments straight into rate limits.
+    """
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(SlotCalculator, "_detect_external_traycer_activity", lambda self: 0)
+    traycer = FakeTraycer(SlotCalculator.TOTAL_SLOTS, slow=range(1, 6), broken=(6, 7))
+    processor = QueueProcessor("token", "user", db)
+    processor.pool.github = FakeGithub(traycer)
+
+    ready = datetime.now() - timedelta(minutes=1)
+    for number in range(1, 16):
+        db.add_issue(f"owner/app{number % 5}", number, ready)
+    stats = processor.process_queue()
+    assert (stats["processed"], stats["succeeded"]) == (15, 8)
+
+    for number in range(101, 111):
+        db.add_issue("owner/new", number, ready)
+    processor.process_queue()
+
+    assert traycer.triggers == 15
+    assert traycer.wasted == 0
+    outcomes = sorted(record.outcome for record in db.get_recent_processing_history(typed=True))
+    assert outcomes == ["error"] * 2 + ["success"] * 8 + ["unknown"] * 5
+
+
+def test_unknown_result_backs_off_then_dead_letters(db, monkeypatch):
+    """An issue with no Traycer reply is rescheduled, not retried on the next run."""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(SlotCalculator, "_detect_external_traycer_activity", lambda self: 0)
+    processor = QueueProcessor("token", "user", db)
+    processor.pool.github = FakeGithub(FakeTraycer(SlotCalculator.TOTAL_SLOTS, slow=[1]))
+    db.add_issue("owner/app", 1, datetime.now() - timedelta(minutes=1))
+
+    processor.process_queue()
+    assert db.count_queued_issues() == 1
+    assert db.count_ready_issues() == 0
+
+    # Last allowed attempt: moved aside, not deleted
+    processor._reschedule(next(db.iter_queued_issues()), "unknown", "Unknown result")
+    processor._reschedule(next(db.iter_queued_issues()), "unknown", "Unknown result")
+    assert db.count_queued_issues() == 0
+    (dead,) = db.get_dead_letters()
+    assert (dead["issue_number"], dead["error_class"], dead["retry_count"]) == (1, "unknown", 3)
+
+
+def test_skipped_issues_do_not_cost_fair_share(db, monkeypatch):
+    """A repo whose issue is in flight elsewhere keeps the credit for its unused slot."""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(SlotCalculator, "_detect_external_traycer_activity", lambda self: 0)
+    processor = QueueProcessor("token", "user", db)
+    processor.pool.github = FakeGithub(FakeTraycer(SlotCalculator.TOTAL_SLOTS))
+    ready = datetime.now() - timedelta(minutes=1)
+    db.add_issue("owner/busy", 1, ready)
+    db.add_issue("owner/idle", 1, ready)
+    assert db.claim_issue("owner/busy", 1, lease_seconds=600)  # Another run holds it
+
+    stats = processor.process_queue()
+
+    assert stats["processed"] == 1
+    state = db.get_fair_share_state()
+    assert (state["owner/idle"]["slots_used"], state["owner/idle"]["deficit"]) == (1, 0.0)
+    assert (state["owner/busy"]["slots_used"], state["owner/busy"]["deficit"]) == (0, 1.0)
@@ -0,0 +1,90 @@
+"""Tests for the shared GitHub API rate budget."""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.rate_budget import RateBudget, RateBudgetExceededError
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+def _headers(remaining, limit=5000, reset_in=3600, resource="core"):
+    """Build X-RateLimit-* response headers."""
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_budget_shared_across_components(db):
+    """Test that quota seen by one component is visible to another via the database."""
+    scanner_budget = RateBudget(db, "scanner")
+    scanner_budget.observe_headers(_headers(remaining=4000))
+
+    processor_budget = RateBudget(db, "processor")
+    snap = processor_budget.snapshot("core")
+
+    assert snap is not None
+    assert snap.remaining == 4000
+
+
+def test_scanner_defers_inside_processor_reserve(db):
+    """Test that non-priority components stop before the processor's reserve."""
+    budget = RateBudget(db, "scanner")
+    budget.observe_headers(_headers(remaining=RateBudget.PROCESSOR_RESERVE["core"]))
+
+    assert budget.check("core") > RateBudget.MAX_THROTTLE_SECONDS
+    with pytest.raises(RateBudgetExceededError):
+        budget.acquire("core")
+
+
+def test_processor_may_spend_reserve(db):
+    """Test that the processor can use the reserved headroom."""
+    RateBudget(db, "scanner").observe_headers(_headers(remaining=10))
+
+    budget = RateBudget(db, "processor")
+
+    assert budget.check("core", cost=10) == 0
+    assert budget.check("core", cost=11) > 0
+
+
+def test_expired_window_does_not_block(db):
+    """Test that a snapshot whose reset time has passed never blocks calls."""
+    budget = RateBudget(db, "scanner")
+    budget.observe_headers(_headers(remaining=0, reset_in=-1))
+
+    assert budget.check("core") == 0
+
+
+def test_call_counts_flushed_per_component(db):
+    """Test that per-component call counts accumulate in the database."""
+    budget = RateBudget(db, "scanner")
+    with budget.track("gh.search_issues", resource="search"):
+        pass
+    with budget.track("gh.search_issues", resource="search"):
+        pass
+    budget.flush()
+
+    counts = db.get_api_call_counts(days=1)
+
+    assert len(counts) == 1
+    assert counts[0]["component"] == "scanner"
+    assert counts[0]["resource"] == "search"
+    assert counts[0]["calls"] == 2
@@ -0,0 +1,86 @@
+"""Tests for retry/backoff policies."""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from codeframe.retry_policy import (
+    PERMANENT,
+    RATE_LIMITED,
+    UNKNOWN,
+    Backoff,
+    RateLimitSchedule,
+    RetryPolicy,
+    retry_policy_from_env,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def _delays(policy, error_class, attempt, count=200, wait_seconds=None):
+    """Seconds until retry for `count` issues failing together."""
+    return [
+        (policy.next_retry_at(error_class, attempt, wait_seconds, now=NOW) - NOW).total_seconds()
+        for _ in range(count)
+    ]
+
+
+def test_backoff_grows_exponentially_within_jitter():
+    schedule = Backoff(max_attempts=10, base_seconds=100, factor=2, max_seconds=1000, jitter=0.25)
+    rng = random.Random(1)
+
+    for attempt, expected in [(1, 100), (2, 200), (3, 400), (4, 800), (5, 1000), (9, 1000)]:
+        delay = schedule.delay(attempt, None, rng)
+        assert expected * 0.75 <= delay <= expected * 1.25
+
+
+def test_retries_of_issues_failing_together_spread_out():
+    """Jitter keeps a burst of failures from coming due at the same moment."""
+    policy = RetryPolicy({UNKNOWN: Backoff(max_attempts=5, base_seconds=600)}, rng=random.Random(7))
+
+    delays = _delays(policy, UNKNOWN, attempt=1)
+
+    assert len(set(delays)) == len(delays)
+    assert max(delays) - min(delays) > 240  # Most of the +/-25% band (300s wide)
+    assert statistics.pstdev(delays) > 60
+
+
+def test_successive_retries_of_one_issue_spread_out():
+    """Each further failure pushes the next attempt further away."""
+    policy = RetryPolicy({UNKNOWN: Backoff(max_attempts=6, base_seconds=60, jitter=0.1)})
+
+    means = [statistics.mean(_delays(policy, UNKNOWN, attempt)) for attempt in range(1, 6)]
+
+    assert all(later > 1.5 * earlier for earlier, later in zip(means, means[1:]))
+
+
+def test_rate_limit_schedule_never_retries_before_traycer_wait():
+    policy = RetryPolicy({RATE_LIMITED: RateLimitSchedule(buffer_seconds=120, jitter_seconds=120)})
+
+    delays = _delays(policy, RATE_LIMITED, attempt=1, wait_seconds=1800)
+
+    assert min(delays) >= 1800 + 120
+    assert max(delays) <= 1800 + 240
+    assert statistics.pstdev(delays) > 20
+
+
+def test_exhausted_and_permanent_errors_are_dead_lettered():
+    policy = retry_policy_from_env()
+
+    assert policy.next_retry_at(PERMANENT, 1) is None
+    assert policy.next_retry_at(UNKNOWN, 2) is not None
+    assert policy.next_retry_at(UNKNOWN, 3) is None
+    assert policy.next_retry_at("server", 3) is not None
+    assert policy.next_retry_at("server", 4) is None
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("CODEFRAME_RETRY_MAX_ATTEMPTS", "transient=2,unknown=5")
+    monkeypatch.setenv("CODEFRAME_RETRY_BASE_SECONDS", "network=10")
+    monkeypatch.setenv("CODEFRAME_RETRY_JITTER", "0")
+    policy = retry_policy_from_env()
+
+    assert policy.schedule("server").max_attempts == 2
+    assert policy.schedule("auth").max_attempts == 2
+    assert policy.schedule(UNKNOWN).max_attempts == 5
+    assert policy.next_retry_at("network", 1, now=NOW) == NOW + timedelta(seconds=10)
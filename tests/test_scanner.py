@@ -0,0 +1,142 @@
+"""Tests for scanner scoping and the search backend."""
+
+import tempfile
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.scanner import IssueScanner, RepoScope, SearchScanner
+
+
+def test_scope_without_globs_matches_everything():
+    """Test that an empty scope keeps every repo."""
+    assert RepoScope().matches("owner/anything")
+
+
+def test_scope_include_and_exclude_globs():
+    """Test include/exclude glob filtering of repo names."""
+    scope = RepoScope(include=("owner/api-*", "owner/web"), exclude=("*-archive",))
+
+    assert scope.matches("owner/api-users")
+    assert scope.matches("owner/web")
+    assert not scope.matches("owner/cli")
+    assert not scope.matches("owner/api-archive")
+
+
+class FakeSearchResults(list):
+    """Search result list with GitHub's totalCount, capped at 1000 items like the API."""
+
+    def __init__(self, issues):
+        super().__init__(issues[:1000])
+        self.totalCount = len(issues)
+
+    def get_page(self, page, per_page=100):
+        return self[page * per_page : (page + 1) * per_page]
+
+
+class FakeIssue:
+    """Just the fields SearchScanner reads from a search hit."""
+
+    def __init__(self, repo_name, number, updated_at):
+        self.repository_url = f"https://api.github.com/repos/{repo_name}"
+        self.number = number
+        self.updated_at = updated_at
+
+
+class FakeSearchGithub:
+    """Serves issue search over an in-memory issue list, honoring updated: ranges."""
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.queries = []
+        self.rate_limiting = (-1, -1)
+
+    def search_issues(self, query, **kwargs):
+        self.queries.append(query)
+        bounds = query.split("updated:", 1)[1].split("..")
+        since, until = (datetime.fromisoformat(b.replace("Z", "+00:00")) for b in bounds)
+        return FakeSearchResults([i for i in self.issues if since <= i.updated_at <= until])
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+def _search_scanner(db, issues):
+    """Build a SearchScanner that talks to a fake search backend."""
+    scanner = SearchScanner("unused-token", db)
+    scanner.github = FakeSearchGithub(issues)
+    scanner.user = type("User", (), {"login": "owner"})()
+    return scanner
+
+
+def test_search_splits_date_range_to_stay_under_cap(db):
+    """Test that >1000 hits are fetched by bisecting the updated: range."""
+    until = datetime(2026, 1, 2, tzinfo=UTC)
+    since = until - timedelta(days=1)
+    issues = [
+        FakeIssue("owner/app", n, since + timedelta(seconds=n * 30)) for n in range(2500)
+    ]
+    scanner = _search_scanner(db, issues)
+
+    candidates = scanner._search_candidates(since, until)
+
+    assert candidates is not None
+    assert len(candidates) == 2500
+    assert len(scanner.github.queries) > 1
+
+
+def test_search_gives_up_when_range_cannot_be_split(db):
+    """Test that an unsplittable over-cap range signals fallback to the full walk."""
+    moment = datetime(2026, 1, 1, tzinfo=UTC)
+    issues = [FakeIssue("owner/app", n, moment) for n in range(1200)]
+    scanner = _search_scanner(db, issues)
+
+    assert scanner._search_candidates(moment - timedelta(hours=1), moment) is None
+
+
+class FakeActiveGithub:
+    """Serves the Traycer-active search and records which repos are fetched."""
+
+    def __init__(self, repo_names):
+        self.repo_names = repo_names
+        self.queries = []
+        self.fetched = []
+        self.rate_limiting = (-1, -1)
+
+    def search_issues(self, query, **kwargs):
+        self.queries.append(query)
+        moment = datetime(2026, 1, 1, tzinfo=UTC)
+        return FakeSearchResults([FakeIssue(name, 1, moment) for name in self.repo_names])
+
+    def get_repo(self, name):
+        self.fetched.append(name)
+        return name
+
+
+def test_active_repos_are_fetched_directly(db):
+    """Test that only open-issue Traycer repos are fetched, without listing every repo."""
+    scanner = IssueScanner("unused-token", db)
+    scanner.github = FakeActiveGithub(["owner/web", "owner/api", "owner/api-archive"])
+
+    def get_repos():
+        raise AssertionError("every owned repo was listed")
+
+    scanner.user = type("User", (), {"login": "owner", "get_repos": staticmethod(get_repos)})()
+
+    repos = scanner._list_repos(RepoScope(exclude=("*-archive",)))
+
+    assert "is:open" in scanner.github.queries[0]
+    assert repos == ["owner/api", "owner/web"]
+    assert scanner.github.fetched == ["owner/api", "owner/web"]
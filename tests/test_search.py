@@ -0,0 +1,119 @@
+"""Tests for full-text search over Traycer comments and queue errors."""
+
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+
+BOT = "traycerai[bot]"
+AT = datetime(2026, 1, 1, 9, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+def _comment(comment_id, body, repo_name="owner/app", issue_number=1, updated_at=AT):
+    return (comment_id, repo_name, issue_number, BOT, AT, updated_at, body)
+
+
+def test_search_ranks_comments_with_snippets(db):
+    """Matches come back best first, with the matched words bracketed."""
+    db.index_comments(
+        [
+            _comment(1, "Rate limit exceeded. Please try after 1800 seconds."),
+            _comment(2, "## Analysis\nThe webhook handler times out when the timeout is short."),
+            _comment(3, "## Analysis\nUnrelated refactoring plan.", issue_number=2),
+        ]
+    )
+
+    (result,) = db.search("timeout")
+
+    assert (result["source"], result["repo_name"], result["issue_number"]) == (
+        "comment",
+        "owner/app",
+        1,
+    )
+    assert result["author"] == BOT
+    assert result["at"] == AT
+    assert "[timeout]" in result["snippet"]
+    assert [r["snippet"].count("[") for r in db.search("rate limit")] == [2]
+
+
+def test_reindexing_skips_unchanged_and_replaces_edited(db):
+    """Scans can pass every comment; only new or edited ones are written."""
+    assert db.index_comments([_comment(1, "first draft")]) == 1
+    assert db.index_comments([_comment(1, "first draft")]) == 0
+
+    edited = AT + timedelta(minutes=5)
+    assert db.index_comments([_comment(1, "second version", updated_at=edited)]) == 1
+
+    assert db.search("draft") == []
+    assert len(db.search("second")) == 1
+
+
+def test_queue_errors_are_searchable(db):
+    """A queued issue's last_error is indexed when it is recorded, replacing the previous one."""
+    db.add_issue("owner/app", 7)
+    db.increment_retry_count("owner/app", 7, "GitHub API error: 502 - Bad Gateway")
+    db.increment_retry_count("owner/app", 7, "Unknown result")
+    db.index_comments([_comment(1, "Unknown dependency in the build")])
+
+    assert db.search("gateway") == []
+    (error,) = db.search("unknown", source="error")
+    assert (error["repo_name"], error["issue_number"], error["author"]) == ("owner/app", 7, None)
+    assert len(db.search("unknown")) == 2
+
+    db.dead_letter_issue("owner/app", 7, "GitHub API error: 404 - Not Found", "permanent")
+    assert len(db.search("found", source="error", repo_name="owner/app")) == 1
+
+
+def test_invalid_query_syntax_searches_words(db):
+    """Stray FTS5 operators do not fail the search."""
+    db.index_comments([_comment(1, "Error: owner/app \"quoted\" failure")])
+
+    assert len(db.search('owner/app "quoted')) == 1
+    assert db.search('"') == []
+
+
+def test_throughput():
+    """Benchmark: queries over hundreds of thousands of comments take milliseconds."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+    db = Database(db_path)
+    words = ["timeout", "webhook", "refactor", "cache", "schema", "deploy", "retry", "token"]
+    comments = [
+        _comment(
+            n,
+            f"## Analysis {n}\nPlan: {words[n % 8]} and {words[n * 7 % 8]} changes in module "
+            f"m{n % 1000}. Steps follow for the {words[n * 3 % 8]} work.",
+            repo_name=f"owner/repo{n % 50}",
+            issue_number=n,
+        )
+        for n in range(1, 200_001)
+    ]
+    for offset in range(0, len(comments), 20_000):
+        db.index_comments(comments[offset : offset + 20_000])
+
+    queries = ['"webhook changes"', "m123", "deploy NOT retry", "sche*", "timeout"]
+    start = time.perf_counter()
+    for query in queries:
+        assert len(db.search(query, limit=20)) == 20
+    per_query = (time.perf_counter() - start) / len(queries)
+    db_path.unlink()
+
+    # Generous floor so slow CI machines pass; a LIKE scan takes far longer
+    assert per_query < 0.25
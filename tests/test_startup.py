@@ -0,0 +1,55 @@
+"""Startup-time guards for the cron entry points."""
+
+import subprocess
+import sys
+import textwrap
+
+HEAVY_MODULES = ("github", "requests", "urllib3", "jwt", "rich")
+
+# Cumulative import time budget for codeframe.processor; importing PyGithub
+# alone takes longer than this
+IMPORT_BUDGET_US = 250_000
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_processor_import_is_light():
+    """Importing the processor loads no heavy third-party modules (-X importtime)."""
+    result = run_python("import codeframe.processor", "-X", "importtime")
+
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+
+    assert not [name for name in imported if name.split(".")[0] in HEAVY_MODULES]
+    assert imported["codeframe.processor"] < IMPORT_BUDGET_US
+
+
+def test_no_work_run_makes_no_client(tmp_path):
+    """With nothing queued, a processor run builds no client and imports no PyGithub."""
+    result = run_python(
+        f"""
+        import sys
+        from codeframe.database import Database
+        from codeframe.processor import QueueProcessor
+
+        processor = QueueProcessor("token", "user", Database({str(tmp_path / "q.db")!r}))
+        for bucket in processor.buckets:
+            bucket.slot_calculator = None  # Any slot check would fail loudly
+        processor.process_queue()
+        assert "github" not in vars(processor.pool)
+        print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+        """
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,248 @@
+"""Tests for the rotating GitHub token pool."""
+
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from github import RateLimitExceededException
+
+from codeframe.database import Database
+from codeframe.rate_budget import RateBudget, RateBudgetExceededError
+from codeframe.scanner import IssueScanner, RepoScope
+from codeframe.token_pool import TokenPool, token_id
+
+# The scanner stops this far above zero, leaving the rest to the processor
+SCANNER_RESERVE = RateBudget.PROCESSOR_RESERVE["core"]
+
+
+class FakeGithub:
+    """Client that meters calls per token like GitHub's core limit."""
+
+    def __init__(self, pool, quota, retry_after=None):
+        self.pool = pool
+        self.remaining = {token: quota for token in pool.tokens}
+        self.limit = quota
+        self.reset_at = int(time.time()) + 3600
+        self.retry_after = retry_after  # Secondary limit on the first call, if set
+        self.calls = []
+
+    @property
+    def rate_limiting(self):
+        return self.remaining[self.token], self.limit
+
+    @property
+    def rate_limiting_resettime(self):
+        return self.reset_at
+
+    @property
+    def token(self):
+        return self.pool.tokens[self.pool.current]
+
+    def spend(self):
+        self.calls.append(self.token)
+        if self.retry_after is not None:
+            headers, self.retry_after = {"retry-after": str(self.retry_after)}, None
+            raise RateLimitExceededException(403, {"message": "secondary rate limit"}, headers)
+        if self.remaining[self.token] == 0:
+            headers = {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(self.reset_at)}
+            raise RateLimitExceededException(403, {"message": "API rate limit exceeded"}, headers)
+        self.remaining[self.token] -= 1
+
+    def get_repo(self, name):
+        self.spend()
+        return FakeRepo(self, name)
+
+
+class FakeRepo:
+    fork = False
+    has_issues = True
+
+    def __init__(self, github, name):
+        self.github = github
+        self.full_name = name
+
+    def get_issues(self, state):
+        return FakeListing(self.github, [])
+
+
+class FakeListing:
+    """Lazy paginated listing: every get_page is one metered request."""
+
+    def __init__(self, github, items, per_page=30, limited_page=None):
+        self.github = github
+        self.items = items
+        self.per_page = per_page
+        self.limited_page = limited_page  # Hits a secondary limit on its first request
+
+    def get_page(self, page):
+        if page == self.limited_page:
+            self.limited_page, self.github.retry_after = None, 60
+        self.github.spend()
+        return self.items[page * self.per_page : (page + 1) * self.per_page]
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """GitHub REST endpoint for GET /repos/{name}: token 'a' is out of core quota."""
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        token = self.headers["Authorization"].removeprefix("token ")
+        self.server.tokens_seen.append(token)
+        spent = token == "a"
+        body = json.dumps(
+            {"message": "API rate limit exceeded for user ID 1."}
+            if spent
+            else {"id": 1, "full_name": self.path.removeprefix("/repos/")}
+        ).encode()
+        self.send_response(403 if spent else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "0" if spent else "4999")
+        # Close enough that PyGithub's own retry would sleep and retry 'a' instead
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 2))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_url(monkeypatch):
+    """Local stand-in for api.github.com; yields the list of tokens that called it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    server.tokens_seen = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(TokenPool, "API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+
+    yield server.tokens_seen
+
+    server.shutdown()
+    server.server_close()
+
+
+def _error_types(db):
+    with db._get_connection() as conn:
+        return [row["error_type"] for row in conn.execute("SELECT error_type FROM error_log")]
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Database(Path(tmpdir) / "test.db")
+
+
+def test_pool_starts_with_token_that_has_most_quota(db):
+    """Quota persisted by earlier runs decides which token goes first."""
+    reset_at = int(time.time()) + 3600
+    db.save_rate_budget("core", 100, 5000, reset_at, token_id("a"))
+    db.save_rate_budget("core", 4000, 5000, reset_at, token_id("b"))
+    pool = TokenPool(db, "scanner", ["a", "b"])
+
+    assert pool.select("core") is pool.budgets[1]
+    assert pool.tokens[pool.current] == "b"
+
+
+def test_call_rotates_on_rate_limit_and_parks_token(db):
+    """An exhausted token is parked until reset and the call retried under the next."""
+    pool = TokenPool(db, "scanner", ["a", "b"])
+    pool.github = FakeGithub(pool, quota=1)
+    pool.github.remaining["a"] = 0
+
+    repo = pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+
+    assert repo.full_name == "owner/app"
+    assert pool.github.calls == ["a", "b"]
+    assert pool.tracer.counters["rate_limit_retries"] == 1
+    assert pool.budgets[0].check("core") > 3500
+    pool.flush()
+    assert db.get_rate_budget("core", token_id("a"))["remaining"] == 0
+
+
+def test_listing_pages_are_separate_calls(db):
+    """Each page is budgeted on its own; a rate limit on page k retries only page k."""
+    pool = TokenPool(db, "scanner", ["a", "b"])
+    pool.github = FakeGithub(pool, quota=SCANNER_RESERVE + 10)
+    listing = FakeListing(pool.github, list(range(70)), limited_page=1)
+
+    assert pool.fetch_all("github.get_issues", listing) == list(range(70))
+    # Page 1 goes to 'b' (its quota is unknown, so fullest); rejected there, only
+    # page 1 is refetched on 'a', which then serves page 2
+    assert pool.github.calls == ["a", "b", "a", "a"]
+    assert pool.tracer.counters["rate_limit_retries"] == 1
+    assert pool.github.remaining == {"a": SCANNER_RESERVE + 7, "b": SCANNER_RESERVE + 10}
+
+
+def test_real_client_rotates_on_rate_limit_response(db, api_url):
+    """PyGithub's requester hands a 403 rate-limit response to the pool instead of sleeping."""
+    pool = TokenPool(db, "processor", ["a", "b"])
+
+    repo = pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+
+    assert repo.full_name == "owner/app"
+    assert api_url == ["a", "b"]
+    assert pool.budgets[0].check("core") > 0
+    assert pool.tokens[pool.current] == "b"
+
+
+def test_using_pins_token_without_rotating(db, api_url):
+    """Calls inside using() are signed with the pinned token, even when it is spent."""
+    pool = TokenPool(db, "processor", ["b"])
+
+    with pool.using("c"):
+        repo = pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+    assert repo.full_name == "owner/app"
+    assert api_url == ["c"]
+
+    pool.github = FakeGithub(pool, quota=1)
+    pool.github.remaining["b"] = 0
+    with pool.using("b"), pytest.raises(RateBudgetExceededError):
+        pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+    assert pool.github.calls == ["b"]
+    assert pool.pinned is None
+
+
+def test_call_honors_retry_after(db):
+    """A secondary limit with a short Retry-After is waited out on a lone token."""
+    pool = TokenPool(db, "processor", ["a"])
+    pool.github = FakeGithub(pool, quota=10, retry_after=0)
+
+    pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+
+    assert pool.github.calls == ["a", "a"]
+
+
+def test_call_defers_when_every_token_is_spent(db):
+    pool = TokenPool(db, "scanner", ["a", "b"])
+    pool.github = FakeGithub(pool, quota=0)
+
+    with pytest.raises(RateBudgetExceededError):
+        pool.call("github.get_repo", lambda span: pool.github.get_repo("owner/app"))
+    assert pool.github.calls == ["a", "b"]
+
+
+def test_scan_completes_across_tokens(db):
+    """A scan costing more than one token's quota covers every repo in one pass."""
+    repos = tuple(f"owner/repo{n}" for n in range(10))  # 2 calls each
+    scanner = IssueScanner("a", db, tokens=["a", "b"])
+    scanner.pool.github = FakeGithub(scanner.pool, quota=SCANNER_RESERVE + 12)
+
+    assert scanner.scan_all_repos(RepoScope(repos=repos)) == (10, 0)
+    assert _error_types(db) == []
+    assert set(scanner.pool.github.calls) == {"a", "b"}
+
+
+def test_scan_stops_early_when_pool_is_spent(db):
+    """With quota for neither token, the scan stops cleanly instead of skipping repos."""
+    repos = tuple(f"owner/repo{n}" for n in range(10))
+    scanner = IssueScanner("a", db)
+    scanner.pool.github = FakeGithub(scanner.pool, quota=SCANNER_RESERVE + 12)
+
+    # Listing takes 10 calls; the quota runs out on the third repo's issues
+    assert scanner.scan_all_repos(RepoScope(repos=repos)) == (3, 0)
+    assert _error_types(db) == ["rate_budget"]
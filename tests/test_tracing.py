@@ -0,0 +1,93 @@
+"""Tests for tracing instrumentation."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.tracing import JsonLinesSink, Tracer, summarize_trace
+
+
+@pytest.fixture
+def trace_path():
+    """Create a temporary trace file path."""
+    with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as f:
+        path = Path(f.name)
+
+    yield path
+
+    path.unlink()
+
+
+def test_spans_and_counters_written_on_close(trace_path):
+    """Test that a run writes one line per span plus a run summary."""
+    tracer = Tracer("processor", JsonLinesSink(trace_path))
+
+    with tracer.span("github.get_issue") as span:
+        span["bytes"] = 42
+    with tracer.span("db.add_issue"):
+        pass
+    tracer.count("cache_hits", 3)
+    tracer.close(processed=1)
+
+    events = [json.loads(line) for line in trace_path.read_text().splitlines()]
+
+    assert [e["type"] for e in events] == ["span", "span", "run"]
+    assert events[0]["attrs"] == {"bytes": 42}
+    assert events[2]["counters"]["api_calls"] == 1
+    assert events[2]["counters"]["cache_hits"] == 3
+    assert events[2]["summary"] == {"processed": 1}
+
+
+def test_span_records_exception(trace_path):
+    """Test that a failing span is recorded with its error type."""
+    tracer = Tracer("scanner", JsonLinesSink(trace_path))
+
+    with pytest.raises(ValueError):
+        with tracer.span("github.get_comments"):
+            raise ValueError("boom")
+    tracer.close()
+
+    assert tracer.spans[0]["error"] == "ValueError"
+
+
+def test_database_methods_are_traced(trace_path):
+    """Test that Database query methods emit db.* spans."""
+    tracer = Tracer("test", JsonLinesSink(trace_path))
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    try:
+        db = Database(db_path, tracer=tracer)
+        db.add_issue("owner/repo", 1)
+        db.get_issues_ready_for_processing()
+        tracer.close()
+    finally:
+        db_path.unlink()
+
+    summary = summarize_trace(trace_path)
+
+    assert summary["spans"]["db.add_issue"]["count"] == 1
+    assert summary["spans"]["db.get_issues_ready_for_processing"]["count"] == 1
+    assert len(summary["runs"]) == 1
+
+
+def test_untraced_databases_keep_separate_counters():
+    """Components built without a tracer do not share counts."""
+    paths = []
+    for _ in range(2):
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            paths.append(Path(f.name))
+
+    try:
+        first, second = (Database(path) for path in paths)
+        first.add_issue("owner/repo", 1)
+    finally:
+        for path in paths:
+            path.unlink()
+
+    assert first.tracer is not second.tracer
+    assert first.tracer.counters["calls.db.add_issue"] == 1
+    assert "calls.db.add_issue" not in second.tracer.counters
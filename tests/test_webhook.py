@@ -0,0 +1,168 @@
+"""Tests for the webhook receiver, replaying recorded payloads against a local server."""
+
+import hashlib
+import hmac
+import http.client
+import sqlite3
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from codeframe.database import Database
+from codeframe.webhook import WebhookReceiver, verify_signature
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+SECRET = "test-secret"
+
+
+class LockedOnceDatabase(Database):
+    """Database whose first queue write fails as if the processor held the lock."""
+
+    locked = True
+
+    def add_issues(self, issues):
+        if self.locked:
+            self.locked = False
+            raise sqlite3.OperationalError("database is locked")
+        return super().add_issues(issues)
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = Path(f.name)
+
+    database = Database(db_path)
+    yield database
+
+    # Cleanup
+    db_path.unlink()
+
+
+@pytest.fixture
+def server(db):
+    """Run a receiver on a free local port."""
+    receiver = WebhookReceiver(db, SECRET)
+    httpd = receiver.make_server(port=0)
+    receiver.start()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield receiver, f"http://127.0.0.1:{httpd.server_address[1]}/"
+
+    httpd.shutdown()
+    httpd.server_close()
+    receiver.stop()
+
+
+def _deliver(url, fixture, event="issue_comment", secret=SECRET):
+    """POST a recorded payload the way GitHub does; return the status code."""
+    body = (FIXTURES / fixture).read_bytes()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    request = urllib.request.Request(
+        url,
+        data=body,
+        headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_verify_signature():
+    """Test HMAC signature verification."""
+    body = b'{"zen": "hi"}'
+    good = "sha256=" + hmac.new(b"s", body, hashlib.sha256).hexdigest()
+
+    assert verify_signature("s", body, good)
+    assert not verify_signature("other", body, good)
+    assert not verify_signature("s", body, None)
+
+
+@pytest.mark.parametrize(
+    "fixture", ["issue_comment_rate_limited.json", "issue_comment_rate_limited_wrapped.json"]
+)
+def test_rate_limit_comment_is_queued(server, db, fixture):
+    """Test that a replayed rate-limit comment, single-line or wrapped, lands in the queue."""
+    receiver, url = server
+
+    assert _deliver(url, fixture) == 202
+    receiver.stop()
+
+    rows = db.get_issues_ready_for_processing()
+    assert [(r["repo_name"], r["issue_number"]) for r in rows] == [("frankbria/example-app", 42)]
+    assert rows[0]["labels"] == "enhancement"
+    assert rows[0]["next_retry_at"] == datetime(2026, 1, 1, 9, 32, tzinfo=UTC)
+
+
+def test_analysis_comment_removes_issue(server, db):
+    """Test that a later Traycer analysis comment drops the issue from the queue."""
+    receiver, url = server
+
+    _deliver(url, "issue_comment_rate_limited.json")
+    _deliver(url, "issue_comment_analysis.json")
+    receiver.stop()
+
+    assert db.get_issues_ready_for_processing() == []
+    assert receiver.stats["received"] == 2
+
+
+def test_bad_signature_rejected(server, db):
+    """Test that deliveries signed with the wrong secret are refused."""
+    receiver, url = server
+
+    assert _deliver(url, "issue_comment_rate_limited.json", secret="wrong") == 401
+    receiver.stop()
+
+    assert db.get_issues_ready_for_processing() == []
+
+
+def test_full_buffer_returns_503(db):
+    """Test that the bounded ingest buffer sheds load instead of growing."""
+    receiver = WebhookReceiver(db, SECRET, max_pending=1)
+    body = (FIXTURES / "issue_comment_rate_limited.json").read_bytes()
+    signature = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+    assert receiver.handle("issue_comment", signature, body) == 202
+    assert receiver.handle("issue_comment", signature, body) == 503
+
+
+def test_failed_write_is_retried_not_dropped():
+    """Test that an accepted delivery survives a batch write that fails."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = LockedOnceDatabase(Path(tmpdir) / "test.db")
+        receiver = WebhookReceiver(db, SECRET)
+        body = (FIXTURES / "issue_comment_rate_limited.json").read_bytes()
+        signature = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+        assert receiver.handle("issue_comment", signature, body) == 202
+        assert receiver.flush() == 0
+        assert db.get_consecutive_errors(limit=1)[0]["error_message"] == "database is locked"
+        assert receiver.flush() == 1
+
+        assert [r["issue_number"] for r in db.get_issues_ready_for_processing()] == [42]
+        assert receiver.stats["queued"] == 1
+
+
+def test_oversized_body_refused_unread(server):
+    """Test that a Content-Length above the cap gets 413 without the body being read."""
+    receiver, url = server
+    host, port = url.removeprefix("http://").rstrip("/").split(":")
+
+    connection = http.client.HTTPConnection(host, int(port))
+    connection.putrequest("POST", "/")
+    connection.putheader("Content-Length", str(WebhookReceiver.MAX_BODY_BYTES + 1))
+    connection.endheaders()
+    status = connection.getresponse().status
+    connection.close()
+
+    assert status == 413
+    assert receiver.stats["rejected"] == 1